@@ -38,7 +38,8 @@ class PageStatusField(Field):
 
 class PageChildrenField(Field):
     """
-    Serializes the "children" field.
+    Serializes the "children" field. The count is taken from the page's numchild, so it
+    includes all child pages, without querying for them.
 
     Example:
     "children": {
@@ -51,14 +52,15 @@ class PageChildrenField(Field):
 
     def to_representation(self, page):
         return OrderedDict([
-            ('count', self.context['base_queryset'].child_of(page).count()),
+            ('count', page.numchild),
             ('listing_url', get_model_listing_url(self.context, Page) + '?child_of=' + str(page.id)),
         ])
 
 
 class PageDescendantsField(Field):
     """
-    Serializes the "descendants" field.
+    Serializes the "descendants" field. The count is taken from the page's descendant_count,
+    so it includes all descendant pages, without querying for them.
 
     Example:
     "descendants": {
@@ -71,7 +73,7 @@ class PageDescendantsField(Field):
 
     def to_representation(self, page):
         return OrderedDict([
-            ('count', self.context['base_queryset'].descendant_of(page).count()),
+            ('count', page.descendant_count),
             ('listing_url', get_model_listing_url(self.context, Page) + '?descendant_of=' + str(page.id)),
         ])
 
@@ -2,17 +2,20 @@ import functools
 import re
 
 from django import forms
+from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.db.models.fields import CharField, TextField
 from django.forms.formsets import DELETION_FIELD_NAME, ORDERING_FIELD_NAME
 from django.forms.models import fields_for_model
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy
 from taggit.managers import TaggableManager
 
 from wagtail.admin import compare, widgets
+from wagtail.core.blocks import BaseStreamBlock, BlockWidget
 from wagtail.core.fields import RichTextField
 from wagtail.core.models import Page
 from wagtail.core.utils import camelcase_to_underscore, resolve_model_string
@@ -844,3 +847,17 @@ class StreamFieldPanel(FieldPanel):
     def on_model_bound(self):
         super().on_model_bound()
         self.block_def = self.db_field.stream_block
+
+    def on_form_bound(self):
+        super().on_form_bound()
+
+        # With WAGTAILADMIN_LAZY_BLOCK_FORMS, the stream's blocks are shown as summaries,
+        # and their forms are only rendered when they're opened
+        widget = self.bound_field.field.widget
+        if (
+            getattr(settings, 'WAGTAILADMIN_LAZY_BLOCK_FORMS', False)
+            and isinstance(widget, BlockWidget) and isinstance(self.block_def, BaseStreamBlock)
+        ):
+            widget.block_form_url = reverse('wagtailadmin_block_form', args=(
+                self.db_field.model._meta.app_label, self.db_field.model._meta.model_name, self.field_name
+            ))
@@ -2,7 +2,7 @@ from django import forms
 from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext as _
-from django.utils.translation import ngettext
+from django.utils.translation import gettext_lazy, ngettext
 
 from wagtail.admin import widgets
 from wagtail.core.models import Page, PageViewRestriction
@@ -88,6 +88,15 @@ class CopyForm(forms.Form):
         return cleaned_data
 
 
+class BulkMoveForm(forms.Form):
+    destination = forms.ModelChoiceField(
+        queryset=Page.objects.all(),
+        widget=widgets.AdminPageChooser(can_choose_root=True),
+        label=gettext_lazy("Destination"),
+        help_text=gettext_lazy("The selected pages will be moved to be children of this page.")
+    )
+
+
 class PageViewRestrictionForm(BaseViewRestrictionForm):
 
     class Meta:
@@ -3,7 +3,7 @@ from django.template.loader import render_to_string
 from wagtail.admin.auth import user_has_any_page_permission
 from wagtail.admin.navigation import get_site_for_user
 from wagtail.core import hooks
-from wagtail.core.models import Page, Site
+from wagtail.core.models import Site
 
 
 class SummaryItem:
@@ -32,7 +32,7 @@ class PagesSummaryItem(SummaryItem):
         site_name = site_details['site_name']
 
         if root_page:
-            page_count = Page.objects.descendant_of(root_page, inclusive=True).count()
+            page_count = root_page.descendant_count + 1
 
             if root_page.is_root():
                 # If the root page the user has access to is the Wagtail root,
@@ -65,6 +65,27 @@
         return self;
     };
 
+    var loadBlockForm = function(prefix, blockOpts, lazyValueField) {
+        /*
+        Replace the summary of a block whose form was left out of the page (see
+        WAGTAILADMIN_LAZY_BLOCK_FORMS) with the form, rendered from the block's value
+        */
+        var summary = $('#' + prefix + '-summary');
+        $.post(summary.data('block-form-url'), {
+            csrfmiddlewaretoken: summary.closest('form').find('input[name="csrfmiddlewaretoken"]').val(),
+            type: blockOpts.name,
+            prefix: prefix,
+            value: lazyValueField.val()
+        }, function(html) {
+            summary.replaceWith(html);
+            /* the block's value is now posted by its form */
+            lazyValueField.remove();
+            if (blockOpts.initializer) {
+                blockOpts.initializer(prefix + '-value');
+            }
+        }, 'html');
+    };
+
     window.StreamBlock = function(opts) {
         /* Fetch the HTML template strings to be used when adding a new block of each type.
         Also reorganise the opts.childBlocks list into a lookup by name
@@ -85,7 +106,13 @@
                     /* initialize child block's JS behaviour */
                     var blockTypeName = $('#' + sequenceMember.prefix + '-type').val();
                     var blockOpts = childBlocksByName[blockTypeName];
-                    if (blockOpts.initializer) {
+                    var lazyValueField = $('#' + sequenceMember.prefix + '-lazy');
+                    if (lazyValueField.length) {
+                        /* the child block's form hasn't been rendered; fetch it when the block is opened */
+                        $('#' + sequenceMember.prefix + '-expand').one('click', function() {
+                            loadBlockForm(sequenceMember.prefix, blockOpts, lazyValueField);
+                        });
+                    } else if (blockOpts.initializer) {
                         /* the child block's own elements have the prefix '{list member prefix}-value' */
                         blockOpts.initializer(sequenceMember.prefix + '-value');
                     }
@@ -0,0 +1,152 @@
+from django.contrib.auth.models import Permission
+from django.http import HttpRequest, HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail.core.models import Page
+from wagtail.tests.testapp.models import SimplePage, StandardChild, StandardIndex
+from wagtail.tests.utils import WagtailTestUtils
+
+
+class TestBulkActionView(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.root_page = Page.objects.get(id=2)
+
+        self.draft_pages = []
+        for i in range(3):
+            page = self.root_page.add_child(instance=SimplePage(
+                title="Draft page %d" % i, slug='draft-page-%d' % i, content="hello", live=False
+            ))
+            page.save_revision()
+            self.draft_pages.append(page)
+
+        self.child_index = self.root_page.add_child(instance=StandardIndex(title="Hello index", slug='hello-index'))
+        self.grandchild_page = self.child_index.add_child(instance=StandardChild(title="Hello Kitty", slug='hello-kitty'))
+
+        self.user = self.login()
+
+    def get_url(self, action_name):
+        return reverse('wagtailadmin_pages:bulk_action', args=(action_name, ))
+
+    def test_confirm(self):
+        response = self.client.get(self.get_url('publish'), {'id': [page.id for page in self.draft_pages]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'wagtailadmin/pages/bulk_action_confirm.html')
+        self.assertContains(response, "Draft page 0")
+        self.assertContains(response, '<input type="hidden" name="id" value="%d">' % self.draft_pages[2].id, html=True)
+
+        # The pages are not published on GET
+        self.assertFalse(Page.objects.filter(id__in=[page.id for page in self.draft_pages], live=True).exists())
+
+    def test_unknown_action(self):
+        response = self.client.get(self.get_url('foo'), {'id': self.draft_pages[0].id})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_no_pages_selected(self):
+        response = self.client.get(self.get_url('publish'), {'next': reverse('wagtailadmin_explore', args=(self.root_page.id, ))})
+
+        self.assertRedirects(response, reverse('wagtailadmin_explore', args=(self.root_page.id, )))
+
+    def test_bad_permissions(self):
+        self.user.is_superuser = False
+        self.user.user_permissions.add(
+            Permission.objects.get(content_type__app_label='wagtailadmin', codename='access_admin')
+        )
+        self.user.save()
+
+        response = self.client.post(self.get_url('delete'), {'id': self.child_index.id})
+
+        # The user has no page permissions, so is sent back to the dashboard
+        self.assertRedirects(response, reverse('wagtailadmin_home'))
+        self.assertTrue(Page.objects.filter(id=self.child_index.id).exists())
+
+    @override_settings(WAGTAILADMIN_BULK_ACTION_BATCH_SIZE=2)
+    def test_publish_in_batches(self):
+        next_url = reverse('wagtailadmin_explore', args=(self.root_page.id, ))
+        page_ids = [page.id for page in self.draft_pages]
+
+        response = self.client.post(self.get_url('publish'), {'id': page_ids + [999999], 'next': next_url})
+
+        # The first batch is published, and the rest of the selection is handed on to the next request
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'wagtailadmin/pages/bulk_action_progress.html')
+        self.assertEqual(response.context['page_ids'], page_ids[2:])
+        self.assertEqual(response.context['processed'], 2)
+        self.assertEqual(response.context['skipped'], 1)
+        self.assertEqual(response.context['total'], 4)
+        self.assertEqual(Page.objects.filter(id__in=page_ids, live=True).count(), 2)
+
+        response = self.client.post(self.get_url('publish'), {
+            'id': response.context['page_ids'],
+            'total': 4,
+            'processed': 2,
+            'skipped': 1,
+            'next': next_url,
+        }, follow=True)
+
+        self.assertRedirects(response, next_url)
+        self.assertContains(response, "Publish: 3 pages changed, 1 skipped.")
+        self.assertEqual(Page.objects.filter(id__in=page_ids, live=True).count(), 3)
+
+    def test_delete_subtree(self):
+        response = self.client.post(
+            self.get_url('delete'), {'id': [self.child_index.id, self.grandchild_page.id]}, follow=True
+        )
+
+        self.assertRedirects(response, reverse('wagtailadmin_explore_root'))
+        self.assertContains(response, "Delete: 2 pages changed, 0 skipped.")
+        self.assertFalse(Page.objects.filter(id__in=[self.child_index.id, self.grandchild_page.id]).exists())
+
+    def test_move(self):
+        page_ids = [page.id for page in self.draft_pages]
+
+        response = self.client.get(self.get_url('move'), {'id': page_ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="destination"')
+
+        # A destination must be chosen
+        response = self.client.post(self.get_url('move'), {'id': page_ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'wagtailadmin/pages/bulk_action_confirm.html')
+        self.assertTrue(response.context['form'].errors)
+
+        response = self.client.post(self.get_url('move'), {'id': page_ids, 'destination': self.child_index.id})
+        self.assertRedirects(response, reverse('wagtailadmin_explore_root'))
+        self.assertEqual(self.child_index.get_children().filter(id__in=page_ids).count(), 3)
+
+    def test_unpublish_hooks(self):
+        self.child_index.save_revision().publish()
+        self.grandchild_page.save_revision().publish()
+        unpublished_pages = []
+
+        def before_hook(request, page):
+            self.assertIsInstance(request, HttpRequest)
+            if page.id == self.child_index.id:
+                return HttpResponse("Overridden!")
+
+        def after_hook(request, page):
+            self.assertIsInstance(request, HttpRequest)
+            unpublished_pages.append(page.id)
+
+        with self.register_hook('before_unpublish_page', before_hook):
+            with self.register_hook('after_unpublish_page', after_hook):
+                response = self.client.post(
+                    self.get_url('unpublish'), {'id': [self.child_index.id, self.grandchild_page.id]}, follow=True
+                )
+
+        # The page a before_ hook returned a response for is skipped
+        self.assertContains(response, "Unpublish: 1 pages changed, 1 skipped.")
+        self.assertEqual(unpublished_pages, [self.grandchild_page.id])
+        self.assertTrue(Page.objects.get(id=self.child_index.id).live)
+        self.assertFalse(Page.objects.get(id=self.grandchild_page.id).live)
+
+    def test_explorer_selection(self):
+        response = self.client.get(reverse('wagtailadmin_explore', args=(self.root_page.id, )))
+
+        self.assertContains(response, 'id="page-bulk-action-form"')
+        self.assertContains(
+            response, 'name="id" value="%d" form="page-bulk-action-form"' % self.child_index.id
+        )
+        self.assertContains(response, 'formaction="%s"' % self.get_url('delete'))
@@ -175,3 +175,36 @@ class TestPageSearch(TestCase, WagtailTestUtils):
         response = self.get({'q': 'Lunar', 'ordering': '-live'})
         page_ids = [page.id for page in response.context['pages']]
         self.assertEqual(page_ids, [live_event.id, draft_event.id])
+
+    def test_search_filtered_by_content_type(self):
+        root_page = Page.objects.get(id=2)
+        root_page.add_child(instance=SimplePage(title="Hello page", slug='hello-page', content="hello"))
+        root_page.add_child(instance=SingleEventPage(
+            title="Hello event", slug='hello-event', location='the moon', audience='public',
+            cost='free', date_from='2001-01-01',
+        ))
+
+        response = self.get({'q': "hello", 'content_type': 'tests.simplepage'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([page.title for page in response.context['pages']], ["Hello page"])
+
+        # The facets still cover all page types
+        self.assertEqual(response.context['all_pages'].count(), 2)
+        self.assertEqual(
+            sorted((content_type.model, count) for content_type, count in response.context['content_types']),
+            [('simplepage', 1), ('singleeventpage', 1)]
+        )
+
+    def test_search_results_are_specific(self):
+        root_page = Page.objects.get(id=2)
+        for i in range(25):
+            root_page.add_child(instance=SimplePage(title="Hello page %d" % i, slug='hello-page-%d' % i, content="hello"))
+
+        response = self.get({'q': "hello page", 'ordering': 'title'})
+
+        self.assertEqual(response.status_code, 200)
+        pages = response.context['pages']
+        self.assertEqual(len(pages), 20)
+        self.assertTrue(all(isinstance(page, SimplePage) for page in pages))
+        self.assertEqual(pages[0].title, "Hello page 0")
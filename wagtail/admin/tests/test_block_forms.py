@@ -0,0 +1,128 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail.core.models import Page
+from wagtail.tests.testapp.models import StreamPage
+from wagtail.tests.utils import WagtailTestUtils
+
+
+@override_settings(WAGTAILADMIN_LAZY_BLOCK_FORMS=True)
+class TestLazyBlockForms(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.root_page = Page.objects.get(id=2)
+        self.stream_page = self.root_page.add_child(instance=StreamPage(
+            title="Stream page",
+            body=[
+                ('text', "Hello world"),
+                ('product', {'name': "Teapot", 'price': "10"}),
+            ]
+        ))
+        self.user = self.login()
+
+    def test_edit_page(self):
+        response = self.client.get(reverse('wagtailadmin_pages:edit', args=(self.stream_page.id, )))
+        self.assertEqual(response.status_code, 200)
+
+        # The blocks are shown as summaries, with their forms left out
+        self.assertNotContains(response, 'id="body-0-value"')
+        self.assertNotContains(response, 'id="body-1-value-name"')
+        self.assertContains(response, '<p class="help">Hello world</p>', html=True)
+        self.assertContains(response, '<p class="help">Teapot 10</p>', html=True)
+        self.assertContains(
+            response, 'data-block-form-url="%s"' % reverse('wagtailadmin_block_form', args=('tests', 'streampage', 'body'))
+        )
+
+    @override_settings(WAGTAILADMIN_LAZY_BLOCK_FORMS=False)
+    def test_edit_page_without_lazy_block_forms(self):
+        response = self.client.get(reverse('wagtailadmin_pages:edit', args=(self.stream_page.id, )))
+
+        self.assertContains(response, 'id="body-0-value"')
+        self.assertNotContains(response, 'id="body-0-lazy"')
+
+    def test_post_edit_form_with_lazy_values(self):
+        post_data = {
+            'title': "Stream page",
+            'slug': 'stream-page',
+            'body-count': '2',
+            'body-0-deleted': '',
+            'body-0-order': '1',
+            'body-0-type': 'text',
+            'body-0-value': 'Goodbye world',
+            'body-1-deleted': '',
+            'body-1-order': '0',
+            'body-1-type': 'product',
+            'body-1-lazy': json.dumps({'name': "Teapot", 'price': "10"}),
+            'action-publish': "Publish",
+        }
+        response = self.client.post(reverse('wagtailadmin_pages:edit', args=(self.stream_page.id, )), post_data)
+        self.assertRedirects(response, reverse('wagtailadmin_explore', args=(self.root_page.id, )))
+
+        stream_page = StreamPage.objects.get(id=self.stream_page.id)
+        self.assertEqual(stream_page.body[0].block_type, 'product')
+        self.assertEqual(stream_page.body[0].value['name'], "Teapot")
+        self.assertEqual(stream_page.body[1].value, "Goodbye world")
+
+    def test_post_edit_form_with_malformed_lazy_value(self):
+        post_data = {
+            'title': "Stream page",
+            'slug': 'stream-page',
+            'body-count': '2',
+            'body-0-deleted': '',
+            'body-0-order': '0',
+            'body-0-type': 'text',
+            'body-0-value': 'Goodbye world',
+            'body-1-deleted': '',
+            'body-1-order': '1',
+            'body-1-type': 'product',
+            'body-1-lazy': '{"name": "Teapot"',
+        }
+        response = self.client.post(reverse('wagtailadmin_pages:edit', args=(self.stream_page.id, )), post_data)
+        self.assertRedirects(response, reverse('wagtailadmin_pages:edit', args=(self.stream_page.id, )))
+
+        # The block with the malformed value is left out of the new revision
+        revision_page = StreamPage.objects.get(id=self.stream_page.id).get_latest_revision_as_page()
+        self.assertEqual(len(revision_page.body), 1)
+        self.assertEqual(revision_page.body[0].value, "Goodbye world")
+
+
+class TestBlockFormView(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.login()
+
+    def post(self, post_data, args=('tests', 'streampage', 'body')):
+        return self.client.post(reverse('wagtailadmin_block_form', args=args), post_data)
+
+    def test_render_block_form(self):
+        response = self.post({
+            'type': 'product',
+            'prefix': 'body-3',
+            'value': json.dumps({'name': "Teapot", 'price': "10"}),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'id="body-3-value-name"')
+        self.assertContains(response, 'value="Teapot"')
+
+    def test_get_not_allowed(self):
+        response = self.client.get(reverse('wagtailadmin_block_form', args=('tests', 'streampage', 'body')))
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_unknown_field(self):
+        for args in [('tests', 'streampage', 'title'), ('tests', 'streampage', 'foo'), ('tests', 'foo', 'body')]:
+            response = self.post({'type': 'text', 'prefix': 'body-0', 'value': '"Hello"'}, args=args)
+            self.assertEqual(response.status_code, 404)
+
+    def test_unknown_block_type(self):
+        response = self.post({'type': 'foo', 'prefix': 'body-0', 'value': '"Hello"'})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_bad_request(self):
+        response = self.post({'type': 'text', 'prefix': 'body-0"><script>', 'value': '"Hello"'})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post({'type': 'text', 'prefix': 'body-0', 'value': '{Hello'})
+        self.assertEqual(response.status_code, 400)
@@ -11,7 +11,7 @@ from wagtail.admin.urls import pages as wagtailadmin_pages_urls
 from wagtail.admin.urls import collections as wagtailadmin_collections_urls
 from wagtail.admin.urls import reports as wagtailadmin_reports_urls
 from wagtail.admin.urls import password_reset as wagtailadmin_password_reset_urls
-from wagtail.admin.views import account, chooser, home, pages, tags, userbar
+from wagtail.admin.views import account, block_forms, chooser, home, pages, tags, userbar
 from wagtail.admin.api import urls as api_urls
 from wagtail.core import hooks
 from wagtail.utils.urlpatterns import decorate_urlpatterns
@@ -44,6 +44,8 @@ urlpatterns = [
     url(r'^tag-autocomplete/$', tags.autocomplete, name='wagtailadmin_tag_autocomplete'),
     url(r'^tag-autocomplete/(\w+)/(\w+)/$', tags.autocomplete, name='wagtailadmin_tag_model_autocomplete'),
 
+    url(r'^block-form/(\w+)/(\w+)/(\w+)/$', block_forms.block_form, name='wagtailadmin_block_form'),
+
     url(r'^collections/', include(wagtailadmin_collections_urls, namespace='wagtailadmin_collections')),
 
     url(r'^reports/', include(wagtailadmin_reports_urls, namespace='wagtailadmin_reports')),
@@ -0,0 +1,51 @@
+import json
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.views.decorators.http import require_POST
+
+from wagtail.core.fields import StreamField
+
+PREFIX_RE = re.compile(r'^[\w-]+$')
+
+
+@require_POST
+def block_form(request, app_name, model_name, field_name):
+    """
+    Renders the form for one block of a StreamField, for editors where the stream's
+    blocks are only rendered when they're opened (see WAGTAILADMIN_LAZY_BLOCK_FORMS).
+    Takes the block's type, its prefix in the stream and its value as JSON.
+    """
+    try:
+        content_type = ContentType.objects.get_by_natural_key(app_name, model_name)
+    except ContentType.DoesNotExist:
+        raise Http404
+
+    model = content_type.model_class()
+    if model is None:
+        raise Http404
+
+    try:
+        field = model._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        raise Http404
+    if not isinstance(field, StreamField):
+        raise Http404
+
+    try:
+        child_block = field.stream_block.child_blocks[request.POST['type']]
+    except KeyError:
+        raise Http404
+
+    prefix = request.POST.get('prefix', '')
+    if not PREFIX_RE.match(prefix):
+        return HttpResponseBadRequest()
+
+    try:
+        value = child_block.to_python(json.loads(request.POST.get('value', '')))
+    except ValueError:
+        return HttpResponseBadRequest()
+
+    return HttpResponse(child_block.bind(value, prefix='%s-value' % prefix).render_form())
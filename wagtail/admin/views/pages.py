@@ -1,10 +1,11 @@
 from time import time
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import F
 from django.http import Http404, HttpResponse, JsonResponse
 from django.http.request import QueryDict
 from django.shortcuts import get_object_or_404, redirect
@@ -23,11 +24,12 @@ from django.views.generic import View
 from wagtail.admin import messages, signals
 from wagtail.admin.action_menu import PageActionMenu
 from wagtail.admin.auth import user_has_any_page_permission, user_passes_test
-from wagtail.admin.forms.pages import CopyForm
+from wagtail.admin.forms.pages import BulkMoveForm, CopyForm
 from wagtail.admin.forms.search import SearchForm
 from wagtail.admin.mail import send_notification
 from wagtail.admin.navigation import get_explorable_root_page
 from wagtail.core import hooks
+from wagtail.core.bulk_actions import BULK_PAGE_ACTIONS, MovePagesAction
 from wagtail.core.models import Page, PageRevision, UserPagePermissionsProxy
 from wagtail.search.query import MATCH_ALL
 from wagtail.search.utils import parse_query_string
@@ -88,17 +90,11 @@ def index(request, parent_page_id=None):
     elif ordering == 'latest_revision_created_at':
         # order by oldest revision first.
         # Special case NULL entries - these should go at the top of the list.
-        # Do this by annotating with Count('latest_revision_created_at'),
-        # which returns 0 for these
-        pages = pages.annotate(
-            null_position=Count('latest_revision_created_at')
-        ).order_by('null_position', 'latest_revision_created_at')
+        pages = pages.order_by(F('latest_revision_created_at').asc(nulls_first=True))
     elif ordering == '-latest_revision_created_at':
-        # order by oldest revision first.
+        # order by most recent revision first.
         # Special case NULL entries - these should go at the end of the list.
-        pages = pages.annotate(
-            null_position=Count('latest_revision_created_at')
-        ).order_by('-null_position', '-latest_revision_created_at')
+        pages = pages.order_by(F('latest_revision_created_at').desc(nulls_last=True))
     else:
         pages = pages.order_by(ordering)
 
@@ -984,10 +980,100 @@ def copy(request, page_id):
     })
 
 
+@user_passes_test(user_has_any_page_permission)
+def bulk_action(request, action_name):
+    """
+    Runs one of BULK_PAGE_ACTIONS on the pages selected in the explorer. GET requests show a
+    confirmation of the selection, and each POST runs the action on one batch of pages, then
+    hands the rest of the selection (along with the counts so far) on to the next request.
+    """
+    try:
+        action_class = BULK_PAGE_ACTIONS[action_name]
+    except KeyError:
+        raise Http404
+
+    data = request.POST if request.method == 'POST' else request.GET
+    page_ids = [int(page_id) for page_id in data.getlist('id') if page_id.isdigit()]
+
+    next_url = get_valid_next_url_from_request(request)
+    if not page_ids:
+        messages.error(request, _("No pages were selected."))
+        return redirect(next_url or 'wagtailadmin_explore_root')
+
+    action_kwargs = {}
+    form = None
+    if action_class is MovePagesAction:
+        form = BulkMoveForm(request.POST if request.method == 'POST' else None)
+        if form.is_valid():
+            action_kwargs['destination'] = form.cleaned_data['destination']
+
+    if request.method == 'POST' and (form is None or form.is_valid()):
+        action = action_class(
+            page_ids, user=request.user, request=request,
+            batch_size=getattr(settings, 'WAGTAILADMIN_BULK_ACTION_BATCH_SIZE', None), **action_kwargs
+        )
+        action_page_ids = action.get_page_ids()
+        batch_ids = action_page_ids[:action.batch_size]
+        remaining_ids = action.get_selected_ids(action_page_ids[action.batch_size:])
+
+        total = int(request.POST.get('total') or len(set(page_ids)))
+        processed = int(request.POST.get('processed') or 0)
+        skipped = int(request.POST.get('skipped') or 0) + action.get_missing_count(action_page_ids)
+
+        batch_processed, batch_skipped = action.execute_batch(batch_ids)
+        processed += batch_processed
+        skipped += batch_skipped
+
+        if remaining_ids:
+            return TemplateResponse(request, 'wagtailadmin/pages/bulk_action_progress.html', {
+                'action_name': action_name,
+                'action_verbose_name': action_class.verbose_name,
+                'page_ids': remaining_ids,
+                'form': form,
+                'processed': processed,
+                'skipped': skipped,
+                'done': processed + skipped,
+                'total': total,
+                'next': next_url,
+            })
+
+        messages.success(request, _("{0}: {1} pages changed, {2} skipped.").format(
+            action_class.verbose_name, processed, skipped
+        ))
+        return redirect(next_url or 'wagtailadmin_explore_root')
+
+    return TemplateResponse(request, 'wagtailadmin/pages/bulk_action_confirm.html', {
+        'action_name': action_name,
+        'action_verbose_name': action_class.verbose_name,
+        'pages': Page.objects.filter(id__in=page_ids).order_by('path'),
+        'page_ids': page_ids,
+        'form': form,
+        'next': next_url,
+    })
+
+
+def get_specific_pages(pages):
+    """
+    Return the given pages in their most specific form, in the same order, with one query
+    per page type. Their content types are taken from ContentType's cache.
+    """
+    pages = list(pages)
+    specific_pages = {
+        page.pk: page
+        for page in Page.objects.filter(pk__in=[page.pk for page in pages]).specific()
+    }
+
+    pages = [specific_pages.get(page.pk, page) for page in pages]
+    for page in pages:
+        page.content_type = ContentType.objects.get_for_id(page.content_type_id)
+
+    return pages
+
+
 @vary_on_headers('X-Requested-With')
 @user_passes_test(user_has_any_page_permission)
 def search(request):
-    pages = all_pages = Page.objects.all().prefetch_related('content_type').specific()
+    pages = all_pages = Page.objects.all()
     q = MATCH_ALL
     content_types = []
     pagination_query_params = QueryDict({}, mutable=True)
@@ -1046,13 +1132,19 @@ def search(request):
                 pages = pages.filter(live=False)
 
             # Search
-            all_pages = all_pages.search(query, order_by_relevance=not ordering)
             pages = pages.search(query, order_by_relevance=not ordering)
 
+            if selected_content_type:
+                all_pages = all_pages.search(query, order_by_relevance=False)
+            else:
+                # Ordering makes no difference to the totals, so the same results (and their
+                # count) can be used for the listing and the facets
+                all_pages = pages
+
             # Facets
-            if pages.supports_facet:
+            if all_pages.supports_facet:
                 content_types = [
-                    (ContentType.objects.get(id=content_type_id), count)
+                    (ContentType.objects.get_for_id(content_type_id), count)
                     for content_type_id, count in all_pages.facet('content_type_id').items()
                 ]
 
@@ -1062,6 +1154,10 @@ def search(request):
     paginator = Paginator(pages, per_page=20)
     pages = paginator.get_page(request.GET.get('p'))
 
+    # Retrieve only the pages being shown in their most specific form, so that custom
+    # get_admin_display_title and get_url_parts methods on subclasses are respected
+    pages.object_list = get_specific_pages(pages.object_list)
+
     if request.is_ajax():
         return TemplateResponse(request, "wagtailadmin/pages/search_results.html", {
             'pages': pages,
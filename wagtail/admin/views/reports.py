@@ -1,9 +1,11 @@
 import csv
 import datetime
+import tempfile
 from collections import OrderedDict
 
 from django.core.exceptions import FieldDoesNotExist
-from django.http import HttpResponse, StreamingHttpResponse
+from django.db.models import QuerySet
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.base import TemplateResponseMixin
@@ -46,6 +48,8 @@ class SpreadsheetExportMixin:
     }
     # A dictionary of column heading overrides in the format {field: heading}
     export_headings = {}
+    # The number of items to fetch from the database at a time while exporting a queryset
+    export_chunk_size = 2000
 
     def get_filename(self):
         """ Gets the base filename for the exported spreadsheet, without extensions """
@@ -122,6 +126,13 @@ class SpreadsheetExportMixin:
         except (AttributeError, FieldDoesNotExist):
             return force_str(field)
 
+    def iter_export_items(self, queryset):
+        """ Iterates over the items to export, fetching them from the database in chunks where possible """
+        if isinstance(queryset, QuerySet) and not queryset._prefetch_related_lookups:
+            # iterator() would skip any prefetch_related lookups, so those querysets are loaded in one go
+            return queryset.iterator(chunk_size=self.export_chunk_size)
+        return iter(queryset)
+
     def stream_csv(self, queryset):
         """ Generate a csv file line by line from queryset, to be used in a StreamingHTTPResponse """
         writer = csv.DictWriter(Echo(), fieldnames=self.list_export)
@@ -129,15 +140,16 @@ class SpreadsheetExportMixin:
             {field: self.get_heading(queryset, field) for field in self.list_export}
         )
 
-        for item in queryset:
+        for item in self.iter_export_items(queryset):
             yield self.write_csv_row(writer, self.to_row_dict(item))
 
     def write_xlsx(self, queryset, output):
         """ Write an xlsx workbook from a queryset"""
+        # Rows are flushed to temporary files as they are written (constant_memory, which
+        # in_memory would turn off), so the whole sheet is never held in memory
         workbook = Workbook(
             output,
             {
-                "in_memory": True,
                 "constant_memory": True,
                 "remove_timezone": True,
                 "default_date_format": "dd/mm/yy hh:mm:ss",
@@ -148,19 +160,25 @@ class SpreadsheetExportMixin:
         for col_number, field in enumerate(self.list_export):
             worksheet.write(0, col_number, self.get_heading(queryset, field))
 
-        for row_number, item in enumerate(queryset):
+        for row_number, item in enumerate(self.iter_export_items(queryset)):
             self.write_xlsx_row(worksheet, self.to_row_dict(item), row_number + 1)
 
         workbook.close()
 
     def write_xlsx_response(self, queryset):
-        response = HttpResponse(
+        # Build the workbook in a temporary file, which is streamed back and then removed
+        # once the response is closed
+        output = tempfile.TemporaryFile()
+        self.write_xlsx(queryset, output)
+        output.seek(0)
+
+        response = FileResponse(
+            output,
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
         response["Content-Disposition"] = 'attachment; filename="{}.xlsx"'.format(
             self.get_filename()
         )
-        self.write_xlsx(queryset, response)
 
         return response
 
@@ -0,0 +1,166 @@
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connection, connections, transaction
+from django.utils import translation
+
+logger = logging.getLogger('wagtail.forms')
+
+# The mail connection shared by the emails being sent from the current thread, if any;
+# see send_emails
+_mail_connection = threading.local()
+
+
+def submission_batching_enabled():
+    return getattr(settings, 'WAGTAILFORMS_BATCH_SUBMISSIONS', False)
+
+
+class SubmissionBatcher:
+    """
+    A per-process buffer of form submissions waiting to be saved, and of form emails
+    waiting to be rendered and sent.
+
+    Items are added while handling requests, and are written from a background thread
+    every WAGTAILFORMS_BATCH_INTERVAL seconds, or as soon as WAGTAILFORMS_BATCH_SIZE
+    items are waiting: submissions with one bulk insert per submission model, and
+    emails over a single mail connection.
+    """
+    def __init__(self, batch_size=None, interval=None, autostart=True):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.autostart = autostart
+        self.submissions = []
+        self.emails = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def get_batch_size(self):
+        if self.batch_size is not None:
+            return self.batch_size
+        return getattr(settings, 'WAGTAILFORMS_BATCH_SIZE', 100)
+
+    def get_interval(self):
+        if self.interval is not None:
+            return self.interval
+        return getattr(settings, 'WAGTAILFORMS_BATCH_INTERVAL', 1)
+
+    def add_submission(self, submission):
+        self.add(self.submissions, submission)
+
+    def add_email(self, page, form):
+        # The email is rendered in the worker thread, so remember the language of this request
+        self.add(self.emails, (page, form, translation.get_language()))
+
+    def add(self, items, item):
+        with self.lock:
+            items.append(item)
+            pending = len(self.submissions) + len(self.emails)
+
+        if pending >= self.get_batch_size():
+            self.wake.set()
+
+        if self.autostart:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='wagtailforms-batcher', daemon=True)
+                self.thread.start()
+
+                # The thread is stopped along with the process, so write what's left first
+                atexit.register(self.flush)
+
+    def run(self):
+        while True:
+            self.wake.wait(self.get_interval())
+            self.wake.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to write batched form submissions")
+            finally:
+                # The worker thread has its own database connections, which Django won't close for it
+                connections.close_all()
+
+    def flush(self):
+        """
+        Saves the buffered submissions, then renders and sends the buffered emails
+        """
+        with self.flush_lock:
+            with self.lock:
+                submissions, self.submissions = self.submissions, []
+                emails, self.emails = self.emails, []
+
+            if submissions:
+                save_submissions(submissions)
+            if emails:
+                send_emails(emails)
+
+
+def save_submissions(submissions):
+    """
+    Inserts the given unsaved submissions, with one query per submission model where possible
+    """
+    submissions_by_class = OrderedDict()
+    for submission in submissions:
+        submissions_by_class.setdefault(type(submission), []).append(submission)
+
+    for submission_class, submissions in submissions_by_class.items():
+        # The values of indexed form fields are stored against the submission's id,
+        # which bulk_create can only give back on some databases
+        needs_ids = any(
+            getattr(submission.page.specific_class, 'indexed_form_fields', None) for submission in submissions
+        )
+
+        try:
+            with transaction.atomic():
+                if needs_ids and not connection.features.can_return_rows_from_bulk_insert:
+                    for submission in submissions:
+                        submission.save()
+                else:
+                    submission_class._default_manager.bulk_create(submissions)
+                    if needs_ids:
+                        for submission in submissions:
+                            submission.update_field_values()
+        except Exception:
+            # Don't let one bad submission lose the rest of the batch
+            for submission in submissions:
+                submission.pk = None
+                try:
+                    submission.save()
+                except Exception:
+                    logger.exception("Failed to save form submission to page %d", submission.page_id)
+
+
+def get_batch_mail_connection():
+    return getattr(_mail_connection, 'connection', None)
+
+
+def send_emails(emails):
+    """
+    Renders and sends the emails for the given (page, form, language) tuples. Emails
+    sent through AbstractEmailForm.send_mail share one mail connection.
+    """
+    _mail_connection.connection = get_connection()
+    try:
+        _mail_connection.connection.open()
+        for page, form, language in emails:
+            try:
+                with translation.override(language):
+                    page.send_mail(form)
+            except Exception:
+                logger.exception("Failed to send form submission email for page %d", page.pk)
+    finally:
+        _mail_connection.connection.close()
+        _mail_connection.connection = None
+
+
+submission_batcher = SubmissionBatcher()
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.14 on 2026-10-18 23:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailcore', '0048_page_descendant_count'),
+        ('wagtailforms', '0004_add_verbose_name_plural'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormSubmissionFieldValue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField(db_index=True)),
+                ('field_name', models.CharField(max_length=255)),
+                ('value', models.CharField(max_length=255)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.Page')),
+            ],
+            options={
+                'verbose_name': 'form submission field value',
+                'verbose_name_plural': 'form submission field values',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='formsubmissionfieldvalue',
+            index=models.Index(fields=['page', 'field_name', 'value'], name='wagtailform_page_id_13e9ac_idx'),
+        ),
+    ]
@@ -3,9 +3,12 @@ import json
 import os
 
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.db import models, transaction
 from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -15,6 +18,7 @@ from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.admin.mail import send_mail
 from wagtail.core.models import Orderable, Page
 
+from .batching import get_batch_mail_connection, submission_batcher, submission_batching_enabled
 from .forms import FormBuilder, WagtailAdminFormPageForm
 
 
@@ -35,6 +39,25 @@ FORM_FIELD_CHOICES = (
 )
 
 
+class SubmitTimeField(models.DateTimeField):
+    """
+    A DateTimeField that, like auto_now_add, is set to the current time when a submission
+    is created, but keeps a time already given to the submission. Batched submissions
+    (see batching.py) are given the time they were made, and saved some time later.
+    """
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if add and value is None:
+            value = timezone.now()
+            setattr(model_instance, self.attname, value)
+        return value
+
+    def deconstruct(self):
+        # Migrations see this as the DateTimeField it replaces
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.DateTimeField', args, kwargs
+
+
 class AbstractFormSubmission(models.Model):
     """
     Data for a form submission.
@@ -46,7 +69,43 @@ class AbstractFormSubmission(models.Model):
     form_data = models.TextField()
     page = models.ForeignKey(Page, on_delete=models.CASCADE)
 
-    submit_time = models.DateTimeField(verbose_name=_('submit time'), auto_now_add=True)
+    submit_time = SubmitTimeField(verbose_name=_('submit time'), auto_now_add=True)
+
+    # The values of the form page's indexed_form_fields in this submission
+    field_values = GenericRelation('wagtailforms.FormSubmissionFieldValue')
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_field_values()
+
+    def update_field_values(self):
+        """
+        Stores the values of the form page's indexed_form_fields in this submission as
+        FormSubmissionFieldValue records, replacing any stored previously.
+        """
+        page = self.page
+        if not getattr(page.specific_class, 'indexed_form_fields', None):
+            return
+
+        if not isinstance(page, page.specific_class):
+            page = page.specific
+        field_names = page.get_indexed_form_fields()
+
+        form_data = json.loads(self.form_data)
+        field_values = []
+        for field_name in field_names:
+            value = form_data.get(field_name)
+            # Fields with several values (such as checkboxes) are stored as one record per value
+            for item in (value if isinstance(value, list) else [value]):
+                if item is not None:
+                    field_values.append(FormSubmissionFieldValue(
+                        submission=self, page=page, field_name=field_name,
+                        value=str(item)[:FormSubmissionFieldValue.VALUE_MAX_LENGTH]
+                    ))
+
+        self.field_values.all().delete()
+        FormSubmissionFieldValue.objects.bulk_create(field_values)
 
     def get_data(self):
         """
@@ -74,6 +133,30 @@ class FormSubmission(AbstractFormSubmission):
     """Data for a Form submission."""
 
 
+class FormSubmissionFieldValue(models.Model):
+    """
+    A value submitted for one of the indexed_form_fields of a form page. These are kept
+    alongside the submission's form_data, so that submissions can be filtered, ordered
+    and counted by those fields in the database.
+    """
+    VALUE_MAX_LENGTH = 255
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.PositiveIntegerField(db_index=True)
+    submission = GenericForeignKey('content_type', 'object_id')
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE, related_name='+')
+    field_name = models.CharField(max_length=255)
+    value = models.CharField(max_length=VALUE_MAX_LENGTH)
+
+    class Meta:
+        verbose_name = _('form submission field value')
+        verbose_name_plural = _('form submission field values')
+        indexes = [
+            models.Index(fields=['page', 'field_name', 'value']),
+        ]
+
+
 class AbstractFormField(Orderable):
     """
     Database Fields required for building a Django Form field.
@@ -131,6 +214,11 @@ class AbstractForm(Page):
 
     submissions_list_view_class = None
 
+    # The clean names of the form fields (or '__all__') whose submitted values are stored
+    # as FormSubmissionFieldValue records, so that SubmissionsListView can filter, order
+    # and count submissions by them in the database
+    indexed_form_fields = []
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not hasattr(self, 'landing_page_template'):
@@ -164,6 +252,26 @@ class AbstractForm(Page):
 
         return data_fields
 
+    def get_indexed_form_fields(self):
+        """
+        Returns the clean names of the form fields whose submitted values are stored as
+        FormSubmissionFieldValue records.
+        """
+        if self.indexed_form_fields == '__all__':
+            return [field.clean_name for field in self.get_form_fields()]
+
+        return list(self.indexed_form_fields)
+
+    def update_submission_field_values(self):
+        """
+        Stores the indexed form field values of all existing submissions to this page,
+        such as after indexed_form_fields has changed.
+        """
+        submission_class = self.get_submission_class()
+        for submission in submission_class._default_manager.filter(page=self).iterator():
+            submission.page = self
+            submission.update_field_values()
+
     def get_form_class(self):
         fb = self.form_builder(self.get_form_fields())
         return fb.get_form_class()
@@ -204,6 +312,17 @@ class AbstractForm(Page):
         For example, if you want to save reference to a user.
         """
 
+        if submission_batching_enabled():
+            # The submission is saved along with others by a background thread (see batching.py),
+            # so the landing page is given an unsaved instance
+            submission = self.get_submission_class()(
+                form_data=json.dumps(form.cleaned_data, cls=DjangoJSONEncoder),
+                page=self,
+                submit_time=timezone.now(),
+            )
+            transaction.on_commit(lambda: submission_batcher.add_submission(submission))
+            return submission
+
         return self.get_submission_class().objects.create(
             form_data=json.dumps(form.cleaned_data, cls=DjangoJSONEncoder),
             page=self,
@@ -280,12 +399,19 @@ class AbstractEmailForm(AbstractForm):
     def process_form_submission(self, form):
         submission = super().process_form_submission(form)
         if self.to_address:
-            self.send_mail(form)
+            if submission_batching_enabled():
+                # Render and send the email from the background thread, after the submission is saved
+                transaction.on_commit(lambda: submission_batcher.add_email(self, form))
+            else:
+                self.send_mail(form)
         return submission
 
     def send_mail(self, form):
         addresses = [x.strip() for x in self.to_address.split(',')]
-        send_mail(self.subject, self.render_email(form), addresses, self.from_address,)
+        send_mail(
+            self.subject, self.render_email(form), addresses, self.from_address,
+            connection=get_batch_mail_connection()
+        )
 
     def render_email(self, form):
         content = []
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
+import datetime
 import json
+from unittest import mock
 
 from django.core import mail
+from django.db import transaction
 from django.test import TestCase, override_settings
+from django.utils import timezone
+from freezegun import freeze_time
 
-from wagtail.contrib.forms.models import FormSubmission
+from wagtail.contrib.forms.batching import SubmissionBatcher
+from wagtail.contrib.forms.models import FormSubmission, FormSubmissionFieldValue
 from wagtail.contrib.forms.tests.utils import (
     make_form_page, make_form_page_with_custom_submission, make_form_page_with_redirect,
     make_types_test_form_page)
 from wagtail.core.models import Page
 from wagtail.tests.testapp.models import (
-    CustomFormPageSubmission, ExtendedFormField, FormField, FormPageWithCustomFormBuilder,
+    CustomFormPageSubmission, ExtendedFormField, FormField, FormPage, FormPageWithCustomFormBuilder,
     JadeFormPage)
 from wagtail.tests.utils import WagtailTestUtils
 
@@ -605,3 +611,165 @@ class TestNonHtmlExtension(TestCase):
     def test_non_html_extension(self):
         form_page = JadeFormPage(title="test")
         self.assertEqual(form_page.landing_page_template, "tests/form_page_landing.jade")
+
+
+class TestFormSubmissionFieldValues(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(FormPage, 'indexed_form_fields', ['your-email', 'your-choices'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.form_page = make_form_page()
+
+    def get_field_values(self):
+        return sorted(FormSubmissionFieldValue.objects.values_list('field_name', 'value'))
+
+    def test_indexed_fields_are_stored(self):
+        self.client.post('/contact-us/', {
+            'your-email': 'bob@example.com',
+            'your-message': 'hello world',
+            'your-choices': ['foo', 'baz'],
+        })
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(self.get_field_values(), [
+            ('your-choices', 'baz'), ('your-choices', 'foo'), ('your-email', 'bob@example.com'),
+        ])
+        self.assertEqual(submission.field_values.count(), 3)
+
+    def test_values_are_replaced_when_saved(self):
+        submission = FormSubmission.objects.create(
+            page=self.form_page, form_data=json.dumps({'your-email': 'bob@example.com'})
+        )
+        submission.form_data = json.dumps({'your-email': 'alice@example.com', 'your-choices': ['bar']})
+        submission.save()
+
+        self.assertEqual(self.get_field_values(), [('your-choices', 'bar'), ('your-email', 'alice@example.com')])
+
+    def test_values_are_deleted_with_submission(self):
+        submission = FormSubmission.objects.create(
+            page=self.form_page, form_data=json.dumps({'your-email': 'bob@example.com'})
+        )
+        submission.delete()
+
+        self.assertFalse(FormSubmissionFieldValue.objects.exists())
+
+    def test_all_fields(self):
+        with mock.patch.object(FormPage, 'indexed_form_fields', '__all__'):
+            self.assertEqual(self.form_page.get_indexed_form_fields(), ['your-email', 'your-message', 'your-choices'])
+
+    def test_update_submission_field_values(self):
+        with mock.patch.object(FormPage, 'indexed_form_fields', []):
+            FormSubmission.objects.create(page=self.form_page, form_data=json.dumps({'your-email': 'bob@example.com'}))
+        self.assertFalse(FormSubmissionFieldValue.objects.exists())
+
+        self.form_page.update_submission_field_values()
+
+        self.assertEqual(self.get_field_values(), [('your-email', 'bob@example.com')])
+
+    def test_not_stored_without_indexed_fields(self):
+        with mock.patch.object(FormPage, 'indexed_form_fields', []):
+            FormSubmission.objects.create(page=self.form_page, form_data=json.dumps({'your-email': 'bob@example.com'}))
+
+        self.assertFalse(FormSubmissionFieldValue.objects.exists())
+
+
+@override_settings(WAGTAILFORMS_BATCH_SUBMISSIONS=True)
+class TestBatchedFormSubmission(TestCase):
+    def setUp(self):
+        self.batcher = SubmissionBatcher(autostart=False)
+        for patcher in [
+            mock.patch('wagtail.contrib.forms.models.submission_batcher', self.batcher),
+            # Run on_commit callbacks straight away, as the test transaction is never committed
+            mock.patch.object(transaction, 'on_commit', lambda func: func()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.form_page = make_form_page()
+
+    def post(self, message='hello world'):
+        return self.client.post('/contact-us/', {
+            'your-email': 'bob@example.com',
+            'your-message': message,
+            'your-choices': ['foo'],
+        })
+
+    def test_submission_is_buffered(self):
+        response = self.post()
+
+        # The landing page is rendered as usual
+        self.assertContains(response, "Thank you for your feedback.")
+        self.assertContains(response, "<li>your-email: bob@example.com</li>")
+
+        # But nothing is saved or sent until the batch is written
+        self.assertFalse(FormSubmission.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.batcher.flush()
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(submission.page_id, self.form_page.id)
+        self.assertIn("hello world", submission.form_data)
+        self.assertIsNotNone(submission.submit_time)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "The subject")
+        self.assertIn("Your message: hello world", mail.outbox[0].body)
+
+    def test_submissions_are_inserted_together(self):
+        for i in range(5):
+            self.post("message %d" % i)
+
+        with self.assertNumQueries(3):
+            # Savepoint, insert, release
+            self.batcher.flush()
+
+        self.assertEqual(FormSubmission.objects.count(), 5)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_submit_time_is_kept(self):
+        with freeze_time('2020-01-01 12:00:00'):
+            self.post("first")
+        with freeze_time('2020-01-01 12:00:30'):
+            self.post("second")
+
+        with freeze_time('2020-01-01 12:01:00'):
+            self.batcher.flush()
+
+        # Submissions are stored with the time they were made, not when the batch was written
+        self.assertEqual(
+            list(FormSubmission.objects.order_by('id').values_list('submit_time', flat=True)),
+            [
+                datetime.datetime(2020, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+                datetime.datetime(2020, 1, 1, 12, 0, 30, tzinfo=timezone.utc),
+            ]
+        )
+
+    def test_indexed_fields_are_stored(self):
+        with mock.patch.object(FormPage, 'indexed_form_fields', ['your-email']):
+            with freeze_time('2020-01-01 12:00:00'):
+                self.post()
+            self.batcher.flush()
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(list(submission.field_values.values_list('value', flat=True)), ['bob@example.com'])
+        self.assertEqual(submission.submit_time, datetime.datetime(2020, 1, 1, 12, 0, 0, tzinfo=timezone.utc))
+
+    def test_full_batch_wakes_worker(self):
+        self.batcher.batch_size = 3
+
+        # Each post adds a submission and an email
+        self.post()
+        self.assertFalse(self.batcher.wake.is_set())
+
+        self.post()
+        self.assertTrue(self.batcher.wake.is_set())
+
+    @override_settings(WAGTAILFORMS_BATCH_SUBMISSIONS=False)
+    def test_disabled(self):
+        self.post()
+
+        self.assertTrue(FormSubmission.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self.batcher.submissions, [])
@@ -2,6 +2,7 @@
 import datetime
 import json
 from io import BytesIO
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
@@ -14,6 +15,7 @@ from wagtail.admin.forms import WagtailAdminPageForm
 from wagtail.contrib.forms.edit_handlers import FormSubmissionsPanel
 from wagtail.contrib.forms.models import FormSubmission
 from wagtail.contrib.forms.tests.utils import make_form_page, make_form_page_with_custom_submission
+from wagtail.contrib.forms.views import SubmissionsListView
 from wagtail.core.models import Page
 from wagtail.tests.testapp.models import (
     CustomFormPageSubmission, ExtendedFormField, FormField, FormFieldForCustomListViewPage,
@@ -441,6 +443,32 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
         self.assertEqual(cell_array[2], [datetime.datetime(2014, 1, 1, 12, 0), 'new@example.com', 'this is a fairly new message', 'None'])
         self.assertEqual(len(cell_array), 3)
 
+    def test_list_submissions_export_decodes_each_submission_once(self):
+        with mock.patch.object(FormSubmission, 'get_data', autospec=True, side_effect=FormSubmission.get_data) as get_data:
+            response = self.client.get(
+                reverse('wagtailforms:list_submissions', args=(self.form_page.id,)),
+                {'export': 'csv'}
+            )
+            b''.join(response.streaming_content)
+
+        self.assertEqual(get_data.call_count, 2)
+
+    def test_list_submissions_xlsx_export_is_streamed(self):
+        response = self.client.get(
+            reverse('wagtailforms:list_submissions', args=(self.form_page.id,)),
+            {'export': 'xlsx'}
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="{}-export-{}.xlsx"'.format(
+                self.form_page.slug, datetime.datetime.today().strftime('%Y-%m-%d')
+            )
+        )
+        worksheet = load_workbook(filename=BytesIO(response.getvalue()))['Sheet1']
+        self.assertEqual(len(list(worksheet.rows)), 3)
+
     def test_list_submissions_csv_large_export(self):
         for i in range(100):
             new_form_submission = FormSubmission.objects.create(
@@ -1251,3 +1279,52 @@ class TestIssue585(TestCase):
             response,
             text="There is another field with the label foo, please change one of them.",
         )
+
+
+class TestFormsSubmissionsFieldFiltering(TestCase, WagtailTestUtils):
+    def setUp(self):
+        patcher = mock.patch.object(FormPage, 'indexed_form_fields', ['your-email', 'your-choices'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.form_page = make_form_page()
+        for email, choices in [('a@example.com', ['foo']), ('b@example.com', ['foo', 'bar']), ('c@example.com', [])]:
+            FormSubmission.objects.create(
+                page=self.form_page,
+                form_data=json.dumps({'your-email': email, 'your-message': "hello", 'your-choices': choices}),
+            )
+        self.login()
+
+    def get(self, params):
+        return self.client.get(reverse('wagtailforms:list_submissions', args=(self.form_page.id,)), params)
+
+    def get_emails(self, response):
+        return [submission.get_data()['your-email'] for submission in response.context['submissions']]
+
+    def test_filter_by_field(self):
+        response = self.get({'field-your-choices': 'foo'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(self.get_emails(response)), ['a@example.com', 'b@example.com'])
+
+    def test_filter_by_unindexed_field_is_ignored(self):
+        response = self.get({'field-your-message': 'nothing'})
+
+        self.assertEqual(len(response.context['submissions']), 3)
+
+    def test_order_by_field(self):
+        response = self.get({'order_by': '-your-email'})
+
+        self.assertEqual(self.get_emails(response), ['c@example.com', 'b@example.com', 'a@example.com'])
+        self.assertContains(response, 'order_by=your-email')
+
+    def test_field_value_counts(self):
+        view = SubmissionsListView(request=RequestFactory().get('/', {'field-your-email': 'b@example.com'}))
+        view.form_page = self.form_page
+        view.is_export = False
+        view.indexed_form_fields = self.form_page.get_indexed_form_fields()
+
+        self.assertEqual(view.get_field_value_counts('your-choices'), [('bar', 1), ('foo', 1)])
+
+        view.request = RequestFactory().get('/')
+        self.assertEqual(view.get_field_value_counts('your-choices'), [('foo', 2), ('bar', 1)])
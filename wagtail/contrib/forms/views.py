@@ -2,8 +2,11 @@ import datetime
 
 from collections import OrderedDict
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import InvalidPage
+from django.db.models import Count, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
 from django.shortcuts import get_object_or_404, redirect
 from django.utils.translation import ngettext
 from django.views.generic import ListView, TemplateView
@@ -11,6 +14,7 @@ from django.views.generic import ListView, TemplateView
 from wagtail.admin import messages
 from wagtail.admin.views.reports import SpreadsheetExportMixin
 from wagtail.contrib.forms.forms import SelectDateForm
+from wagtail.contrib.forms.models import FormSubmissionFieldValue
 from wagtail.contrib.forms.utils import get_forms_for_user
 from wagtail.core.models import Page
 
@@ -139,6 +143,7 @@ class SubmissionsListView(SpreadsheetExportMixin, SafePaginateListView):
     ordering = ('-submit_time',)
     ordering_csv = ('submit_time',)  # keep legacy CSV ordering
     orderable_fields = ('id', 'submit_time',)  # used to validate ordering in URL
+    field_filter_prefix = 'field-'  # prefix of the URL parameters filtering by indexed form fields
     select_date_form = None
 
     def dispatch(self, request, *args, **kwargs):
@@ -149,6 +154,11 @@ class SubmissionsListView(SpreadsheetExportMixin, SafePaginateListView):
         if not get_forms_for_user(request.user).filter(pk=self.form_page.id).exists():
             raise PermissionDenied
 
+        # Submissions can also be filtered and ordered by the form fields stored as
+        # FormSubmissionFieldValue records
+        self.indexed_form_fields = self.form_page.get_indexed_form_fields()
+        self.orderable_fields = tuple(self.orderable_fields) + tuple(self.indexed_form_fields)
+
         self.is_export = (self.request.GET.get('export') in self.FORMATS)
         if self.is_export:
             self.paginate_by = None
@@ -168,14 +178,67 @@ class SubmissionsListView(SpreadsheetExportMixin, SafePaginateListView):
         if filtering and isinstance(filtering, dict):
             queryset = queryset.filter(**filtering)
 
+        for field_name, value in self.get_field_filtering().items():
+            queryset = queryset.filter(
+                pk__in=self.get_field_values(field_name).filter(value=value).values('object_id')
+            )
+
         ordering = self.get_ordering()
         if ordering:
             if isinstance(ordering, str):
                 ordering = (ordering,)
-            queryset = queryset.order_by(*ordering)
+            queryset = queryset.order_by(*[self.get_field_ordering(order) for order in ordering])
 
         return queryset
 
+    def get_field_values(self, field_name):
+        """ Return queryset of the values stored for an indexed form field in this form's submissions """
+        return FormSubmissionFieldValue.objects.filter(
+            content_type=ContentType.objects.get_for_model(self.form_page.get_submission_class()),
+            page=self.form_page,
+            field_name=field_name,
+        )
+
+    def get_field_filtering(self):
+        """ Return a dict of the indexed form fields to filter submissions by, and the values to match """
+        result = dict()
+        for field_name in self.indexed_form_fields:
+            value = self.request.GET.get(self.field_filter_prefix + field_name)
+            if value:
+                result[field_name] = value
+        return result
+
+    def get_field_ordering(self, order):
+        """ Return the expression to order submissions by for an item of get_ordering """
+        prefix, field_name = ('-', order[1:]) if order.startswith('-') else ('', order)
+        if field_name not in self.indexed_form_fields:
+            return order
+
+        value = Subquery(
+            self.get_field_values(field_name).filter(object_id=OuterRef('pk')).order_by('value').values('value')[:1]
+        )
+        number_fields = [
+            field.clean_name for field in self.form_page.get_form_fields() if field.field_type == 'number'
+        ]
+        if field_name in number_fields:
+            value = Cast(value, FloatField())
+
+        return value.desc() if prefix == '-' else value.asc()
+
+    def get_field_value_counts(self, field_name):
+        """
+        Return a list of (value, count) tuples for the values submitted for an indexed form
+        field, most common first, counting only the submissions that match the current filters
+        """
+        submissions = self.get_queryset().order_by().values('pk')
+        return list(
+            self.get_field_values(field_name)
+            .filter(object_id__in=submissions)
+            .values_list('value')
+            .annotate(count=Count('pk'))
+            .order_by('-count', 'value')
+        )
+
     def get_paginate_by(self, queryset):
         """ Get the number of items to paginate by, or ``None`` for no pagination """
         if self.is_export:
@@ -196,7 +259,8 @@ class SubmissionsListView(SpreadsheetExportMixin, SafePaginateListView):
         ordering_strs = self.request.GET.getlist('order_by') or list(default_ordering)
         for order in ordering_strs:
             try:
-                _, prefix, field_name = order.rpartition('-')
+                # Form field names can contain hyphens, so only a leading one marks descending order
+                prefix, field_name = ('-', order[1:]) if order.startswith('-') else ('', order)
                 if field_name in orderable_fields:
                     ordering[field_name] = (
                         prefix, 'descending' if prefix == '-' else 'ascending'
@@ -243,7 +307,9 @@ class SubmissionsListView(SpreadsheetExportMixin, SafePaginateListView):
 
     def to_row_dict(self, item):
         """ Orders the submission dictionary for spreadsheet writing """
-        row_dict = OrderedDict((field, item.get_data().get(field)) for field in self.list_export)
+        # Decode the submission's data once, rather than for every column
+        form_data = item.get_data()
+        row_dict = OrderedDict((field, form_data.get(field)) for field in self.list_export)
         return row_dict
 
     def get_context_data(self, **kwargs):
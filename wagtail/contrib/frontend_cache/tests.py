@@ -13,7 +13,7 @@ from wagtail.core.models import Page
 from wagtail.tests.testapp.models import EventIndex
 
 from .utils import (
-    PurgeBatch, purge_page_from_cache, purge_pages_from_cache, purge_url_from_cache,
+    PurgeBatch, defer_purges, purge_page_from_cache, purge_pages_from_cache, purge_url_from_cache,
     purge_urls_from_cache)
 
 
@@ -248,6 +248,27 @@ class TestCachePurgingFunctions(TestCase):
 
         self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/', 'http://localhost/foo'])
 
+    def test_defer_purges(self):
+        page = EventIndex.objects.get(url_path='/home/events/')
+
+        with defer_purges():
+            purge_url_from_cache('http://localhost/foo')
+            page.save_revision().publish()
+            page.save_revision().publish()
+
+            self.assertEqual(PURGED_URLS, [])
+
+        # Each URL is purged once
+        self.assertEqual(PURGED_URLS, ['http://localhost/foo', 'http://localhost/events/', 'http://localhost/events/past/'])
+
+    def test_defer_purges_nothing_purged_on_error(self):
+        with self.assertRaises(ValueError):
+            with defer_purges():
+                purge_url_from_cache('http://localhost/foo')
+                raise ValueError
+
+        self.assertEqual(PURGED_URLS, [])
+
 
 @override_settings(WAGTAILFRONTENDCACHE={
     'cloudflare': {
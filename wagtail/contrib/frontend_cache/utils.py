@@ -1,5 +1,8 @@
 import logging
 import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from urllib.parse import urlparse, urlunparse
 
 from django.conf import settings
@@ -8,6 +11,9 @@ from django.utils.module_loading import import_string
 
 logger = logging.getLogger('wagtail.frontendcache')
 
+# The URLs collected by defer_purges in the current thread, if any
+_deferred_purges = threading.local()
+
 
 class InvalidFrontendCacheBackendError(ImproperlyConfigured):
     pass
@@ -59,7 +65,37 @@ def purge_url_from_cache(url, backend_settings=None, backends=None):
     purge_urls_from_cache([url], backend_settings=backend_settings, backends=backends)
 
 
+@contextmanager
+def defer_purges():
+    """
+    Collects the URLs passed to purge_urls_from_cache (such as by the page_published and
+    page_unpublished signal handlers) within this block, and purges them in a single
+    batch once it ends. URLs purged several times are only purged once.
+
+    Nothing is purged if the block raises an exception.
+    """
+    if getattr(_deferred_purges, 'batch', None) is not None:
+        # URLs are already being collected by an outer block
+        yield
+        return
+
+    _deferred_purges.batch = PurgeBatch()
+    try:
+        yield
+        urls = list(OrderedDict.fromkeys(_deferred_purges.batch.urls))
+    finally:
+        _deferred_purges.batch = None
+
+    if urls:
+        purge_urls_from_cache(urls)
+
+
 def purge_urls_from_cache(urls, backend_settings=None, backends=None):
+    batch = getattr(_deferred_purges, 'batch', None)
+    if batch is not None and backend_settings is None and backends is None:
+        batch.add_urls(urls)
+        return
+
     # Convert each url to urls one for each managed language (WAGTAILFRONTENDCACHE_LANGUAGES setting).
     # The managed languages are common to all the defined backends.
     # This depends on settings.USE_I18N
@@ -82,6 +82,8 @@ class ModelAdmin(WagtailRegisterable):
     list_filter = ()
     list_select_related = False
     list_per_page = 100
+    keyset_pagination = False
+    estimated_count_threshold = None
     search_fields = None
     ordering = None
     parent = None
@@ -98,11 +98,10 @@ def result_list(context):
 @register.simple_tag
 def pagination_link_previous(current_page, view):
     if current_page.has_previous():
-        previous_page_number0 = current_page.previous_page_number() - 1
         return format_html(
             '<li class="prev"><a href="%s" class="icon icon-arrow-left">%s'
             '</a></li>' %
-            (view.get_query_string({view.PAGE_VAR: previous_page_number0}),
+            (view.get_previous_page_query_string(current_page),
                 _('Previous'))
         )
     return ''
@@ -111,11 +110,10 @@ def pagination_link_previous(current_page, view):
 @register.simple_tag
 def pagination_link_next(current_page, view):
     if current_page.has_next():
-        next_page_number0 = current_page.next_page_number() - 1
         return format_html(
             '<li class="next"><a href="%s" class="icon icon-arrow-right-after"'
             '>%s</a></li>' %
-            (view.get_query_string({view.PAGE_VAR: next_page_number0}),
+            (view.get_next_page_query_string(current_page),
                 _('Next'))
         )
     return ''
@@ -165,6 +165,68 @@ class TestBookIndexView(TestCase, WagtailTestUtils):
         self.assertEqual(response.context['result_count'], 4)
 
 
+    def test_keyset_paging(self):
+        with mock.patch.object(BookModelAdmin, 'keyset_pagination', True), \
+                mock.patch.object(BookModelAdmin, 'list_per_page', 2):
+            response = self.get()
+            self.assertEqual(
+                [book.title for book in response.context['object_list']],
+                ['Charlie and the Chocolate Factory', 'The Chronicles of Narnia']
+            )
+
+            # The link to the next page gives the ordering fields of the last book on this one
+            next_query_string = response.context['view'].get_next_page_query_string(response.context['page_obj'])
+            self.assertContains(response, next_query_string)
+
+            response = self.client.get('/admin/modeladmintest/book/' + next_query_string)
+            page_obj = response.context['page_obj']
+            self.assertEqual(
+                [book.title for book in response.context['object_list']],
+                ['The Hobbit', 'The Lord of the Rings']
+            )
+            self.assertEqual(page_obj.number, 2)
+            self.assertTrue(page_obj.has_previous())
+            self.assertFalse(page_obj.has_next())
+
+            # Paging back from the last book
+            response = self.get(p=1, before='["The Lord of the Rings", "1"]')
+            self.assertEqual(
+                [book.title for book in response.context['object_list']],
+                ['The Chronicles of Narnia', 'The Hobbit']
+            )
+            self.assertTrue(response.context['page_obj'].has_previous())
+            self.assertTrue(response.context['page_obj'].has_next())
+
+    def test_keyset_paging_invalid_value(self):
+        with mock.patch.object(BookModelAdmin, 'keyset_pagination', True):
+            response = self.get(after='["The Hobbit"]')
+
+        # Falls back to paging by offset
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result_count'], 4)
+        self.assertEqual(len(response.context['object_list']), 4)
+
+    def test_estimated_count(self):
+        with mock.patch.object(BookModelAdmin, 'estimated_count_threshold', 100), \
+                mock.patch('wagtail.contrib.modeladmin.views.IndexView.get_estimated_count', return_value=1000):
+            response = self.get()
+            self.assertEqual(response.context['result_count'], 1000)
+            self.assertEqual(response.context['all_count'], 1000)
+            self.assertEqual(response.context['paginator'].num_pages, 10)
+
+            # The estimate is only used for the whole table
+            response = self.get(author__id__exact=1)
+            self.assertEqual(response.context['result_count'], 2)
+            self.assertEqual(response.context['all_count'], 1000)
+
+    def test_estimated_count_below_threshold(self):
+        with mock.patch.object(BookModelAdmin, 'estimated_count_threshold', 100), \
+                mock.patch('wagtail.contrib.modeladmin.views.IndexView.get_estimated_count', return_value=50):
+            response = self.get()
+
+        self.assertEqual(response.context['result_count'], 4)
+
+
 class TestAuthorIndexView(TestCase, WagtailTestUtils):
     fixtures = ['modeladmintest_test.json']
 
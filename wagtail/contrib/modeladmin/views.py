@@ -1,4 +1,7 @@
+import json
+import operator
 from collections import OrderedDict
+from functools import reduce
 
 from django import forms
 from django.contrib.admin import FieldListFilter
@@ -7,9 +10,11 @@ from django.contrib.admin.utils import (
     get_fields_from_path, label_for_field, lookup_field, lookup_needs_distinct, prepare_lookup_value, quote, unquote)
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import (
-    FieldDoesNotExist, ImproperlyConfigured, ObjectDoesNotExist, PermissionDenied, SuspiciousOperation)
-from django.core.paginator import InvalidPage, Paginator
-from django.db import models
+    FieldDoesNotExist, ImproperlyConfigured, ObjectDoesNotExist, PermissionDenied, SuspiciousOperation,
+    ValidationError)
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections, models
+from django.db.models import Q
 from django.db.models.fields.related import ManyToManyField, OneToOneRel
 from django.shortcuts import get_object_or_404, redirect
 from django.template.defaultfilters import filesizeformat
@@ -213,6 +218,31 @@ class InstanceSpecificView(WMABaseView):
         return super().get_context_data(**context)
 
 
+class KeysetPage(Page):
+    """
+    A page of results found by filtering on the ordering fields of the item before or
+    after it, rather than by its offset. Whether there are more results in the direction
+    being paged in is known from the results themselves, so doesn't rely on the
+    paginator's count (which may be an estimate).
+    """
+    def __init__(self, object_list, number, paginator, has_next, has_previous):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
 class IndexView(SpreadsheetExportMixin, WMABaseView):
 
     ORDER_VAR = 'o'
@@ -221,6 +251,8 @@ class IndexView(SpreadsheetExportMixin, WMABaseView):
     SEARCH_VAR = 'q'
     ERROR_FLAG = 'e'
     EXPORT_VAR = 'export'
+    AFTER_VAR = 'after'
+    BEFORE_VAR = 'before'
     IGNORED_PARAMS = (ORDER_VAR, ORDER_TYPE_VAR, SEARCH_VAR, EXPORT_VAR)
 
     # sortable_by is required by the django.contrib.admin.templatetags.admin_list.result_headers
@@ -238,6 +270,8 @@ class IndexView(SpreadsheetExportMixin, WMABaseView):
         self.list_filter = self.model_admin.get_list_filter(request)
         self.search_fields = self.model_admin.get_search_fields(request)
         self.items_per_page = self.model_admin.list_per_page
+        self.keyset_pagination = self.model_admin.keyset_pagination
+        self.estimated_count_threshold = self.model_admin.estimated_count_threshold
         self.select_related = self.model_admin.list_select_related
         self.search_handler = self.model_admin.get_search_handler(request, self.search_fields)
         self.export = (request.GET.get(self.EXPORT_VAR))
@@ -256,6 +290,11 @@ class IndexView(SpreadsheetExportMixin, WMABaseView):
         if self.EXPORT_VAR in self.params:
             del self.params[self.EXPORT_VAR]
 
+        # The values of the ordering fields for the item before (or after) the current page,
+        # when paging through the results with keyset pagination
+        self.after = self.params.pop(self.AFTER_VAR, None)
+        self.before = self.params.pop(self.BEFORE_VAR, None)
+
         self.query = request.GET.get(self.SEARCH_VAR, '')
 
         self.queryset = self.get_queryset(request)
@@ -580,17 +619,172 @@ class IndexView(SpreadsheetExportMixin, WMABaseView):
                     return True
         return False
 
+    def get_estimated_count(self, queryset):
+        """
+        Returns the number of rows in the model's table according to the database's
+        statistics, or None if the database doesn't keep any. Only supported on PostgreSQL.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        # reltuples is negative (or zero on older versions) until the table has been analyzed
+        if row is None or row[0] <= 0:
+            return None
+        return int(row[0])
+
+    def get_count(self, queryset):
+        """
+        Returns the number of results in queryset. If it isn't filtered at all and
+        estimated_count_threshold is set on the ModelAdmin, the database's estimate of
+        the table size is used instead, as long as it is above the threshold.
+        """
+        if (
+            self.estimated_count_threshold is not None
+            and isinstance(queryset, models.QuerySet)
+            and not queryset.query.where
+        ):
+            estimated_count = self.get_estimated_count(queryset)
+            if estimated_count is not None and estimated_count > self.estimated_count_threshold:
+                return estimated_count
+
+        return queryset.count()
+
+    def get_paginator(self, queryset, count):
+        paginator = Paginator(queryset, self.items_per_page)
+        # Paginator.count is a cached_property; set it so the results aren't counted again
+        paginator.count = count
+        return paginator
+
+    def get_keyset_fields(self, queryset):
+        """
+        Returns a list of (field, descending) tuples for the ordering of queryset, if
+        keyset_pagination is enabled on the ModelAdmin and the results can be paged
+        through by filtering on these fields: they must all be non-nullable fields of the
+        model itself, and include the primary key so that the ordering is unique.
+        Otherwise returns None.
+        """
+        if not self.keyset_pagination or not isinstance(queryset, models.QuerySet):
+            return None
+
+        keyset_fields = []
+        for order in queryset.query.order_by:
+            if not isinstance(order, str) or order == '?':
+                return None
+
+            descending = order.startswith('-')
+            field_name = order.lstrip('-')
+            try:
+                field = self.opts.pk if field_name == 'pk' else self.opts.get_field(field_name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null or field.is_relation:
+                return None
+
+            if field in [keyset_field for keyset_field, keyset_descending in keyset_fields]:
+                # Only the first occurrence of a field affects the ordering
+                continue
+
+            keyset_fields.append((field, descending))
+            if field.primary_key:
+                return keyset_fields
+
+        return None
+
+    def get_keyset_value(self, obj, keyset_fields):
+        """ Returns the value to pass in AFTER_VAR / BEFORE_VAR to page on from obj """
+        return json.dumps([field.value_to_string(obj) for field, descending in keyset_fields])
+
+    def get_keyset_filter(self, keyset_fields, value, before=False):
+        """
+        Returns a Q object matching the results after (or before) the item whose ordering
+        field values were given by get_keyset_value. Raises ValueError or ValidationError
+        if value is invalid.
+        """
+        values = json.loads(value)
+        if not isinstance(values, list) or len(values) != len(keyset_fields):
+            raise ValueError("Expected %d values" % len(keyset_fields))
+
+        conditions = []
+        previous_fields_equal = Q()
+        for (field, descending), value in zip(keyset_fields, values):
+            value = field.to_python(value)
+            lookup = 'lt' if descending != before else 'gt'
+            conditions.append(previous_fields_equal & Q(**{'%s__%s' % (field.attname, lookup): value}))
+            previous_fields_equal &= Q(**{field.attname: value})
+
+        return reduce(operator.or_, conditions)
+
+    def get_keyset_page(self, paginator, queryset, keyset_fields):
+        """
+        Returns the page of results after (or before) the item given in AFTER_VAR (or
+        BEFORE_VAR), or None if neither is given or they are invalid
+        """
+        before = self.before is not None and self.after is None
+        value = self.before if before else self.after
+        if value is None:
+            return None
+
+        try:
+            queryset = queryset.filter(self.get_keyset_filter(keyset_fields, value, before=before))
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+        if before:
+            queryset = queryset.reverse()
+
+        # Fetch one more result than needed, to find out whether there is a further page
+        object_list = list(queryset[:self.items_per_page + 1])
+        has_more = len(object_list) > self.items_per_page
+        object_list = object_list[:self.items_per_page]
+
+        if before:
+            object_list.reverse()
+            return KeysetPage(object_list, max(self.page_num + 1, 1), paginator, True, has_more)
+
+        return KeysetPage(object_list, max(self.page_num + 1, 2), paginator, has_more, True)
+
+    def get_next_page_query_string(self, page):
+        params = {self.PAGE_VAR: page.next_page_number() - 1, self.BEFORE_VAR: None}
+        if self.keyset_fields and len(page):
+            params[self.AFTER_VAR] = self.get_keyset_value(page[-1], self.keyset_fields)
+        return self.get_query_string(params)
+
+    def get_previous_page_query_string(self, page):
+        params = {self.PAGE_VAR: page.previous_page_number() - 1, self.AFTER_VAR: None}
+        # The first page is quick to find by its offset
+        if self.keyset_fields and len(page) and page.previous_page_number() > 1:
+            params[self.BEFORE_VAR] = self.get_keyset_value(page[0], self.keyset_fields)
+        return self.get_query_string(params)
+
     def get_context_data(self, **kwargs):
         user = self.request.user
-        all_count = self.get_base_queryset().count()
         queryset = self.get_queryset()
-        result_count = queryset.count()
-        paginator = Paginator(queryset, self.items_per_page)
+        result_count = self.get_count(queryset)
+        paginator = self.get_paginator(queryset, result_count)
 
-        try:
-            page_obj = paginator.page(self.page_num + 1)
-        except InvalidPage:
-            page_obj = paginator.page(1)
+        if self.query or self.get_filters_params():
+            all_count = self.get_count(self.get_base_queryset())
+        else:
+            # Nothing has been filtered out, so there's no need to count the base queryset as well
+            all_count = result_count
+
+        self.keyset_fields = self.get_keyset_fields(queryset)
+        page_obj = None
+        if self.keyset_fields:
+            page_obj = self.get_keyset_page(paginator, queryset, self.keyset_fields)
+
+        if page_obj is None:
+            try:
+                page_obj = paginator.page(self.page_num + 1)
+            except InvalidPage:
+                page_obj = paginator.page(1)
 
         context = {
             'view': self,
@@ -24,7 +24,9 @@ ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 # https://raw.githubusercontent.com/django-import-export/django-import-export/master/import_export/formats/base_formats.py
+import csv
 from importlib import import_module
+
 import tablib
 
 
@@ -44,6 +46,17 @@ class Format:
         """
         raise NotImplementedError()
 
+    def iter_rows(self, in_file):
+        """
+        Yield the rows of the given open file as lists of values, starting
+        with the header row. Formats that cannot be read incrementally load
+        the whole dataset first.
+        """
+        dataset = self.create_dataset(in_file.read())
+        yield list(dataset.headers or [])
+        for row in dataset:
+            yield list(row)
+
     def is_binary(self):
         """
         Returns if this format is binary.
@@ -136,10 +149,14 @@ class TextFormat(TablibFormat):
 class CSV(TextFormat):
     TABLIB_MODULE = 'tablib.formats._csv'
     CONTENT_TYPE = 'text/csv'
+    DELIMITER = ','
 
     def create_dataset(self, in_stream, **kwargs):
         return super().create_dataset(in_stream, **kwargs)
 
+    def iter_rows(self, in_file):
+        return csv.reader(in_file, delimiter=self.DELIMITER)
+
 
 class JSON(TextFormat):
     TABLIB_MODULE = 'tablib.formats._json'
@@ -155,10 +172,14 @@ class YAML(TextFormat):
 class TSV(TextFormat):
     TABLIB_MODULE = 'tablib.formats._tsv'
     CONTENT_TYPE = 'text/tab-separated-values'
+    DELIMITER = '\t'
 
     def create_dataset(self, in_stream, **kwargs):
         return super().create_dataset(in_stream, **kwargs)
 
+    def iter_rows(self, in_file):
+        return csv.reader(in_file, delimiter=self.DELIMITER)
+
 
 class ODS(TextFormat):
     TABLIB_MODULE = 'tablib.formats._ods'
@@ -213,6 +234,18 @@ class XLSX(TablibFormat):
             dataset.append(row_values)
         return dataset
 
+    def iter_rows(self, in_file):
+        """
+        Yield rows from the first sheet, without loading the whole workbook.
+        """
+        import openpyxl
+        xlsx_book = openpyxl.load_workbook(in_file, read_only=True)
+        try:
+            for row in xlsx_book.active.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            xlsx_book.close()
+
 
 #: These are the default formats for import and export. Whether they can be
 #: used or not is depending on their implementation in the tablib library.
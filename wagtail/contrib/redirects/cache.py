@@ -0,0 +1,86 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_CACHE_KEY = 'wagtailredirects_lookup_version'
+
+# Sentinel for paths that are not present in the lookup table at all
+# (as opposed to paths that are known to have no redirect, which are stored as None)
+MISSING = object()
+
+
+def lookup_cache_enabled():
+    return getattr(settings, 'WAGTAILREDIRECTS_CACHE_LOOKUPS', False)
+
+
+class RedirectLookupCache:
+    """
+    A per-process map of (site id, normalised path) to the redirect that should be
+    served for that path, or None if there is no redirect (a negative entry).
+
+    The table is populated lazily as paths are looked up, and is discarded whenever
+    the version stored under VERSION_CACHE_KEY in Django's cache changes. The version
+    is replaced whenever a Redirect is saved or deleted (in any process), so all
+    processes sharing the cache will notice the change on their next lookup.
+    """
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get_max_entries(self):
+        if self.max_entries is not None:
+            return self.max_entries
+        return getattr(settings, 'WAGTAILREDIRECTS_CACHE_LOOKUPS_MAX_ENTRIES', 10000)
+
+    def check_version(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_CACHE_KEY)
+
+        with self.lock:
+            if version is None or version != self.version:
+                # Either another process has changed the redirects, or there is no shared
+                # cache to coordinate through; either way, the local table can't be trusted
+                self.entries = {}
+                self.version = version
+
+    def get(self, site_id, path):
+        return self.entries.get((site_id, path), MISSING)
+
+    def set(self, site_id, path, redirect):
+        with self.lock:
+            if len(self.entries) >= self.get_max_entries():
+                self.entries = {}
+
+            if redirect is None:
+                self.entries[(site_id, path)] = None
+            else:
+                # Store plain field values rather than the instance itself, so that
+                # related objects (such as redirect_page) are never cached along with it
+                self.entries[(site_id, path)] = {
+                    field.attname: getattr(redirect, field.attname)
+                    for field in redirect._meta.concrete_fields
+                }
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self.version = None
+
+
+lookup_cache = RedirectLookupCache()
+
+
+def invalidate_lookup_cache():
+    """
+    Discard the redirect lookup tables of all processes sharing the Django cache.
+    Must be called after any change to redirects that bypasses the model's
+    post_save / post_delete signals (such as bulk_create or QuerySet.update).
+    """
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    lookup_cache.clear()
@@ -7,6 +7,8 @@ from wagtail.admin.widgets import AdminPageChooser
 from wagtail.contrib.redirects.models import Redirect
 from wagtail.core.models import Site
 
+DUPLICATE_REDIRECT_ERROR = _("A redirect with this path already exists.")
+
 
 class RedirectForm(forms.ModelForm):
     site = forms.ModelChoiceField(
@@ -39,7 +41,7 @@ class RedirectForm(forms.ModelForm):
                 duplicates = duplicates.exclude(id=self.instance.pk)
 
             if duplicates:
-                raise forms.ValidationError(_("A redirect with this path already exists."))
+                raise forms.ValidationError(DUPLICATE_REDIRECT_ERROR)
 
     class Meta:
         model = Redirect
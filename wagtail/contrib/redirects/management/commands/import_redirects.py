@@ -1,10 +1,12 @@
+import itertools
 import os
 
 import tablib
 from django.core.management.base import BaseCommand
 
 from wagtail.contrib.redirects.forms import RedirectForm
-from wagtail.contrib.redirects.utils import get_format_cls_by_extension, get_supported_extensions
+from wagtail.contrib.redirects.utils import (
+    create_redirects_in_bulk, get_format_cls_by_extension, get_supported_extensions)
 from wagtail.core.models import Site
 
 
@@ -60,6 +62,12 @@ class Command(BaseCommand):
         parser.add_argument(
             "--limit", help="Limit import to num items", type=int, default=None
         )
+        parser.add_argument(
+            "--batch-size",
+            help="Number of redirects to validate and create per database query",
+            type=int,
+            default=1000,
+        )
 
     def handle(self, *args, **options):
         src = options["src"]
@@ -73,11 +81,8 @@ class Command(BaseCommand):
         ask = options.pop("ask")
         offset = options.pop("offset")
         limit = options.pop("limit")
+        batch_size = options.pop("batch_size")
 
-        errors = []
-        successes = 0
-        skipped = 0
-        total = 0
         site = None
 
         if site_id:
@@ -95,23 +100,29 @@ class Command(BaseCommand):
         if not format_:
             format_ = extension
 
-        if not get_format_cls_by_extension(format_):
+        format_cls = get_format_cls_by_extension(format_)
+        if not format_cls:
             raise Exception("Invalid format '{0}'".format(extension))
+        input_format = format_cls()
 
-        if extension in ["xls", "xlsx"]:
-            mode = "rb"
+        if input_format.is_binary():
+            fh = open(src, "rb")
         else:
-            mode = "r"
+            fh = open(src, "r", newline="")
 
-        with open(src, mode) as fh:
-            imported_data = tablib.Dataset().load(fh.read(), format=format_)
-
-            sample_data = tablib.Dataset(
-                *imported_data[: min(len(imported_data), 4)],
-                headers=imported_data.headers
+        with fh:
+            rows = (
+                row for row in input_format.iter_rows(fh)
+                if any(value not in (None, "") for value in row)
             )
+            headers = next(rows, [])
+
+            # Only the first few rows are read up front, the rest are streamed
+            sample_rows = list(itertools.islice(rows, 4))
+            rows = itertools.chain(sample_rows, rows)
 
             try:
+                sample_data = tablib.Dataset(*sample_rows, headers=headers)
                 self.stdout.write("Sample data:")
                 self.stdout.write(str(sample_data))
             except Exception:
@@ -124,62 +135,96 @@ class Command(BaseCommand):
 
             self.stdout.write("Importing redirects:")
 
-            if offset:
-                imported_data = imported_data[offset:]
-            if limit:
-                imported_data = imported_data[:limit]
-
-            for row in imported_data:
-                total += 1
-
-                from_link = row[from_index]
-                to_link = row[to_index]
-
-                data = {
-                    "old_path": from_link,
-                    "redirect_link": to_link,
-                    "is_permanent": permament,
-                }
-
-                if site:
-                    data["site"] = site.pk
-
-                form = RedirectForm(data)
-                if not form.is_valid():
-                    error = form.errors.as_text().replace("\n", "")
-                    self.stdout.write(
-                        "{}. Error: {} -> {} (Reason: {})".format(
-                            total, from_link, to_link, error,
-                        )
-                    )
-                    errors.append(error)
-                    continue
-
-                if ask:
-                    answer = get_input(
-                        "{}. Found {} -> {} Create? Y/n: ".format(
-                            total, from_link, to_link,
-                        )
-                    )
-
-                    if answer != "Y":
-                        skipped += 1
-                        continue
-                else:
-                    self.stdout.write("{}. {} -> {}".format(total, from_link, to_link,))
-
-                if dry_run:
-                    successes += 1
-                    continue
-
-                form.save()
-                successes += 1
+            if offset or limit:
+                start = offset or 0
+                stop = start + limit if limit else None
+                rows = itertools.islice(rows, start, stop)
+
+            if ask:
+                summary = self.import_interactively(rows, from_index, to_index, site, permament, dry_run)
+            else:
+                summary = create_redirects_in_bulk(
+                    rows,
+                    from_index=from_index,
+                    to_index=to_index,
+                    site=site,
+                    permanent=permament,
+                    batch_size=batch_size,
+                    dry_run=dry_run,
+                    on_error=self.write_error,
+                    on_progress=self.write_progress,
+                )
 
         self.stdout.write("\n")
-        self.stdout.write("Found: {}".format(total))
-        self.stdout.write("Created: {}".format(successes))
-        self.stdout.write("Skipped : {}".format(skipped))
-        self.stdout.write("Errors: {}".format(len(errors)))
+        self.stdout.write("Found: {}".format(summary["total"]))
+        self.stdout.write("Created: {}".format(summary["successes"]))
+        self.stdout.write("Skipped : {}".format(summary.get("skipped", 0)))
+        self.stdout.write("Errors: {}".format(summary["errors_count"]))
+
+    def write_error(self, row_number, from_link, to_link, error):
+        self.stdout.write(
+            "{}. Error: {} -> {} (Reason: {})".format(
+                row_number, from_link, to_link, error,
+            )
+        )
+
+    def write_progress(self, total, successes, errors_count):
+        self.stdout.write(
+            "Processed {} rows: {} valid, {} errors".format(total, successes, errors_count)
+        )
+
+    def import_interactively(self, rows, from_index, to_index, site, permament, dry_run):
+        errors = []
+        successes = 0
+        skipped = 0
+        total = 0
+
+        for row in rows:
+            total += 1
+
+            from_link = row[from_index]
+            to_link = row[to_index]
+
+            data = {
+                "old_path": from_link,
+                "redirect_link": to_link,
+                "is_permanent": permament,
+            }
+
+            if site:
+                data["site"] = site.pk
+
+            form = RedirectForm(data)
+            if not form.is_valid():
+                error = form.errors.as_text().replace("\n", "")
+                self.write_error(total, from_link, to_link, error)
+                errors.append(error)
+                continue
+
+            answer = get_input(
+                "{}. Found {} -> {} Create? Y/n: ".format(
+                    total, from_link, to_link,
+                )
+            )
+
+            if answer != "Y":
+                skipped += 1
+                continue
+
+            if dry_run:
+                successes += 1
+                continue
+
+            form.save()
+            successes += 1
+
+        return {
+            "errors": errors,
+            "errors_count": len(errors),
+            "successes": successes,
+            "skipped": skipped,
+            "total": total,
+        }
 
 
 def get_input(msg):  # pragma: no cover
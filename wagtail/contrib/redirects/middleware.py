@@ -5,29 +5,77 @@ from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.cache import MISSING, lookup_cache, lookup_cache_enabled
 from wagtail.core.models import Site
 
 
-def _get_redirect(request, path):
-    if '\0' in path:  # reject URLs with null characters, which crash on Postgres (#4496)
-        return None
+def get_candidate_paths(path):
+    """
+    Return the list of paths that RedirectMiddleware will try to match against
+    Redirect.old_path for the given normalised path, in order of preference
+    """
+    paths = [path, uri_to_iri(path)]
 
-    site = Site.find_for_request(request)
-    try:
-        return models.Redirect.get_for_site(site).get(old_path=path)
-    except models.Redirect.MultipleObjectsReturned:
-        # We have a site-specific and a site-ambivalent redirect; prefer the specific one
-        return models.Redirect.objects.get(site=site, old_path=path)
-    except models.Redirect.DoesNotExist:
+    # Also try the path without the query string or params
+    path_without_query = urlparse(path).path
+    if path_without_query != path:
+        paths += [path_without_query, uri_to_iri(path_without_query)]
+
+    # reject URLs with null characters, which crash on Postgres (#4496)
+    candidates = []
+    for candidate in paths:
+        if '\0' not in candidate and candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+
+def find_redirect(site, path):
+    """
+    Find the redirect for the given normalised path, checking all of its candidate
+    paths with a single query. Site-specific redirects are preferred over
+    site-ambivalent ones for the same path.
+    """
+    candidates = get_candidate_paths(path)
+    if not candidates:
         return None
 
+    site_id = site.id if site else None
+    redirects = {}
+    for redirect in models.Redirect.get_for_site(site).filter(old_path__in=candidates):
+        if redirect.old_path not in redirects or redirect.site_id == site_id:
+            redirects[redirect.old_path] = redirect
+
+    for candidate in candidates:
+        if candidate in redirects:
+            return redirects[candidate]
+
+    return None
+
 
 def get_redirect(request, path):
-    redirect = _get_redirect(request, path)
-    if not redirect:
-        # try unencoding the path
-        redirect = _get_redirect(request, uri_to_iri(path))
-    return redirect
+    """
+    Return the redirect for the given normalised path on the request's site, if any
+    """
+    return find_redirect(Site.find_for_request(request), path)
+
+
+def get_redirect_for_path(request, path):
+    site = Site.find_for_request(request)
+
+    if not lookup_cache_enabled():
+        return find_redirect(site, path)
+
+    site_id = site.id if site else None
+    lookup_cache.check_version()
+    cached = lookup_cache.get(site_id, path)
+    if cached is MISSING:
+        redirect = find_redirect(site, path)
+        lookup_cache.set(site_id, path, redirect)
+        return redirect
+    elif cached is None:
+        return None
+    else:
+        return models.Redirect(**cached)
 
 
 # Originally pinched from: https://github.com/django/django/blob/master/django/contrib/redirects/middleware.py
@@ -41,20 +89,8 @@ class RedirectMiddleware(MiddlewareMixin):
         path = models.Redirect.normalise_path(request.get_full_path())
 
         # Find redirect
-        redirect = get_redirect(request, path)
-        if redirect is None:
-            # Get the path without the query string or params
-            path_without_query = urlparse(path).path
-
-            if path == path_without_query:
-                # don't try again if we know we will get the same response
-                return response
-
-            redirect = get_redirect(request, path_without_query)
-            if redirect is None:
-                return response
-
-        if redirect.link is None:
+        redirect = get_redirect_for_path(request, path)
+        if redirect is None or redirect.link is None:
             return response
 
         if redirect.is_permanent:
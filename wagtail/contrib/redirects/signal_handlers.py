@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.contrib.redirects.cache import invalidate_lookup_cache
+from wagtail.contrib.redirects.models import Redirect
+
+
+# Clear the redirect lookup tables of all processes whenever Redirect records are updated.
+def post_save_redirect_signal_handler(instance, **kwargs):
+    invalidate_lookup_cache()
+
+
+def post_delete_redirect_signal_handler(instance, **kwargs):
+    invalidate_lookup_cache()
+
+
+def register_signal_handlers():
+    post_save.connect(post_save_redirect_signal_handler, sender=Redirect)
+    post_delete.connect(post_delete_redirect_signal_handler, sender=Redirect)
@@ -5,7 +5,9 @@ from unittest.mock import patch
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from wagtail.contrib.redirects.models import Redirect
 from wagtail.core.models import Site
@@ -333,3 +335,76 @@ class TestImportCommand(TestCase):
         self.assertEqual(redirects[0].old_path, "/one")
         self.assertEqual(redirects[0].redirect_link, "http://one.test/")
         self.assertEqual(redirects[0].is_permanent, True)
+
+    def test_batch_size_parameter(self):
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        for i in range(25):
+            invalid_file.write("/path-{0},http://{0}.test/\n".format(i))
+        invalid_file.seek(0)
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "import_redirects",
+                src=invalid_file.name,
+                format="csv",
+                batch_size=10,
+                stdout=out,
+            )
+
+        # One duplicate check and one insert per batch
+        redirect_queries = [
+            query for query in queries.captured_queries
+            if 'wagtailredirects_redirect' in query['sql']
+        ]
+        self.assertEqual(len(redirect_queries), 6)
+        self.assertEqual(Redirect.objects.count(), 25)
+        self.assertIn("Processed 10 rows", out.getvalue())
+        self.assertIn("Created: 25", out.getvalue())
+
+    def test_duplicates_of_existing_redirects_get_skipped(self):
+        Redirect.objects.create(old_path="/alpha", redirect_link="http://existing.test/")
+
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        invalid_file.write("/alpha/,http://omega.test/\n")
+        invalid_file.write("/beta/,http://omega.test/\n")
+        invalid_file.seek(0)
+
+        out = StringIO()
+        call_command(
+            "import_redirects", src=invalid_file.name, format="csv", stdout=out
+        )
+
+        self.assertEqual(Redirect.objects.count(), 2)
+        self.assertEqual(Redirect.objects.get(old_path="/alpha").redirect_link, "http://existing.test/")
+        self.assertIn("Errors: 1", out.getvalue())
+
+    def test_duplicates_across_batches_get_skipped(self):
+        invalid_file = tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8")
+        invalid_file.write("from,to\n")
+        invalid_file.write("/alpha/,http://omega.test/\n")
+        invalid_file.write("/beta/,http://omega.test/\n")
+        invalid_file.write("/alpha,http://omega2.test/\n")
+        invalid_file.seek(0)
+
+        out = StringIO()
+        call_command(
+            "import_redirects",
+            src=invalid_file.name,
+            format="csv",
+            batch_size=1,
+            stdout=out,
+        )
+
+        self.assertEqual(Redirect.objects.count(), 2)
+        self.assertEqual(Redirect.objects.get(old_path="/alpha").redirect_link, "http://omega.test/")
+        self.assertIn("Errors: 1", out.getvalue())
+
+    def test_xlsx_rows_are_streamed(self):
+        f = "{}/files/example.xlsx".format(TEST_ROOT)
+
+        out = StringIO()
+        call_command("import_redirects", src=f, stdout=out)
+        self.assertEqual(Redirect.objects.count(), 3)
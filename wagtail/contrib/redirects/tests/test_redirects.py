@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
-from django.test import TestCase, override_settings
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.cache import invalidate_lookup_cache
+from wagtail.contrib.redirects.middleware import get_redirect
 from wagtail.core.models import Page, Site
 from wagtail.tests.utils import WagtailTestUtils
 
@@ -203,6 +207,21 @@ class TestRedirects(TestCase):
         # the redirect which matched was /generic
         self.assertRedirects(response, '/generic', status_code=301, fetch_redirect_response=False)
 
+    def test_get_redirect_prefers_site_specific(self):
+        contact_page = Page.objects.get(url_path='/home/contact-us/')
+        site = Site.objects.create(hostname='other.example.com', port=80, root_page=contact_page)
+        models.Redirect.objects.create(old_path='/xmas', redirect_link='/generic')
+        models.Redirect.objects.create(site=site, old_path='/xmas', redirect_link='/site-specific')
+        request = RequestFactory().get('/xmas/', HTTP_HOST='other.example.com')
+
+        # get_redirect looks redirects up in the same way as the middleware, with one query
+        with self.assertNumQueries(2):
+            # Site lookup, redirect lookup
+            redirect = get_redirect(request, '/xmas')
+
+        self.assertEqual(redirect.link, '/site-specific')
+        self.assertIsNone(get_redirect(request, '/easter'))
+
     def test_duplicate_redirects_with_query_string_when_match_is_for_generic(self):
         contact_page = Page.objects.get(url_path='/home/contact-us/')
         site = Site.objects.create(hostname='other.example.com', port=80, root_page=contact_page)
@@ -345,6 +364,96 @@ class TestRedirects(TestCase):
         self.assertEqual(redirect.is_permanent, True)
 
 
+@override_settings(
+    ALLOWED_HOSTS=['testserver', 'localhost', 'test.example.com', 'other.example.com'],
+    WAGTAILREDIRECTS_CACHE_LOOKUPS=True
+)
+class TestRedirectLookupCache(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        invalidate_lookup_cache()
+
+    def get_redirect_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+
+        redirect_queries = [
+            query for query in queries.captured_queries
+            if 'wagtailredirects_redirect' in query['sql']
+        ]
+        return response, redirect_queries
+
+    def test_redirect_is_cached(self):
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+
+        response, queries = self.get_redirect_queries('/redirectme/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.get_redirect_queries('/redirectme/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+        self.assertEqual(len(queries), 0)
+
+    def test_miss_is_cached(self):
+        response, queries = self.get_redirect_queries('/nothing-here/?foo=bar')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.get_redirect_queries('/nothing-here/?foo=bar')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(queries), 0)
+
+    def test_save_invalidates_cache(self):
+        response = self.client.get('/redirectme/')
+        self.assertEqual(response.status_code, 404)
+
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        response = self.client.get('/redirectme/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+
+        redirect.redirect_link = '/somewhere-else'
+        redirect.save()
+        response = self.client.get('/redirectme/')
+        self.assertRedirects(response, '/somewhere-else', status_code=301, fetch_redirect_response=False)
+
+    def test_delete_invalidates_cache(self):
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        response = self.client.get('/redirectme/')
+        self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
+
+        redirect.delete()
+        response = self.client.get('/redirectme/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cache_is_per_site(self):
+        default_site = Site.objects.get(is_default_site=True)
+        contact_page = Page.objects.get(url_path='/home/contact-us/')
+        other_site = Site.objects.create(hostname='other.example.com', port=80, root_page=contact_page)
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/default', site=default_site)
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/other', site=other_site)
+
+        for i in range(2):
+            response = self.client.get('/redirectme/', HTTP_HOST='other.example.com')
+            self.assertRedirects(response, '/other', status_code=301, fetch_redirect_response=False)
+
+            response = self.client.get('/redirectme/', HTTP_HOST='localhost')
+            self.assertRedirects(response, '/default', status_code=301, fetch_redirect_response=False)
+
+    def test_redirect_to_page_follows_page_url(self):
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        models.Redirect.objects.create(old_path='/xmas', redirect_page=christmas_page)
+
+        response = self.client.get('/xmas/', HTTP_HOST='test.example.com')
+        self.assertRedirects(response, '/events/christmas/', status_code=301, fetch_redirect_response=False)
+
+        # The page URL should not be cached along with the redirect
+        christmas_page.slug = 'xmas-2020'
+        christmas_page.save()
+        response = self.client.get('/xmas/', HTTP_HOST='test.example.com')
+        self.assertRedirects(response, '/events/xmas-2020/', status_code=301, fetch_redirect_response=False)
+
+
 class TestRedirectsIndexView(TestCase, WagtailTestUtils):
     def setUp(self):
         self.login()
@@ -1,6 +1,14 @@
+import io
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.encoding import force_str
 
 from wagtail.contrib.redirects.base_formats import DEFAULT_FORMATS
+from wagtail.contrib.redirects.cache import invalidate_lookup_cache
+from wagtail.contrib.redirects.forms import DUPLICATE_REDIRECT_ERROR, RedirectForm
+from wagtail.contrib.redirects.models import Redirect
 from wagtail.contrib.redirects.tmp_storages import CacheStorage, TempFolderStorage
 
 
@@ -8,9 +16,7 @@ def write_to_file_storage(import_file, input_format):
     FileStorage = get_file_storage()
     file_storage = FileStorage()
 
-    data = bytes()
-    for chunk in import_file.chunks():
-        data += chunk
+    data = b"".join(import_file.chunks())
 
     file_storage.save(data, input_format.get_read_mode())
     return file_storage
@@ -52,3 +58,126 @@ def get_file_storage():
 
 class RedirectsCacheStorage(CacheStorage):
     CACHE_PREFIX = 'wagtail-redirects-'
+
+
+def open_file_storage(file_storage, input_format, encoding="utf-8"):
+    """
+    Return a file object for reading an import file previously saved with
+    write_to_file_storage. Files in the temp folder are opened directly,
+    rather than being read into memory.
+    """
+    if isinstance(file_storage, TempFolderStorage):
+        if input_format.is_binary():
+            return open(file_storage.get_full_path(), "rb")
+        return open(file_storage.get_full_path(), "r", encoding=encoding, newline="")
+
+    data = file_storage.read(input_format.get_read_mode())
+    if input_format.is_binary():
+        return io.BytesIO(data)
+    return io.StringIO(force_str(data, encoding), newline="")
+
+
+def clean_redirect_row(from_link, to_link):
+    """
+    Validate a (from, to) pair from an import file in the same way as RedirectForm,
+    without touching the database. Returns a tuple of (normalised old_path, redirect_link)
+    or raises ValidationError.
+    """
+    old_path = RedirectForm.base_fields["old_path"].clean(from_link)
+    redirect_link = RedirectForm.base_fields["redirect_link"].clean(to_link)
+    return Redirect.normalise_path(old_path), redirect_link
+
+
+def create_redirects_in_bulk(
+    rows, from_index=0, to_index=1, site=None, permanent=True,
+    batch_size=1000, dry_run=False, on_error=None, on_progress=None,
+):
+    """
+    Create redirects from an iterable of rows (excluding the header row),
+    validating and inserting them in batches of batch_size.
+
+    Paths that already have a redirect for the given site, either in the
+    database or earlier in the same import, are reported as errors.
+    on_error is called with (row number, from link, to link, error message)
+    for every row that is rejected, and on_progress is called with the
+    running totals after each batch has been written.
+    """
+    errors = []
+    successes = 0
+    total = 0
+    seen_paths = set()
+    batch = []
+
+    def flush():
+        nonlocal successes
+
+        existing_paths = set(
+            Redirect.objects.filter(
+                site=site, old_path__in=[item[-1].old_path for item in batch]
+            ).values_list("old_path", flat=True)
+        )
+
+        new_redirects = []
+        for row_number, from_link, to_link, redirect in batch:
+            if redirect.old_path in existing_paths:
+                error = str(DUPLICATE_REDIRECT_ERROR)
+                errors.append([from_link, to_link, error])
+                if on_error:
+                    on_error(row_number, from_link, to_link, error)
+            else:
+                new_redirects.append(redirect)
+
+        if new_redirects and not dry_run:
+            with transaction.atomic():
+                Redirect.objects.bulk_create(new_redirects)
+
+        successes += len(new_redirects)
+        batch.clear()
+
+        if on_progress:
+            on_progress(total=total, successes=successes, errors_count=len(errors))
+
+    for row in rows:
+        if not any(value not in (None, "") for value in row):
+            # Skip blank lines
+            continue
+
+        total += 1
+        from_link = row[from_index] if from_index < len(row) else None
+        to_link = row[to_index] if to_index < len(row) else None
+
+        try:
+            old_path, redirect_link = clean_redirect_row(from_link, to_link)
+            if old_path in seen_paths:
+                raise ValidationError(DUPLICATE_REDIRECT_ERROR)
+        except ValidationError as e:
+            error = ", ".join(e.messages)
+            errors.append([from_link, to_link, error])
+            if on_error:
+                on_error(total, from_link, to_link, error)
+            continue
+
+        seen_paths.add(old_path)
+        batch.append((total, from_link, to_link, Redirect(
+            old_path=old_path,
+            site=site,
+            redirect_link=redirect_link,
+            is_permanent=permanent,
+        )))
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    if successes and not dry_run:
+        # bulk_create does not send post_save signals
+        invalidate_lookup_cache()
+
+    return {
+        "errors": errors,
+        "errors_count": len(errors),
+        "successes": successes,
+        "total": total,
+    }
@@ -19,8 +19,8 @@ from wagtail.contrib.redirects.base_formats import DEFAULT_FORMATS
 from wagtail.contrib.redirects.forms import ConfirmImportForm, ImportForm, RedirectForm
 from wagtail.contrib.redirects.permissions import permission_policy
 from wagtail.contrib.redirects.utils import (
-    get_file_storage, get_format_cls_by_extension, get_import_formats, get_supported_extensions,
-    write_to_file_storage)
+    create_redirects_in_bulk, get_file_storage, get_format_cls_by_extension, get_import_formats,
+    get_supported_extensions, open_file_storage, write_to_file_storage)
 
 permission_checker = PermissionPolicyChecker(permission_policy)
 
@@ -264,20 +264,18 @@ def process_import(request):
             },
         )
 
-    data = file_storage.read(input_format.get_read_mode())
-    if not input_format.is_binary() and from_encoding:
-        data = force_str(data, from_encoding)
-    dataset = input_format.create_dataset(data)
-
-    import_summary = create_redirects_from_dataset(
-        dataset,
-        {
-            "from_index": int(form.cleaned_data["from_index"]),
-            "to_index": int(form.cleaned_data["to_index"]),
-            "permanent": form.cleaned_data["permanent"],
-            "site": form.cleaned_data["site"],
-        },
-    )
+    with open_file_storage(file_storage, input_format, from_encoding) as import_file:
+        rows = input_format.iter_rows(import_file)
+        # Skip the header row
+        next(rows, None)
+
+        import_summary = create_redirects_in_bulk(
+            rows,
+            from_index=int(form.cleaned_data["from_index"]),
+            to_index=int(form.cleaned_data["to_index"]),
+            permanent=form.cleaned_data["permanent"],
+            site=form.cleaned_data["site"],
+        )
 
     file_storage.remove()
 
@@ -302,48 +300,3 @@ def process_import(request):
     )
 
     return redirect('wagtailredirects:index')
-
-
-def create_redirects_from_dataset(dataset, config):
-    errors = []
-    successes = 0
-    total = 0
-
-    for row in dataset:
-        total += 1
-
-        from_link = row[config["from_index"]]
-        to_link = row[config["to_index"]]
-
-        data = {
-            "old_path": from_link,
-            "redirect_link": to_link,
-            "is_permanent": config["permanent"],
-        }
-
-        if config["site"]:
-            data["site"] = config["site"].pk
-
-        form = RedirectForm(data)
-        if not form.is_valid():
-            error = to_readable_errors(form.errors.as_text())
-            errors.append([from_link, to_link, error])
-            continue
-
-        form.save()
-        successes += 1
-
-    return {
-        "errors": errors,
-        "errors_count": len(errors),
-        "successes": successes,
-        "total": total,
-    }
-
-
-def to_readable_errors(error):
-    errors = error.split("\n")
-    errors = errors[1::2]
-    errors = [x.lstrip('* ') for x in errors]
-    errors = ", ".join(errors)
-    return errors
@@ -2,16 +2,32 @@ import collections
 from importlib import import_module
 
 from django import forms
+from django.conf import settings
 from django.core import checks
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.utils.encoding import force_str
 from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
+from django.utils.translation import get_language
 
 __all__ = ['BaseBlock', 'Block', 'BoundBlock', 'DeclarativeSubBlocksMetaclass', 'BlockWidget', 'BlockField']
 
 
+# Incremented when settings change, since settings (such as the rich text editors)
+# affect how blocks' forms are rendered, and so invalidate cached html declarations
+_html_declarations_version = 0
+
+
+@receiver(setting_changed)
+def reset_html_declarations(**kwargs):
+    global _html_declarations_version
+
+    _html_declarations_version += 1
+
+
 # =========================================
 # Top-level superclasses and helper objects
 # =========================================
@@ -90,8 +106,17 @@ class Block(metaclass=BaseBlock):
         return media
 
     def all_html_declarations(self):
+        # The declarations only depend on the block definition, so they're rendered once
+        # per language rather than on every request (except in DEBUG mode, where templates
+        # may be changing)
+        cache_key = (get_language(), _html_declarations_version)
+        if not settings.DEBUG and cache_key in self._html_declarations_cache:
+            return self._html_declarations_cache[cache_key]
+
         declarations = filter(bool, [block.html_declarations() for block in self.all_blocks()])
-        return mark_safe('\n'.join(declarations))
+        html = mark_safe('\n'.join(declarations))
+        self._html_declarations_cache[cache_key] = html
+        return html
 
     def __init__(self, **kwargs):
         self.meta = self._meta_class()
@@ -105,6 +130,7 @@ class Block(metaclass=BaseBlock):
         self.definition_prefix = 'blockdef-%d' % self.creation_counter
 
         self.label = self.meta.label or ''
+        self._html_declarations_cache = {}
 
     def set_name(self, name):
         self.name = name
@@ -492,9 +518,17 @@ class BlockWidget(forms.Widget):
     def __init__(self, block_def, attrs=None):
         super().__init__(attrs=attrs)
         self.block_def = block_def
+        # If set (see StreamFieldPanel), the forms of a stream's blocks are left out of
+        # the page and fetched from this URL when they're opened in the editor
+        self.block_form_url = None
 
     def render_with_errors(self, name, value, attrs=None, errors=None, renderer=None):
-        bound_block = self.block_def.bind(value, prefix=name, errors=errors)
+        if self.block_form_url:
+            form_html = self.block_def.render_form(
+                value, prefix=name, errors=errors, block_form_url=self.block_form_url
+            )
+        else:
+            form_html = self.block_def.bind(value, prefix=name, errors=errors).render_form()
         js_initializer = self.block_def.js_initializer()
         if js_initializer:
             js_snippet = """
@@ -507,7 +541,7 @@ class BlockWidget(forms.Widget):
             """ % (js_initializer, name)
         else:
             js_snippet = ''
-        return mark_safe(bound_block.render_form() + js_snippet)
+        return mark_safe(form_html + js_snippet)
 
     def render(self, name, value, attrs=None, renderer=None):
         return self.render_with_errors(name, value, attrs=attrs, errors=None, renderer=renderer)
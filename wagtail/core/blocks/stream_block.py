@@ -1,13 +1,16 @@
+import json
 import uuid
 from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
 
 from django import forms
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.utils import ErrorList
 from django.template.loader import render_to_string
 from django.utils.html import format_html_join
 from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
 from django.utils.translation import gettext as _
 
 from wagtail.admin.staticfiles import versioned_static
@@ -62,22 +65,40 @@ class BaseStreamBlock(Block):
         return sorted(self.child_blocks.values(),
                       key=lambda child_block: child_block.meta.group)
 
-    def render_list_member(self, block_type_name, value, prefix, index, errors=None, id=None):
+    def render_list_member(self, block_type_name, value, prefix, index, errors=None, id=None, block_form_url=None):
         """
         Render the HTML for a single list item. This consists of a container, hidden fields
         to manage ID/deleted state/type, delete/reorder buttons, and the child block's own HTML.
+
+        If block_form_url is given (and the block has no errors to show), a summary of the
+        block is rendered in place of its form, along with its value as JSON. The editor
+        fetches the form from block_form_url when the block is opened.
         """
         child_block = self.child_blocks[block_type_name]
-        child = child_block.bind(value, prefix="%s-value" % prefix, errors=errors)
-        return render_to_string('wagtailadmin/block_forms/stream_member.html', {
+        context = {
             'child_blocks': self.sorted_child_blocks(),
             'block_type_name': block_type_name,
             'child_block': child_block,
             'prefix': prefix,
-            'child': child,
             'index': index,
             'block_id': id,
-        })
+        }
+        if block_form_url and not errors:
+            context.update({
+                'block_form_url': block_form_url,
+                'summary': self.get_block_summary(child_block, value),
+                'lazy_value': json.dumps(child_block.get_prep_value(value), cls=DjangoJSONEncoder),
+            })
+        else:
+            context['child'] = child_block.bind(value, prefix="%s-value" % prefix, errors=errors)
+        return render_to_string('wagtailadmin/block_forms/stream_member.html', context)
+
+    def get_block_summary(self, child_block, value):
+        """
+        Returns a short plain text summary of a child block's value, shown in place of
+        its form until the block is opened
+        """
+        return Truncator(' '.join(child_block.get_searchable_content(value))).chars(100)
 
     def html_declarations(self):
         return format_html_join(
@@ -122,7 +143,7 @@ class BaseStreamBlock(Block):
 
         return "StreamBlock(%s)" % js_dict(opts)
 
-    def render_form(self, value, prefix='', errors=None):
+    def render_form(self, value, prefix='', errors=None, block_form_url=None):
         error_dict = {}
         if errors:
             if len(errors) > 1:
@@ -141,7 +162,7 @@ class BaseStreamBlock(Block):
 
         list_members_html = [
             self.render_list_member(child.block_type, child.value, "%s-%d" % (prefix, i), i,
-                                    errors=error_dict.get(i), id=child.id)
+                                    errors=error_dict.get(i), id=child.id, block_form_url=block_form_url)
             for (i, child) in enumerate(valid_children)
         ]
 
@@ -167,11 +188,22 @@ class BaseStreamBlock(Block):
             except KeyError:
                 continue
 
+            lazy_value = data.get('%s-%d-lazy' % (prefix, i))
+            if lazy_value:
+                # the block's form was never opened, so its value is posted as it was rendered;
+                # a value that isn't valid JSON is left out, as for an unknown block type
+                try:
+                    value = child_block.to_python(json.loads(lazy_value))
+                except ValueError:
+                    continue
+            else:
+                value = child_block.value_from_datadict(data, files, '%s-%d-value' % (prefix, i))
+
             values_with_indexes.append(
                 (
                     int(data['%s-%d-order' % (prefix, i)]),
                     block_type_name,
-                    child_block.value_from_datadict(data, files, '%s-%d-value' % (prefix, i)),
+                    value,
                     data.get('%s-%d-id' % (prefix, i)),
                 )
             )
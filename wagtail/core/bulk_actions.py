@@ -0,0 +1,282 @@
+import logging
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from wagtail.core import hooks
+from wagtail.core.models import Page, UserPagePermissionsProxy
+from wagtail.search.index import defer_index_updates
+
+logger = logging.getLogger('wagtail.core')
+
+
+class BulkPageAction:
+    """
+    Runs an action on each of a selection of pages, in batches of `batch_size` pages
+    that are each processed in one transaction.
+
+    The side effects of changing each page are collected over a batch, and carried
+    out once it has been committed: the search index is updated with one bulk call
+    per page type, and frontend caches are purged with a single request (if
+    wagtail.contrib.frontend_cache is installed).
+
+    If `user` is given, pages the user doesn't have permission to run the action on
+    are skipped. `progress_callback`, if given, is called with the number of pages
+    done so far and the total after each batch.
+
+    If `request` is given (as it is by the admin), the before_ and after_ hooks that the
+    admin runs for the action on a single page are run for each page. A page is skipped
+    if a before_ hook returns a response; responses returned by after_ hooks are ignored.
+    """
+    name = None
+    verbose_name = None
+    batch_size = 100
+    before_hook = None
+    after_hook = None
+
+    def __init__(self, page_ids, user=None, batch_size=None, progress_callback=None, request=None):
+        self.page_ids = list(page_ids)
+        self.user = user
+        self.user_perms = UserPagePermissionsProxy(user) if user is not None else None
+        if batch_size is not None:
+            self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.request = request
+
+        # The ids of other selected pages that are changed along with each page (see SubtreePageAction)
+        self.included_page_ids = {}
+
+    def get_page_ids(self):
+        """
+        Returns the ids of the selected pages to process, in tree order
+        """
+        return list(Page.objects.filter(id__in=self.page_ids).order_by('path').values_list('id', flat=True))
+
+    def get_missing_count(self, page_ids):
+        """
+        Returns the number of selected pages that don't exist, given the result of get_page_ids
+        """
+        return len(set(self.page_ids)) - len(self.get_selected_ids(page_ids))
+
+    def get_selected_ids(self, page_ids):
+        """
+        Returns the ids of the selected pages that are changed (or skipped) along with the
+        given pages (ids from get_page_ids), including the pages themselves
+        """
+        selected_ids = []
+        for page_id in page_ids:
+            selected_ids.append(page_id)
+            selected_ids.extend(self.included_page_ids.get(page_id, []))
+        return selected_ids
+
+    def get_pages(self, page_ids):
+        return Page.objects.filter(id__in=page_ids).order_by('path').specific()
+
+    def check_perm(self, page):
+        """
+        Returns whether the user can run this action on the given page
+        """
+        raise NotImplementedError
+
+    def is_applicable(self, page):
+        """
+        Returns whether this action changes the given page (for example, unpublishing
+        only applies to live pages)
+        """
+        return True
+
+    def process_page(self, page):
+        raise NotImplementedError
+
+    def get_hook_args(self, hook_name, page):
+        return (self.request, page)
+
+    def run_hooks(self, hook_name, page):
+        """
+        Runs the hooks registered as `hook_name` for the page, and returns the first
+        response returned by one of them
+        """
+        if self.request is None or hook_name is None:
+            return None
+
+        for fn in hooks.get_hooks(hook_name):
+            result = fn(*self.get_hook_args(hook_name, page))
+            if hasattr(result, 'status_code'):
+                return result
+
+    def defer_side_effects(self):
+        stack = ExitStack()
+        stack.enter_context(defer_index_updates())
+        if apps.is_installed('wagtail.contrib.frontend_cache'):
+            from wagtail.contrib.frontend_cache.utils import defer_purges
+            stack.enter_context(defer_purges())
+        return stack
+
+    def execute_batch(self, page_ids):
+        """
+        Runs the action on the given pages (ids from get_page_ids) in one transaction.
+        Returns a tuple of the number of selected pages changed and the number skipped,
+        including those changed or skipped along with them.
+        """
+        processed = skipped = 0
+
+        with self.defer_side_effects():
+            with transaction.atomic():
+                for page in self.get_pages(page_ids):
+                    count = 1 + len(self.included_page_ids.get(page.id, []))
+
+                    if (
+                        not self.is_applicable(page)
+                        or (self.user_perms is not None and not self.check_perm(page))
+                        or self.run_hooks(self.before_hook, page) is not None
+                    ):
+                        skipped += count
+                        continue
+
+                    self.process_page(page)
+                    self.run_hooks(self.after_hook, page)
+                    processed += count
+
+        return processed, skipped
+
+    def execute(self):
+        """
+        Runs the action on the selected pages. Returns a tuple of the number of pages
+        changed and the number skipped.
+        """
+        page_ids = self.get_page_ids()
+        processed = 0
+        skipped = self.get_missing_count(page_ids)
+
+        for start in range(0, len(page_ids), self.batch_size):
+            batch_ids = page_ids[start:start + self.batch_size]
+
+            batch_processed, batch_skipped = self.execute_batch(batch_ids)
+            processed += batch_processed
+            skipped += batch_skipped
+
+            if self.progress_callback:
+                self.progress_callback(start + len(batch_ids), len(page_ids))
+
+        logger.info("Bulk %s: %d pages changed, %d skipped", self.name, processed, skipped)
+
+        return processed, skipped
+
+
+class SubtreePageAction(BulkPageAction):
+    """
+    A BulkPageAction that also applies to the descendants of each page, so that
+    selected pages that are descendants of other selected pages are left out, to be
+    changed (or skipped) along with their ancestor
+    """
+    def get_page_ids(self):
+        page_ids = []
+        self.included_page_ids = {}
+        root_id = root_path = None
+        for page_id, path in Page.objects.filter(id__in=self.page_ids).order_by('path').values_list('id', 'path'):
+            if root_path is not None and path.startswith(root_path):
+                self.included_page_ids[root_id].append(page_id)
+                continue
+
+            page_ids.append(page_id)
+            self.included_page_ids[page_id] = []
+            root_id, root_path = page_id, path
+
+        return page_ids
+
+    def is_applicable(self, page):
+        # The root node is not a page, and can't be deleted or moved
+        return not page.is_root()
+
+
+class PublishPagesAction(BulkPageAction):
+    """ Publishes the latest revision of each page that has unpublished changes """
+    name = 'publish'
+    verbose_name = _("Publish")
+    before_hook = 'before_publish_page'
+    after_hook = 'after_publish_page'
+
+    def check_perm(self, page):
+        return self.user_perms.for_page(page).can_publish()
+
+    def is_applicable(self, page):
+        return page.has_unpublished_changes and page.get_latest_revision() is not None
+
+    def process_page(self, page):
+        page.get_latest_revision().publish()
+
+
+class UnpublishPagesAction(BulkPageAction):
+    """ Unpublishes each live page """
+    name = 'unpublish'
+    verbose_name = _("Unpublish")
+    before_hook = 'before_unpublish_page'
+    after_hook = 'after_unpublish_page'
+
+    def check_perm(self, page):
+        return self.user_perms.for_page(page).can_unpublish()
+
+    def is_applicable(self, page):
+        return page.live
+
+    def process_page(self, page):
+        page.unpublish()
+
+
+class DeletePagesAction(SubtreePageAction):
+    """ Deletes each page, along with its descendants """
+    name = 'delete'
+    verbose_name = _("Delete")
+    before_hook = 'before_delete_page'
+    after_hook = 'after_delete_page'
+
+    def check_perm(self, page):
+        return self.user_perms.for_page(page).can_delete()
+
+    def process_page(self, page):
+        page.delete()
+
+
+class MovePagesAction(SubtreePageAction):
+    """
+    Moves each page (along with its descendants) to be the last child of `destination`.
+    Pages whose slug is already in use by a child of the destination are skipped.
+    """
+    name = 'move'
+    verbose_name = _("Move")
+    before_hook = 'before_move_page'
+    after_hook = 'after_move_page'
+
+    def __init__(self, page_ids, destination, **kwargs):
+        super().__init__(page_ids, **kwargs)
+        self.destination = destination
+
+    def get_hook_args(self, hook_name, page):
+        if hook_name == self.before_hook:
+            return (self.request, page, self.destination)
+        return super().get_hook_args(hook_name, page)
+
+    def check_perm(self, page):
+        return self.user_perms.for_page(page).can_move_to(self.destination)
+
+    def is_applicable(self, page):
+        return (
+            super().is_applicable(page)
+            and page.get_parent().id != self.destination.id
+            and not self.destination.is_descendant_of(page)
+            and self.destination.id != page.id
+            and Page._slug_is_available(page.slug, self.destination, page=page)
+        )
+
+    def process_page(self, page):
+        # Treebeard relies on the destination's number of children, which each move changes
+        self.destination = Page.objects.get(id=self.destination.id)
+        page.move(self.destination, pos='last-child')
+
+
+BULK_PAGE_ACTIONS = {
+    action_class.name: action_class
+    for action_class in [PublishPagesAction, UnpublishPagesAction, DeletePagesAction, MovePagesAction]
+}
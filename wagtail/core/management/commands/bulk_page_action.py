@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail.core.bulk_actions import BULK_PAGE_ACTIONS
+from wagtail.core.models import Page
+
+
+class Command(BaseCommand):
+    help = 'Publish, unpublish, delete or move many pages at once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=sorted(BULK_PAGE_ACTIONS.keys()))
+        parser.add_argument('page_ids', nargs='*', type=int, help="IDs of the pages to run the action on")
+        parser.add_argument(
+            '--children-of', type=int, dest='children_of',
+            help="Also run the action on the children of the page with this ID"
+        )
+        parser.add_argument(
+            '--descendants-of', type=int, dest='descendants_of',
+            help="Also run the action on all descendants of the page with this ID"
+        )
+        parser.add_argument('--destination', type=int, help="ID of the page to move the pages to")
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="Number of pages to change in each transaction"
+        )
+
+    def handle(self, *args, **options):
+        page_ids = list(options['page_ids'])
+        if options['children_of'] is not None:
+            page_ids += self.get_page(options['children_of']).get_children().values_list('id', flat=True)
+        if options['descendants_of'] is not None:
+            page_ids += self.get_page(options['descendants_of']).get_descendants().values_list('id', flat=True)
+
+        if not page_ids:
+            raise CommandError("Pass the IDs of the pages to change, or --children-of or --descendants-of")
+
+        kwargs = {
+            'batch_size': options['batch_size'],
+            'progress_callback': self.write_progress,
+        }
+        if options['action'] == 'move':
+            if options['destination'] is None:
+                raise CommandError("Pass --destination to move pages")
+            kwargs['destination'] = self.get_page(options['destination'])
+
+        self.verbosity = options['verbosity']
+        action = BULK_PAGE_ACTIONS[options['action']](page_ids, **kwargs)
+        processed, skipped = action.execute()
+
+        self.stdout.write("Done: %d pages changed, %d skipped" % (processed, skipped))
+
+    def get_page(self, page_id):
+        try:
+            return Page.objects.get(id=page_id)
+        except Page.DoesNotExist:
+            raise CommandError("Page %d does not exist" % page_id)
+
+    def write_progress(self, done, total):
+        if self.verbosity >= 1:
+            self.stdout.write("%d of %d pages processed" % (done, total))
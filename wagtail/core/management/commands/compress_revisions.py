@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wagtail.core.models import PageRevision
+
+
+class Command(BaseCommand):
+    help = 'Compress the content of existing page revisions, or decompress it with --decompress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--decompress', action='store_true', dest='decompress', default=False,
+            help="Convert compressed revisions back to plain JSON"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of revisions to convert per transaction"
+        )
+
+    def handle(self, *args, **options):
+        compress = not options['decompress']
+        self.verbosity = options['verbosity']
+
+        converted_count = convert_revisions(
+            compress=compress, batch_size=options['batch_size'], progress=self.write_progress
+        )
+
+        if compress:
+            self.stdout.write(self.style.SUCCESS('Compressed %d revisions' % converted_count))
+        else:
+            self.stdout.write(self.style.SUCCESS('Decompressed %d revisions' % converted_count))
+
+    def write_progress(self, converted_count):
+        if self.verbosity >= 2:
+            self.stdout.write("Converted %d revisions" % converted_count)
+
+
+def convert_revisions(compress=True, batch_size=500, progress=None):
+    """
+    Compress (or decompress) the content_json of all page revisions, one batch at a time.
+    Returns the number of revisions converted.
+    """
+    revisions = PageRevision.objects.only('id', 'content_json').order_by('id')
+    if compress:
+        revisions = revisions.exclude(content_json__startswith=PageRevision.COMPRESSED_CONTENT_PREFIX)
+    else:
+        revisions = revisions.filter(content_json__startswith=PageRevision.COMPRESSED_CONTENT_PREFIX)
+
+    converted_count = 0
+    last_id = 0
+
+    while True:
+        batch = list(revisions.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+
+        with transaction.atomic():
+            for revision in batch:
+                revision.set_content_json(revision.get_content_json(), compress=compress)
+                PageRevision.objects.filter(id=revision.id).update(content_json=revision.content_json)
+
+        converted_count += len(batch)
+        last_id = batch[-1].id
+
+        if progress:
+            progress(converted_count)
+
+    return converted_count
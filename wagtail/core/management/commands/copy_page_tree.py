@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail.core.models import Page
+
+
+class Command(BaseCommand):
+    help = 'Copy a page, along with all of its descendants, to a new parent page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('page_id', type=int, help="ID of the page to copy")
+        parser.add_argument('destination_id', type=int, help="ID of the page to add the copy below")
+        parser.add_argument('--title', help="Title of the copy (defaults to the page's title)")
+        parser.add_argument('--slug', help="Slug of the copy (defaults to the page's slug)")
+        parser.add_argument(
+            '--no-revisions', action='store_false', dest='copy_revisions',
+            help="Don't copy the revisions of the pages"
+        )
+        parser.add_argument(
+            '--draft', action='store_false', dest='keep_live',
+            help="Copy the pages as drafts, rather than keeping live pages live"
+        )
+
+    def handle(self, *args, **options):
+        page = self.get_page(options['page_id']).specific
+        destination = self.get_page(options['destination_id'])
+
+        if destination == page or destination.is_descendant_of(page):
+            raise CommandError("A page can't be copied below itself")
+
+        update_attrs = {
+            'title': options['title'] or page.title,
+            'slug': options['slug'] or page.slug,
+        }
+        if not Page._slug_is_available(update_attrs['slug'], destination):
+            raise CommandError(
+                "The slug '%s' is already in use below \"%s\"; pass --slug to use another" % (
+                    update_attrs['slug'], destination.title
+                )
+            )
+
+        page_copy = page.copy(
+            recursive=True,
+            to=destination,
+            update_attrs=update_attrs,
+            copy_revisions=options['copy_revisions'],
+            keep_live=options['keep_live'],
+            bulk=True,
+        )
+
+        self.stdout.write(
+            "Copied %d pages. The copy of \"%s\" has ID %d" % (page_copy.descendant_count + 1, page.title, page_copy.id)
+        )
+
+    def get_page(self, page_id):
+        try:
+            return Page.objects.get(id=page_id)
+        except Page.DoesNotExist:
+            raise CommandError("Page %d does not exist" % page_id)
@@ -44,6 +44,15 @@ class Command(BaseCommand):
             Page.fix_tree(destructive=False)
             any_problems_fixed = True
 
+        bad_descendant_count = Page.find_descendant_count_problems()
+        if bad_descendant_count:
+            self.stdout.write(
+                "Incorrect descendant_count value found for pages: %s"
+                % self.numberlist_to_string(sorted(bad_descendant_count))
+            )
+            Page.fix_descendant_counts()
+            any_problems_fixed = True
+
         if orphans:
             # The 'orphans' list as returned by treebeard only includes pages that are
             # missing an immediate parent; descendants of orphans are not included.
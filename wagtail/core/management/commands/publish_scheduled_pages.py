@@ -1,38 +1,34 @@
 import json
+import time
 
 from django.core.management.base import BaseCommand
-from django.utils import dateparse, timezone
+from django.utils import timezone
 
 from wagtail.core.models import Page, PageRevision
 
 
-def revision_date_expired(r):
-    expiry_str = json.loads(r.content_json).get('expire_at')
-    if not expiry_str:
-        return False
-    expire_at = dateparse.parse_datetime(expiry_str)
-    if expire_at < timezone.now():
-        return True
-    else:
-        return False
-
-
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
             '--dryrun', action='store_true', dest='dryrun', default=False,
             help="Dry run -- don't change anything.")
 
+    def write_timing(self, message, count, start_time):
+        self.stdout.write("{0}: {1} ({2:.3f}s)".format(message, count, time.perf_counter() - start_time))
+
     def handle(self, *args, **options):
         dryrun = False
         if options['dryrun']:
             self.stdout.write("Will do a dry run.")
             dryrun = True
 
+        now = timezone.now()
+
         # 1. get all expired pages with live = True
+        start_time = time.perf_counter()
         expired_pages = Page.objects.filter(
             live=True,
-            expire_at__lt=timezone.now()
+            expire_at__lt=now
         )
         if dryrun:
             if expired_pages:
@@ -48,18 +44,16 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("No expired pages to be deactivated found.")
         else:
-            # Unpublish the expired pages
-            # Cast to list to make sure the query is fully evaluated
-            # before unpublishing anything
-            for page in list(expired_pages):
-                page.unpublish(set_expired=True)
+            # Unpublish the expired pages in bulk, then send page_unpublished for each of them
+            unpublished_pages = expired_pages.bulk_unpublish(set_expired=True)
+            self.write_timing("Expired pages unpublished", len(unpublished_pages), start_time)
 
         # 2. get all page revisions for moderation that have been expired
-        expired_revs = [
-            r for r in PageRevision.objects.filter(
-                submitted_for_moderation=True
-            ) if revision_date_expired(r)
-        ]
+        start_time = time.perf_counter()
+        expired_revs = PageRevision.objects.filter(
+            submitted_for_moderation=True,
+            expire_at__lt=now
+        )
         if dryrun:
             self.stdout.write("---------------------------------")
             if expired_revs:
@@ -67,25 +61,23 @@ class Command(BaseCommand):
                 self.stdout.write("Expiry datetime\t\tSlug\t\tName")
                 self.stdout.write("---------------\t\t----\t\t----")
                 for er in expired_revs:
-                    rev_data = json.loads(er.content_json)
+                    rev_data = json.loads(er.get_content_json())
                     self.stdout.write("{0}\t{1}\t{2}".format(
-                        dateparse.parse_datetime(
-                            rev_data.get('expire_at')
-                        ).strftime("%Y-%m-%d %H:%M"),
+                        er.expire_at.strftime("%Y-%m-%d %H:%M"),
                         rev_data.get('slug'),
                         rev_data.get('title')
                     ))
             else:
                 self.stdout.write("No expired revision to be dropped from moderation.")
         else:
-            for er in expired_revs:
-                er.submitted_for_moderation = False
-                er.save()
+            dropped_count = expired_revs.update(submitted_for_moderation=False)
+            self.write_timing("Expired revisions dropped from moderation", dropped_count, start_time)
 
         # 3. get all revisions that need to be published
+        start_time = time.perf_counter()
         revs_for_publishing = PageRevision.objects.filter(
-            approved_go_live_at__lt=timezone.now()
-        )
+            approved_go_live_at__lt=now
+        ).select_related('page')
         if dryrun:
             self.stdout.write("---------------------------------")
             if revs_for_publishing:
@@ -93,7 +85,7 @@ class Command(BaseCommand):
                 self.stdout.write("Go live datetime\t\tSlug\t\tName")
                 self.stdout.write("---------------\t\t\t----\t\t----")
                 for rp in revs_for_publishing:
-                    rev_data = json.loads(rp.content_json)
+                    rev_data = json.loads(rp.get_content_json())
                     self.stdout.write("{0}\t\t{1}\t{2}".format(
                         rp.approved_go_live_at.strftime("%Y-%m-%d %H:%M"),
                         rev_data.get('slug'),
@@ -102,7 +94,11 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("No pages to go live.")
         else:
+            # Cast to list to make sure the query is fully evaluated
+            # before publishing anything
+            revs_for_publishing = list(revs_for_publishing)
             for rp in revs_for_publishing:
                 # just run publish for the revision -- since the approved go
                 # live datetime is before now it will make the page live
                 rp.publish()
+            self.write_timing("Scheduled revisions published", len(revs_for_publishing), start_time)
@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
 from django.utils import timezone
 
 from wagtail.core.models import PageRevision
@@ -15,19 +17,37 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--days', type=int, help="Only delete revisions older than this number of days")
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of revision ids to examine per batch; each batch is deleted in its own transaction"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help="Count the revisions that would be deleted, without deleting them"
+        )
 
     def handle(self, *args, **options):
         days = options.get('days')
+        self.verbosity = options['verbosity']
+        dry_run = options['dry_run']
 
-        revisions_deleted = purge_revisions(days=days)
+        revisions_deleted = purge_revisions(
+            days=days, batch_size=options['batch_size'], dry_run=dry_run, progress=self.write_progress
+        )
 
-        if revisions_deleted:
+        if dry_run:
+            self.stdout.write("Would delete %s revisions" % revisions_deleted)
+        elif revisions_deleted:
             self.stdout.write(self.style.SUCCESS('Successfully deleted %s revisions' % revisions_deleted))
         else:
             self.stdout.write("No revisions deleted")
 
+    def write_progress(self, last_id, max_id, deleted_count):
+        if self.verbosity >= 2:
+            self.stdout.write("Processed revisions up to id %d of %d: %d deleted so far" % (last_id, max_id, deleted_count))
 
-def purge_revisions(days=None):
+
+def get_purgeable_revisions(days=None):
     # exclude revisions which have been submitted for moderation in the old system
     purgeable_revisions = PageRevision.objects.exclude(
         submitted_for_moderation=True
@@ -46,12 +66,43 @@ def purge_revisions(days=None):
         # only include revisions which were created before the cut off date
         purgeable_revisions = purgeable_revisions.filter(created_at__lt=purgeable_until)
 
+    # don't delete the latest revision for any page
+    # (using the same ordering as PageRevision.is_latest_revision)
+    latest_revision = PageRevision.objects.filter(
+        page_id=OuterRef('page_id')
+    ).order_by('-created_at', '-id').values('id')[:1]
+
+    return purgeable_revisions.exclude(id=Subquery(latest_revision))
+
+
+def purge_revisions(days=None, batch_size=1000, dry_run=False, progress=None):
+    """
+    Delete purgeable revisions in batches of consecutive ids, so that no single
+    transaction or query has to cover the whole table. Returns the number of
+    revisions deleted (or that would be deleted, if dry_run is True).
+    """
+    id_range = PageRevision.objects.aggregate(min_id=Min('id'), max_id=Max('id'))
+    if id_range['min_id'] is None:
+        return 0
+
     deleted_revisions_count = 0
 
-    for revision in purgeable_revisions:
-        # don't delete the latest revision for any page
-        if not revision.is_latest_revision():
-            revision.delete()
-            deleted_revisions_count += 1
+    for start_id in range(id_range['min_id'], id_range['max_id'] + 1, batch_size):
+        end_id = start_id + batch_size
+
+        with transaction.atomic():
+            revision_ids = list(
+                get_purgeable_revisions(days=days).filter(
+                    id__gte=start_id, id__lt=end_id
+                ).values_list('id', flat=True)
+            )
+
+            if revision_ids and not dry_run:
+                PageRevision.objects.filter(id__in=revision_ids).delete()
+
+        deleted_revisions_count += len(revision_ids)
+
+        if progress:
+            progress(min(end_id - 1, id_range['max_id']), id_range['max_id'], deleted_revisions_count)
 
     return deleted_revisions_count
@@ -32,10 +32,23 @@ class Command(BaseCommand):
         from_text = options['from_text']
         to_text = options['to_text']
 
-        for revision in PageRevision.objects.filter(content_json__contains=from_text):
+        uncompressed_revisions = PageRevision.objects.exclude(
+            content_json__startswith=PageRevision.COMPRESSED_CONTENT_PREFIX
+        )
+        for revision in uncompressed_revisions.filter(content_json__contains=from_text):
             revision.content_json = revision.content_json.replace(from_text, to_text)
             revision.save(update_fields=['content_json'])
 
+        # Compressed revisions can't be filtered in the database, so check each of them
+        compressed_revisions = PageRevision.objects.filter(
+            content_json__startswith=PageRevision.COMPRESSED_CONTENT_PREFIX
+        )
+        for revision in compressed_revisions.iterator():
+            content_json = revision.get_content_json()
+            if from_text in content_json:
+                revision.set_content_json(content_json.replace(from_text, to_text), compress=True)
+                revision.save(update_fields=['content_json'])
+
         for page_class in get_page_models():
             self.stdout.write("scanning %s" % page_class._meta.verbose_name)
 
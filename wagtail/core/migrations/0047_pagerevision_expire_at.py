@@ -0,0 +1,40 @@
+import base64
+import json
+import zlib
+
+from django.db import migrations, models
+from django.utils import dateparse
+
+
+def get_content(content_json):
+    # Historical models don't have PageRevision.get_content_json, so decode compressed content here
+    if content_json.startswith('zlib:'):
+        content_json = zlib.decompress(base64.b64decode(content_json[len('zlib:'):])).decode('utf-8')
+    return json.loads(content_json)
+
+
+def populate_revision_expire_at(apps, schema_editor):
+    # Only revisions in the moderation queue are checked for expiry by publish_scheduled_pages,
+    # so there is no need to go through the whole revision history
+    PageRevision = apps.get_model('wagtailcore.PageRevision')
+
+    for revision in PageRevision.objects.filter(submitted_for_moderation=True).only('id', 'content_json').iterator():
+        expire_at = get_content(revision.content_json).get('expire_at')
+        if expire_at:
+            PageRevision.objects.filter(id=revision.id).update(expire_at=dateparse.parse_datetime(expire_at))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0046_site_name_remove_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagerevision',
+            name='expire_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='expiry date/time'),
+        ),
+        migrations.RunPython(populate_revision_expire_at, migrations.RunPython.noop),
+    ]
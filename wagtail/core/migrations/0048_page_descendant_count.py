@@ -0,0 +1,32 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def populate_descendant_count(apps, schema_editor):
+    Page = apps.get_model('wagtailcore.Page')
+    steplen = 4
+
+    descendant_counts = defaultdict(int)
+    for path in Page.objects.values_list('path', flat=True).iterator():
+        for length in range(steplen, len(path), steplen):
+            descendant_counts[path[:length]] += 1
+
+    for path, descendant_count in descendant_counts.items():
+        Page.objects.filter(path=path).update(descendant_count=descendant_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0047_pagerevision_expire_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='descendant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='descendant count'),
+        ),
+        migrations.RunPython(populate_descendant_count, migrations.RunPython.noop),
+    ]
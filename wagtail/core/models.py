@@ -1,5 +1,8 @@
+import base64
 import json
 import logging
+import posixpath
+import zlib
 from collections import defaultdict
 from io import StringIO
 from urllib.parse import urlparse
@@ -12,8 +15,8 @@ from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.handlers.base import BaseHandler
 from django.core.handlers.wsgi import WSGIRequest
-from django.db import models, transaction
-from django.db.models import Case, Q, Value, When
+from django.db import connection, connections, models, router, transaction
+from django.db.models import Case, F, Q, Value, When, prefetch_related_objects
 from django.db.models.functions import Concat, Lower, Substr
 from django.http import Http404
 from django.http.request import split_domain_port
@@ -29,7 +32,8 @@ from modelcluster.models import (
 from treebeard.mp_tree import MP_Node
 
 from wagtail.core.query import PageQuerySet, TreeQuerySet
-from wagtail.core.signals import page_published, page_unpublished, post_page_move, pre_page_move
+from wagtail.core.signals import (
+    page_published, page_tree_copied, page_unpublished, post_page_move, pre_page_move)
 from wagtail.core.sites import get_site_for_hostname
 from wagtail.core.url_routing import RouteResult
 from wagtail.core.utils import WAGTAIL_APPEND_SLASH, camelcase_to_underscore, resolve_model_string
@@ -344,6 +348,14 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         null=True,
         editable=False
     )
+    # The number of pages below this page in the tree. Like treebeard's numchild, this is
+    # kept up to date as pages are created, moved and deleted, but saving a page never
+    # writes it; see _do_update
+    descendant_count = models.PositiveIntegerField(
+        verbose_name=_('descendant count'),
+        default=0,
+        editable=False
+    )
     live_revision = models.ForeignKey(
         'PageRevision',
         related_name='+',
@@ -515,6 +527,9 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         result = super().save(**kwargs)
 
+        if is_new:
+            Page._update_descendant_counts(self._get_ancestor_paths(self.path), 1)
+
         if update_descendant_url_paths:
             self._update_descendant_url_paths(old_url_path, new_url_path)
 
@@ -536,6 +551,55 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         return result
 
+    def _save_table(self, raw=False, *args, **kwargs):
+        # Raw saves (such as loading fixtures) store the page exactly as given, including
+        # the descendant_count of the tree it came from
+        self._save_descendant_count = raw
+        return super()._save_table(raw, *args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Otherwise, descendant_count is maintained by the tree operations themselves, with
+        # UPDATE queries on all the ancestors of the pages they change, so the (possibly
+        # outdated) value held on an instance must never be written back when it is saved
+        if not getattr(self, '_save_descendant_count', False):
+            values = [value for value in values if value[0].attname != 'descendant_count']
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+    @classmethod
+    def _get_ancestor_paths(cls, path):
+        return [path[:length] for length in range(cls.steplen, len(path), cls.steplen)]
+
+    @classmethod
+    def _update_descendant_counts(cls, paths, change):
+        """Add change to the descendant_count of the pages with the given paths"""
+        if paths and change:
+            Page.objects.filter(path__in=paths).update(descendant_count=F('descendant_count') + change)
+
+    @classmethod
+    def find_descendant_count_problems(cls):
+        """
+        Return a dict mapping the ids of the pages with an incorrect descendant_count to
+        the number of descendants they actually have
+        """
+        pages = list(Page.objects.values_list('id', 'path', 'descendant_count'))
+
+        real_counts = defaultdict(int)
+        for page_id, path, descendant_count in pages:
+            for ancestor_path in cls._get_ancestor_paths(path):
+                real_counts[ancestor_path] += 1
+
+        return {
+            page_id: real_counts[path]
+            for page_id, path, descendant_count in pages
+            if descendant_count != real_counts[path]
+        }
+
+    @classmethod
+    def fix_descendant_counts(cls):
+        """Recalculate descendant_count for the pages where it is incorrect"""
+        for page_id, descendant_count in cls.find_descendant_count_problems().items():
+            Page.objects.filter(id=page_id).update(descendant_count=descendant_count)
+
     def delete(self, *args, **kwargs):
         # Ensure that deletion always happens on an instance of Page, not a specific subclass. This
         # works around a bug in treebeard <= 3.0 where calling SpecificPage.delete() fails to delete
@@ -682,12 +746,15 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         self.full_clean()
 
         # Create revision
-        revision = self.revisions.create(
-            content_json=self.to_json(),
+        revision = PageRevision(
+            page=self,
             user=user,
             submitted_for_moderation=submitted_for_moderation,
             approved_go_live_at=approved_go_live_at,
+            expire_at=self.expire_at,
         )
+        revision.set_content_json(self.to_json())
+        revision.save()
 
         update_fields = []
 
@@ -1130,14 +1197,30 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             url_path_after=new_url_path,
         )
 
+        # Ancestors of both the old and the new position keep their descendant counts (and paths)
+        old_ancestor_paths = set(self._get_ancestor_paths(old_self.path))
+        if parent_after:
+            new_ancestor_paths = set(self._get_ancestor_paths(parent_after.path) + [parent_after.path])
+        else:
+            new_ancestor_paths = set()
+        common_ancestor_paths = old_ancestor_paths & new_ancestor_paths
+        moved_page_count = old_self.descendant_count + 1
+
         # Only commit when all descendants are properly updated
         with transaction.atomic():
+            # The paths of the old ancestors may be changed by the move, so update them first
+            Page._update_descendant_counts(old_ancestor_paths - common_ancestor_paths, -moved_page_count)
+
             # Allow treebeard to update `path` values
             super().move(target, pos=pos)
 
             # Treebeard's move method doesn't actually update the in-memory instance,
             # so we need to work with a freshly loaded one now
             new_self = Page.objects.get(id=self.id)
+
+            Page._update_descendant_counts(
+                set(self._get_ancestor_paths(new_self.path)) - common_ancestor_paths, moved_page_count
+            )
             new_self.url_path = new_url_path
             new_self.save()
 
@@ -1158,10 +1241,16 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         # Log
         logger.info("Page moved: \"%s\" id=%d path=%s", self.title, self.id, new_url_path)
 
-    def copy(self, recursive=False, to=None, update_attrs=None, copy_revisions=True, keep_live=True, user=None, process_child_object=None, exclude_fields=None):
+    def _copy_instance(self, exclude_fields=None, keep_live=True, user=None):
+        """
+        Return an unsaved copy of this page, with the field values (including parental
+        many-to-many relations) that Page.copy copies
+        """
         # Fill dict with self.specific values
         specific_self = self.specific
-        default_exclude_fields = ['id', 'path', 'depth', 'numchild', 'url_path', 'path', 'index_entries']
+        default_exclude_fields = [
+            'id', 'path', 'depth', 'numchild', 'descendant_count', 'url_path', 'path', 'index_entries'
+        ]
         exclude_fields = default_exclude_fields + specific_self.exclude_fields_in_copy + (exclude_fields or [])
         specific_dict = {}
 
@@ -1183,7 +1272,11 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             if isinstance(field, models.OneToOneField) and field.remote_field.parent_link:
                 continue
 
-            specific_dict[field.name] = getattr(specific_self, field.name)
+            if isinstance(field, models.ForeignKey):
+                # Copy the id, rather than fetching the related object
+                specific_dict[field.attname] = getattr(specific_self, field.attname)
+            else:
+                specific_dict[field.name] = getattr(specific_self, field.name)
 
         # copy child m2m relations
         for related_field in get_all_child_m2m_relations(specific_self):
@@ -1210,6 +1303,57 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         if user:
             page_copy.owner = user
 
+        return page_copy
+
+    def _copy_revision(self, revision, page_copy, child_object_id_map):
+        """
+        Turn revision (a revision of this page) into an unsaved revision of page_copy,
+        remapping the ids of child objects in its content to those of their copies
+        """
+        revision.pk = None
+        revision.submitted_for_moderation = False
+        revision.approved_go_live_at = None
+        revision.page = page_copy
+
+        # Update ID fields in content
+        revision_content = json.loads(revision.get_content_json())
+        revision_content['pk'] = page_copy.pk
+
+        for child_relation in get_all_child_relations(self.specific):
+            accessor_name = child_relation.get_accessor_name()
+            try:
+                child_objects = revision_content[accessor_name]
+            except KeyError:
+                # KeyErrors are possible if the revision was created
+                # before this child relation was added to the database
+                continue
+
+            for child_object in child_objects:
+                child_object[child_relation.field.name] = page_copy.pk
+
+                # Remap primary key to copied versions
+                # If the primary key is not recognised (eg, the child object has been deleted from the database)
+                # set the primary key to None
+                child_object['pk'] = child_object_id_map[accessor_name].get(child_object['pk'], None)
+
+        revision.set_content_json(json.dumps(revision_content))
+
+    def copy(self, recursive=False, to=None, update_attrs=None, copy_revisions=True, keep_live=True, user=None, process_child_object=None, exclude_fields=None, bulk=False):
+        if recursive and bulk:
+            return self._copy_tree_in_bulk(
+                to=to,
+                update_attrs=update_attrs,
+                copy_revisions=copy_revisions,
+                keep_live=keep_live,
+                user=user,
+                process_child_object=process_child_object,
+                exclude_fields=exclude_fields,
+            )
+
+        specific_self = self.specific
+        page_copy = specific_self._copy_instance(exclude_fields, keep_live=keep_live, user=user)
+        exclude_fields = specific_self.exclude_fields_in_copy + (exclude_fields or [])
+
         if update_attrs:
             for field, value in update_attrs.items():
                 setattr(page_copy, field, value)
@@ -1226,7 +1370,6 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         child_object_id_map = defaultdict(dict)
 
         # Copy child objects
-        specific_self = self.specific
         for child_relation in get_all_child_relations(specific_self):
             accessor_name = child_relation.get_accessor_name()
 
@@ -1256,35 +1399,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         # Copy revisions
         if copy_revisions:
             for revision in self.revisions.all():
-                revision.pk = None
-                revision.submitted_for_moderation = False
-                revision.approved_go_live_at = None
-                revision.page = page_copy
-
-                # Update ID fields in content
-                revision_content = json.loads(revision.content_json)
-                revision_content['pk'] = page_copy.pk
-
-                for child_relation in get_all_child_relations(specific_self):
-                    accessor_name = child_relation.get_accessor_name()
-                    try:
-                        child_objects = revision_content[accessor_name]
-                    except KeyError:
-                        # KeyErrors are possible if the revision was created
-                        # before this child relation was added to the database
-                        continue
-
-                    for child_object in child_objects:
-                        child_object[child_relation.field.name] = page_copy.pk
-
-                        # Remap primary key to copied versions
-                        # If the primary key is not recognised (eg, the child object has been deleted from the database)
-                        # set the primary key to None
-                        child_object['pk'] = child_object_id_map[accessor_name].get(child_object['pk'], None)
-
-                revision.content_json = json.dumps(revision_content)
-
-                # Save
+                specific_self._copy_revision(revision, page_copy, child_object_id_map)
                 revision.save()
 
         # Create a new revision
@@ -1324,6 +1439,280 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
     copy.alters_data = True
 
+    def _copy_tree_in_bulk(self, to=None, copy_revisions=True, keep_live=True, user=None, process_child_object=None, **kwargs):
+        if to and (to == self or to.is_descendant_of(self)):
+            raise Exception("You cannot copy a tree branch recursively into itself")
+
+        # Index all the copies at the end, with one bulk update per page model
+        with index.defer_index_updates(), transaction.atomic():
+            page_copy = self.copy(
+                to=to,
+                copy_revisions=copy_revisions,
+                keep_live=keep_live,
+                user=user,
+                process_child_object=process_child_object,
+                **kwargs
+            )
+            page_id_map = self._copy_descendants_in_bulk(
+                page_copy,
+                copy_revisions=copy_revisions,
+                keep_live=keep_live,
+                user=user,
+                process_child_object=process_child_object,
+            )
+
+        page_id_map[self.id] = page_copy.id
+        page_tree_copied.send(
+            sender=page_copy.specific_class,
+            instance=page_copy,
+            source=self,
+            page_id_map=page_id_map,
+        )
+
+        return page_copy
+
+    def _copy_descendants_in_bulk(self, page_copy, copy_revisions=True, keep_live=True, user=None, process_child_object=None, batch_size=500):
+        """
+        Copy all the descendants of this page below page_copy (a copy of this page, with no
+        children yet). Rather than going through Page.copy for each page, the copies are
+        inserted in batches: the tree paths of a batch are worked out from those of the
+        originals, and its pages, child objects and revisions are written with bulk inserts.
+
+        Returns a dict mapping the ids of the copied pages to the ids of their copies.
+        """
+        page_ids = list(self.get_descendants().order_by('path').values_list('id', flat=True))
+        copies_by_path = {self.path: page_copy}
+        page_id_map = {}
+        now = timezone.now()
+
+        for start in range(0, len(page_ids), batch_size):
+            pages = list(Page.objects.filter(id__in=page_ids[start:start + batch_size]).order_by('path').specific())
+
+            # Fetch everything to copy for the batch with one query per relation,
+            # rather than one per page
+            pages_by_class = defaultdict(list)
+            for page in pages:
+                pages_by_class[type(page)].append(page)
+
+            child_objects_by_page = defaultdict(list)
+            for page_class, class_pages in pages_by_class.items():
+                for child_relation in get_all_child_relations(page_class):
+                    accessor_name = child_relation.get_accessor_name()
+                    if accessor_name in page_class.exclude_fields_in_copy:
+                        continue
+
+                    parental_key_name = child_relation.field.attname
+                    for child_object in child_relation.related_model._default_manager.filter(**{
+                        parental_key_name + '__in': [page.id for page in class_pages]
+                    }):
+                        child_objects_by_page[(getattr(child_object, parental_key_name), accessor_name)].append(child_object)
+
+                prefetch_related_objects(class_pages, *[
+                    related_field.name for related_field in get_all_child_m2m_relations(page_class)
+                    if related_field.name not in page_class.exclude_fields_in_copy
+                ])
+
+            if copy_revisions:
+                prefetch_related_objects(pages, 'revisions')
+
+            # Copy the pages, placing each one at the same position relative to page_copy as
+            # the original has relative to this page
+            copies = []
+            for page in pages:
+                parent_copy = copies_by_path[page.path[:-self.steplen]]
+
+                copy = page._copy_instance(keep_live=keep_live, user=user)
+                copy.path = page_copy.path + page.path[len(self.path):]
+                copy.depth = page_copy.depth + page.depth - self.depth
+                copy.numchild = page.numchild
+                copy.descendant_count = page.descendant_count
+                copy.set_url_path(parent_copy)
+                # As treebeard does when adding a page, cache the parent for get_parent()
+                # (a private attribute of MP_Node; without it, get_parent() would only cost a query)
+                copy._cached_parent_obj = parent_copy
+
+                copy.latest_revision_created_at = now
+                if keep_live:
+                    copy.first_published_at = now
+                    copy.last_published_at = now
+
+                copies_by_path[page.path] = copy
+                copies.append(copy)
+
+            Page._insert_copies(copies)
+            for page, copy in zip(pages, copies):
+                page_id_map[page.id] = copy.id
+
+            # Copy parental many-to-many relations
+            through_objects = defaultdict(list)
+            for page, copy in zip(pages, copies):
+                for related_field in get_all_child_m2m_relations(page):
+                    values = []
+                    if related_field.name not in page.exclude_fields_in_copy:
+                        values = list(getattr(page, related_field.name).all())
+
+                    through = related_field.remote_field.through
+                    source_attname = through._meta.get_field(related_field.m2m_field_name()).attname
+                    target_attname = through._meta.get_field(related_field.m2m_reverse_field_name()).attname
+                    through_objects[through].extend(
+                        through(**{source_attname: copy.id, target_attname: value.pk}) for value in values
+                    )
+
+                    # Keep the values on the copy too, for its revision below
+                    setattr(copy, related_field.name, values)
+
+            for through, objs in through_objects.items():
+                through._default_manager.bulk_create(objs)
+
+            # Copy child objects
+            child_objects = defaultdict(list)
+            child_object_id_maps = {}
+            for page, copy in zip(pages, copies):
+                for child_relation in get_all_child_relations(page):
+                    accessor_name = child_relation.get_accessor_name()
+                    objs = child_objects_by_page[(page.id, accessor_name)]
+
+                    for child_object in objs:
+                        old_pk = child_object.pk
+                        child_object.pk = None
+                        setattr(child_object, child_relation.field.attname, copy.id)
+
+                        if process_child_object is not None:
+                            process_child_object(page, copy, child_relation, child_object)
+
+                        child_objects[type(child_object)].append((child_object, copy, accessor_name, old_pk))
+
+                    # Keep the objects on the copy too, for its revision below
+                    setattr(copy, accessor_name, objs)
+
+                child_object_id_maps[copy.id] = defaultdict(dict)
+
+            for model, objs in child_objects.items():
+                # The new ids are needed to remap the child objects in revisions, and
+                # bulk_create only sets them on some databases
+                if connection.features.can_return_rows_from_bulk_insert and not model._meta.parents:
+                    model._default_manager.bulk_create([child_object for child_object, copy, accessor_name, old_pk in objs])
+                else:
+                    for child_object, copy, accessor_name, old_pk in objs:
+                        child_object.save()
+
+                for child_object, copy, accessor_name, old_pk in objs:
+                    child_object_id_maps[copy.id][accessor_name][old_pk] = child_object.pk
+
+                    # As in Page.copy, the child objects of child objects aren't copied
+                    for nested_relation in get_all_child_relations(child_object):
+                        setattr(child_object, nested_relation.get_accessor_name(), [])
+
+            # Reading a revision into a copy (with with_content_json) needs these related
+            # objects, so fetch them all at once
+            if copy_revisions:
+                prefetch_related_objects(
+                    [copy for copy in copies if copy.has_unpublished_changes], 'content_type', 'owner', 'locked_by'
+                )
+
+            # Copy revisions, and create a new revision for each copy (as Page.copy does)
+            revisions = []
+            new_revisions = []
+            for page, copy in zip(pages, copies):
+                copied_revisions = []
+                if copy_revisions:
+                    for revision in sorted(page.revisions.all(), key=lambda revision: (revision.created_at, revision.id)):
+                        page._copy_revision(revision, copy, child_object_id_maps[copy.id])
+                        copied_revisions.append(revision)
+
+                if copy.has_unpublished_changes and copied_revisions:
+                    latest_revision = copy.with_content_json(copied_revisions[-1].get_content_json())
+                else:
+                    latest_revision = copy
+
+                new_revision = PageRevision(
+                    page=copy,
+                    user=user,
+                    created_at=now,
+                    expire_at=latest_revision.expire_at,
+                )
+                new_revision.set_content_json(latest_revision.to_json())
+                copy.draft_title = latest_revision.title
+
+                revisions.extend(copied_revisions)
+                revisions.append(new_revision)
+                new_revisions.append(new_revision)
+
+            PageRevision.objects.bulk_create(revisions)
+
+            if keep_live:
+                if new_revisions[0].id is None:
+                    # bulk_create doesn't set ids on this database, so look the new revisions up
+                    revision_ids = dict(
+                        PageRevision.objects.filter(page_id__in=[copy.id for copy in copies], created_at=now)
+                        .values_list('page_id', 'id')
+                    )
+                    for new_revision in new_revisions:
+                        new_revision.id = revision_ids[new_revision.page_id]
+
+                for copy, new_revision in zip(copies, new_revisions):
+                    copy.live_revision = new_revision
+
+            Page.objects.bulk_update(copies, ['draft_title', 'live_revision'])
+
+            for copy in copies:
+                index.insert_or_update_object(copy)
+
+        # Update the tree fields of page_copy and its ancestors, which the copies were added below
+        page_copy.numchild = self.get_children().count()
+        page_copy.descendant_count = len(page_ids)
+        Page.objects.filter(id=page_copy.id).update(numchild=page_copy.numchild)
+        Page._update_descendant_counts(page_copy._get_ancestor_paths(page_copy.path) + [page_copy.path], len(page_ids))
+
+        logger.info(
+            "Page copied: \"%s\" id=%d from=%d, with %d descendants",
+            page_copy.title, page_copy.id, self.id, len(page_ids)
+        )
+
+        return page_id_map
+
+    @classmethod
+    def _insert_copies(cls, copies):
+        """
+        Insert the rows for the given unsaved pages (of any page types), with one query
+        for each table rather than for each page.
+
+        bulk_create refuses models with multi-table inheritance, so this relies on Django
+        internals that it uses itself: the wagtailcore_page rows are inserted by calling
+        bulk_create on Page with instances of its subclasses, and the rows of each page
+        model's own table are inserted with QuerySet._insert, with the parent links set
+        by hand. This is covered by the bulk copy tests in TestCopyPage, including one
+        for a model that inherits from another page model.
+        """
+        Page.objects.bulk_create(copies)
+
+        if copies and copies[0].id is None:
+            # bulk_create doesn't set ids on this database, but paths are unique
+            ids = dict(Page.objects.filter(path__in=[copy.path for copy in copies]).values_list('path', 'id'))
+            for copy in copies:
+                copy.id = ids[copy.path]
+
+        copies_by_model = defaultdict(list)
+        for copy in copies:
+            page_model = copy._meta.concrete_model
+            for model in [page_model] + list(page_model._meta.get_parent_list()):
+                for parent_link in model._meta.parents.values():
+                    setattr(copy, parent_link.attname, copy.id)
+
+                if model is not Page:
+                    copies_by_model[model].append(copy)
+
+        # bulk_create doesn't support multi-table inheritance, so insert the rows of each
+        # page model's own table directly, after those of the tables they link to
+        for model in sorted(copies_by_model, key=lambda model: len(model._meta.get_parent_list())):
+            objs = copies_by_model[model]
+            fields = model._meta.local_concrete_fields
+            using = router.db_for_write(model)
+            batch_size = max(connections[using].ops.bulk_batch_size(fields, objs), 1)
+
+            for start in range(0, len(objs), batch_size):
+                model._base_manager._insert(objs[start:start + batch_size], fields=fields, using=using)
+
     def permissions_for_user(self, user):
         """
         Return a PagePermissionsTester object defining what actions the user can perform on this page
@@ -1611,6 +2000,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         obj.path = self.path
         obj.depth = self.depth
         obj.numchild = self.numchild
+        obj.descendant_count = self.descendant_count
 
         # Update url_path to reflect potential slug changes, but maintining the page's
         # existing tree position
@@ -1668,10 +2058,50 @@ class PageRevision(models.Model):
         blank=True,
         db_index=True
     )
+    # Copy of the page's expire_at at the time of the revision, so that expired revisions
+    # can be found without parsing content_json
+    expire_at = models.DateTimeField(
+        verbose_name=_('expiry date/time'),
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
 
     objects = models.Manager()
     submitted_revisions = SubmittedRevisionsManager()
 
+    # content_json values starting with this prefix hold zlib-compressed, base64-encoded JSON
+    COMPRESSED_CONTENT_PREFIX = 'zlib:'
+
+    @property
+    def is_compressed(self):
+        return self.content_json.startswith(self.COMPRESSED_CONTENT_PREFIX)
+
+    def get_content_json(self):
+        """
+        Return the content of this revision as a JSON string, decompressing it if necessary.
+        """
+        if self.is_compressed:
+            compressed = base64.b64decode(self.content_json[len(self.COMPRESSED_CONTENT_PREFIX):])
+            return zlib.decompress(compressed).decode('utf-8')
+        return self.content_json
+
+    def set_content_json(self, content_json, compress=None):
+        """
+        Set the content of this revision from a JSON string. The content is compressed if
+        ``compress`` is True or, when it is not specified, if the ``WAGTAIL_COMPRESS_REVISIONS``
+        setting is enabled.
+        """
+        if compress is None:
+            compress = getattr(settings, 'WAGTAIL_COMPRESS_REVISIONS', False)
+
+        if compress:
+            compressed = zlib.compress(content_json.encode('utf-8'))
+            self.content_json = self.COMPRESSED_CONTENT_PREFIX + base64.b64encode(compressed).decode('ascii')
+        else:
+            self.content_json = content_json
+
     def save(self, *args, **kwargs):
         # Set default value for created_at to now
         # We cannot use auto_now_add as that will override
@@ -1685,7 +2115,7 @@ class PageRevision(models.Model):
             self.page.revisions.exclude(id=self.id).update(submitted_for_moderation=False)
 
     def as_page_object(self):
-        return self.page.specific.with_content_json(self.content_json)
+        return self.page.specific.with_content_json(self.get_content_json())
 
     def approve_moderation(self):
         if self.submitted_for_moderation:
@@ -1819,6 +2249,54 @@ class UserPagePermissionsProxy:
         if user.is_active and not user.is_superuser:
             self.permissions = GroupPagePermission.objects.filter(group__user=self.user).select_related('page')
 
+    @cached_property
+    def permission_types_by_path(self):
+        """
+        A dict mapping the path of each page that this user has been granted permissions on
+        to the set of permission types granted there. A permission applies to the whole
+        subtree below its page, so the permissions on any page are those found under each
+        prefix of its path; see get_permission_types_for_path.
+        """
+        permission_types_by_path = defaultdict(set)
+        for path, permission_type in self.permissions.values_list('page__path', 'permission_type'):
+            permission_types_by_path[path].add(permission_type)
+        return dict(permission_types_by_path)
+
+    def get_permission_types_for_path(self, path):
+        """Return the set of permission types that this user has on the page with the given path"""
+        permission_types = set()
+        if self.permission_types_by_path:
+            for length in range(Page.steplen, len(path) + 1, Page.steplen):
+                permission_types.update(self.permission_types_by_path.get(path[:length], ()))
+        return permission_types
+
+    def get_subtree_paths(self, *permission_types):
+        """
+        Return the paths of the pages whose subtrees are covered by any of the given
+        permission types, leaving out pages that are within one of the other subtrees
+        """
+        paths = []
+        for path in sorted(
+            path for path, path_permission_types in self.permission_types_by_path.items()
+            if not path_permission_types.isdisjoint(permission_types)
+        ):
+            # Sorting puts each subtree directly after its root page, so a page is covered
+            # by another subtree if and only if it is within the last one added
+            if not paths or not path.startswith(paths[-1]):
+                paths.append(path)
+        return paths
+
+    def get_subtree_q(self, *permission_types, field='path'):
+        """
+        Return a filter expression for the pages within the subtrees covered by any of
+        the given permission types, or None if there are none
+        """
+        q = None
+        for path in self.get_subtree_paths(*permission_types):
+            path_q = Q(**{field + '__startswith': path})
+            q = path_q if q is None else q | path_q
+        return q
+
     def revisions_for_moderation(self):
         """Return a queryset of page revisions awaiting moderation that this user has publish permission on"""
 
@@ -1828,19 +2306,11 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return PageRevision.submitted_revisions.all()
 
-        # get the list of pages for which they have direct publish permission
-        # (i.e. they can publish any page within this subtree)
-        publishable_pages_paths = self.permissions.filter(
-            permission_type='publish'
-        ).values_list('page__path', flat=True).distinct()
-        if not publishable_pages_paths:
-            return PageRevision.objects.none()
-
         # compile a filter expression to apply to the PageRevision.submitted_revisions manager:
         # return only those pages whose paths start with one of the publishable_pages paths
-        only_my_sections = Q(page__path__startswith=publishable_pages_paths[0])
-        for page_path in publishable_pages_paths[1:]:
-            only_my_sections = only_my_sections | Q(page__path__startswith=page_path)
+        only_my_sections = self.get_subtree_q('publish', field='page__path')
+        if only_my_sections is None:
+            return PageRevision.objects.none()
 
         # return the filtered queryset
         return PageRevision.submitted_revisions.filter(only_my_sections)
@@ -1861,32 +2331,38 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        explorable_pages = Page.objects.none()
+        permission_paths = list(self.permission_types_by_path)
+        if not permission_paths:
+            return Page.objects.none()
 
-        # Creates a union queryset of all objects the user has access to add,
-        # edit and publish
-        for perm in self.permissions.filter(
-            Q(permission_type="add")
-            | Q(permission_type="edit")
-            | Q(permission_type="publish")
-            | Q(permission_type="lock")
-        ):
-            explorable_pages |= Page.objects.descendant_of(
-                perm.page, inclusive=True
-            )
+        # All pages that the user has access to add, edit and publish
+        explorable_q = self.get_subtree_q('add', 'edit', 'publish', 'lock')
 
         # For all pages with specific permissions, add their ancestors as
         # explorable. This will allow deeply nested pages to be accessed in the
         # explorer. For example, in the hierarchy A>B>C>D where the user has
         # 'edit' access on D, they will be able to navigate to D without having
         # explicit access to A, B or C.
-        page_permissions = Page.objects.filter(group_permissions__in=self.permissions)
-        for page in page_permissions:
-            explorable_pages |= page.get_ancestors()
+        ancestor_paths = set(
+            path[:length]
+            for path in permission_paths
+            for length in range(Page.steplen, len(path), Page.steplen)
+        )
+        if ancestor_paths:
+            ancestors_q = Q(path__in=ancestor_paths)
+            explorable_q = ancestors_q if explorable_q is None else explorable_q | ancestors_q
 
-        # Remove unnecessary top-level ancestors that the user has no access to
-        fca_page = page_permissions.first_common_ancestor()
-        explorable_pages = explorable_pages.filter(path__startswith=fca_page.path)
+        if explorable_q is None:
+            return Page.objects.none()
+
+        explorable_pages = Page.objects.filter(explorable_q)
+
+        # Remove unnecessary top-level ancestors that the user has no access to, by
+        # only keeping the pages within the first common ancestor of the pages with permissions
+        common_parent_path = posixpath.commonprefix([path[:-Page.steplen] for path in permission_paths])
+        common_parent_path = common_parent_path[:len(common_parent_path) - len(common_parent_path) % Page.steplen]
+        if common_parent_path:
+            explorable_pages = explorable_pages.filter(path__startswith=common_parent_path)
 
         return explorable_pages
 
@@ -1898,19 +2374,22 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        editable_pages = Page.objects.none()
+        # user has edit permission on any subpage of a page with 'add' permission
+        # (including that page itself) that is owned by them
+        editable_q = self.get_subtree_q('add')
+        if editable_q is not None:
+            editable_q &= Q(owner=self.user)
 
-        for perm in self.permissions.filter(permission_type='add'):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) that is owned by them
-            editable_pages |= Page.objects.descendant_of(perm.page, inclusive=True).filter(owner=self.user)
+        # and on any subpage of a page with 'edit' permission (including that page
+        # itself) regardless of owner
+        edit_q = self.get_subtree_q('edit')
+        if edit_q is not None:
+            editable_q = edit_q if editable_q is None else editable_q | edit_q
 
-        for perm in self.permissions.filter(permission_type='edit'):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) regardless of owner
-            editable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        if editable_q is None:
+            return Page.objects.none()
 
-        return editable_pages
+        return Page.objects.filter(editable_q)
 
     def can_edit_pages(self):
         """Return True if the user has permission to edit any pages"""
@@ -1924,14 +2403,13 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        publishable_pages = Page.objects.none()
-
-        for perm in self.permissions.filter(permission_type='publish'):
-            # user has publish permission on any subpage of perm.page
-            # (including perm.page itself)
-            publishable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        # user has publish permission on any subpage of a page with 'publish'
+        # permission (including that page itself)
+        publishable_q = self.get_subtree_q('publish')
+        if publishable_q is None:
+            return Page.objects.none()
 
-        return publishable_pages
+        return Page.objects.filter(publishable_q)
 
     def can_publish_pages(self):
         """Return True if the user has permission to publish any pages"""
@@ -1944,7 +2422,10 @@ class UserPagePermissionsProxy:
         if not self.user.is_active:
             return False
         else:
-            return self.permissions.filter(permission_type='unlock').exists()
+            return any(
+                'unlock' in permission_types
+                for permission_types in self.permission_types_by_path.values()
+            )
 
 
 class PagePermissionTester:
@@ -1955,10 +2436,7 @@ class PagePermissionTester:
         self.page_is_root = page.depth == 1  # Equivalent to page.is_root()
 
         if self.user.is_active and not self.user.is_superuser:
-            self.permissions = set(
-                perm.permission_type for perm in user_perms.permissions
-                if self.page.path.startswith(perm.page.path)
-            )
+            self.permissions = user_perms.get_permission_types_for_path(self.page.path)
 
     def user_has_lock(self):
         return self.page.locked_by_id == self.user.pk
@@ -1,15 +1,21 @@
+import logging
 import posixpath
 from collections import defaultdict
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.db.models import CharField, Q
 from django.db.models.functions import Length, Substr
 from django.db.models.query import BaseIterable
 from treebeard.mp_tree import MP_NodeQuerySet
 
+from wagtail.core.signals import page_unpublished
+from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
 
+logger = logging.getLogger('wagtail.core')
+
 
 class TreeQuerySet(MP_NodeQuerySet):
     """
@@ -133,6 +139,37 @@ class TreeQuerySet(MP_NodeQuerySet):
 
 
 class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
+    def delete(self):
+        """
+        Delete the pages and their descendants (through treebeard's delete), taking them
+        off the descendant counts of their ancestors.
+        """
+        Page = apps.get_model('wagtailcore.Page')
+
+        # Treebeard removes each page along with its whole subtree, so only the pages
+        # at the top of those subtrees change the counts of the pages above them
+        removed_page_counts = defaultdict(int)
+        last_removed_path = None
+        for path, descendant_count in self.order_by('path').values_list('path', 'descendant_count'):
+            if last_removed_path is not None and path.startswith(last_removed_path):
+                continue
+            last_removed_path = path
+
+            for ancestor_path in Page._get_ancestor_paths(path):
+                removed_page_counts[ancestor_path] += descendant_count + 1
+
+        paths_by_removed_page_count = defaultdict(list)
+        for path, removed_page_count in removed_page_counts.items():
+            paths_by_removed_page_count[removed_page_count].append(path)
+
+        with transaction.atomic():
+            for removed_page_count, paths in paths_by_removed_page_count.items():
+                Page._update_descendant_counts(paths, -removed_page_count)
+
+            super().delete()
+
+    delete.queryset_only = True
+
     def live_q(self):
         return Q(live=True)
 
@@ -342,6 +379,44 @@ class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
         for page in self.live():
             page.unpublish()
 
+    def bulk_unpublish(self, set_expired=False):
+        """
+        This unpublishes all live pages in the QuerySet with a fixed number of queries,
+        then sends ``page_unpublished`` and updates the search index for each page.
+        Unlike ``unpublish``, this bypasses ``Page.save`` and ``Page.unpublish``.
+        Returns the list of pages that were unpublished.
+        """
+        from wagtail.core.models import Page, PageRevision
+
+        pages = list(self.live().specific())
+        if not pages:
+            return []
+
+        changes = {
+            'live': False,
+            'has_unpublished_changes': True,
+            'live_revision': None,
+        }
+        if set_expired:
+            changes['expired'] = True
+
+        page_ids = [page.pk for page in pages]
+        with transaction.atomic():
+            Page.objects.filter(id__in=page_ids).update(**changes)
+            PageRevision.objects.filter(page_id__in=page_ids).update(approved_go_live_at=None)
+
+        for page in pages:
+            for field_name, value in changes.items():
+                setattr(page, field_name, value)
+
+            page_unpublished.send(sender=page.specific_class, instance=page)
+            logger.info("Page unpublished: \"%s\" id=%d", page.title, page.id)
+
+            if getattr(page, 'search_auto_update', True):
+                index.insert_or_update_object(page)
+
+        return pages
+
     def specific(self, defer=False):
         """
         This efficiently gets all the specific pages for the queryset, using
@@ -27,7 +27,13 @@ def expand_db_html(html):
         link_rules = features.get_link_types()
         FRONTEND_REWRITER = MultiRuleRewriter([
             LinkRewriter({linktype: handler.expand_db_attributes for linktype, handler in link_rules.items()}),
-            EmbedRewriter({embedtype: handler.expand_db_attributes for embedtype, handler in embed_rules.items()})
+            EmbedRewriter(
+                {embedtype: handler.expand_db_attributes for embedtype, handler in embed_rules.items()},
+                {
+                    embedtype: handler.prefetch_db_attributes for embedtype, handler in embed_rules.items()
+                    if hasattr(handler, 'prefetch_db_attributes')
+                }
+            )
         ])
 
     return FRONTEND_REWRITER(html)
@@ -25,9 +25,24 @@ class EmbedRewriter:
     Rewrites <embed embedtype="foo" /> tags within rich text into the HTML fragment given by the
     embed rule for 'foo'. Each embed rule is a function that takes a dict of attributes and
     returns the HTML fragment.
+
+    Optionally, a prefetch rule for 'foo' can be given, which is called with the list of attribute
+    dicts of all 'foo' tags in the HTML before any of them are rewritten, so that the data they
+    need can be fetched in bulk.
     """
-    def __init__(self, embed_rules):
+    def __init__(self, embed_rules, prefetch_rules=None):
         self.embed_rules = embed_rules
+        self.prefetch_rules = prefetch_rules or {}
+
+    def prefetch(self, html):
+        attrs_by_type = {}
+        for match in FIND_EMBED_TAG.finditer(html):
+            attrs = extract_attrs(match.group(1))
+            if attrs.get('embedtype') in self.prefetch_rules:
+                attrs_by_type.setdefault(attrs['embedtype'], []).append(attrs)
+
+        for embedtype, attrs_list in attrs_by_type.items():
+            self.prefetch_rules[embedtype](attrs_list)
 
     def replace_tag(self, match):
         attrs = extract_attrs(match.group(1))
@@ -39,6 +54,9 @@ class EmbedRewriter:
         return rule(attrs)
 
     def __call__(self, html):
+        if self.prefetch_rules:
+            self.prefetch(html)
+
         return FIND_EMBED_TAG.sub(self.replace_tag, html)
 
 
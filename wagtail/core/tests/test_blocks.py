@@ -5,13 +5,15 @@ import json
 import unittest
 from datetime import date, datetime
 from decimal import Decimal
+from unittest import mock
 
 # non-standard import name for gettext_lazy, to prevent strings from being picked up for translation
 from django import forms
 from django.core.exceptions import ValidationError
 from django.forms.utils import ErrorList
 from django.template.loader import render_to_string
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import translation
 from django.utils.html import format_html
 from django.utils.safestring import SafeData, SafeText, mark_safe
 from django.utils.translation import gettext_lazy as __
@@ -2688,6 +2690,42 @@ class TestStreamBlock(WagtailTestUtils, SimpleTestCase):
             html
         )
 
+    def test_render_form_with_block_form_url(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            paragraph = blocks.CharBlock()
+
+        block = ArticleBlock()
+        value = block.to_python([
+            {'type': 'heading', 'value': "My title"},
+            {'type': 'paragraph', 'value': "My first paragraph"},
+        ])
+        errors = ErrorList([
+            blocks.StreamBlockValidationError(block_errors={
+                1: ErrorList([ValidationError("Not a good paragraph")])
+            })
+        ])
+        html = block.render_form(value, prefix='myarticle', errors=errors, block_form_url='/block-form/')
+
+        # Blocks are rendered as summaries, with their value in the lazy field
+        self.assertNotIn('id="myarticle-0-value"', html)
+        self.assertIn('<p class="help">My title</p>', html)
+        self.assertTagInHTML('<div id="myarticle-0-summary" data-block-form-url="/block-form/">', html)
+        self.assertInHTML(
+            '<input type="hidden" id="myarticle-0-lazy" name="myarticle-0-lazy" value="&quot;My title&quot;">', html
+        )
+
+        # Blocks with errors are rendered in full
+        self.assertNotIn('id="myarticle-1-lazy"', html)
+        self.assertInHTML(
+            (
+                '<input id="myarticle-1-value" name="myarticle-1-value" placeholder="Paragraph"'
+                ' type="text" value="My first paragraph" />'
+            ),
+            html
+        )
+
+
     def test_value_omitted_from_data(self):
         block = blocks.StreamBlock([
             ('heading', blocks.CharBlock()),
@@ -2879,6 +2917,29 @@ class TestStreamBlock(WagtailTestUtils, SimpleTestCase):
             html
         )
 
+    def test_all_html_declarations_are_cached(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            paragraph = blocks.CharBlock()
+
+        block = ArticleBlock()
+        html = block.all_html_declarations()
+
+        with mock.patch.object(ArticleBlock, 'html_declarations', return_value='') as html_declarations:
+            self.assertEqual(block.all_html_declarations(), html)
+            html_declarations.assert_not_called()
+
+            # Declarations are rendered per language
+            with translation.override('fr'):
+                block.all_html_declarations()
+            html_declarations.assert_called_once()
+
+            # and again when settings change
+            with override_settings(WAGTAILADMIN_RICH_TEXT_EDITORS={}):
+                block.all_html_declarations()
+            self.assertEqual(html_declarations.call_count, 2)
+
+
     def test_html_declarations_uses_default(self):
         class ArticleBlock(blocks.StreamBlock):
             heading = blocks.CharBlock(default="Fish found on moon")
@@ -3129,6 +3190,57 @@ class TestStreamBlock(WagtailTestUtils, SimpleTestCase):
         self.assertEqual(value[1].id, '0000')
         self.assertEqual(value[1].value, 'this is my heading')
 
+    def test_value_from_datadict_with_lazy_values(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            paragraph = blocks.RichTextBlock()
+
+        block = ArticleBlock()
+
+        value = block.value_from_datadict({
+            'foo-count': '2',
+            'foo-0-deleted': '',
+            'foo-0-order': '0',
+            'foo-0-type': 'heading',
+            'foo-0-id': '0000',
+            'foo-0-value': 'this is my heading',
+            'foo-0-lazy': '',
+            'foo-1-deleted': '',
+            'foo-1-order': '1',
+            'foo-1-type': 'paragraph',
+            'foo-1-id': '0001',
+            'foo-1-lazy': '"<p>this is a paragraph</p>"',
+        }, {}, prefix='foo')
+
+        # Blocks whose forms were never opened take their value from the lazy field
+        self.assertEqual(value[0].value, 'this is my heading')
+        self.assertIsInstance(value[1].value, RichText)
+        self.assertEqual(value[1].value.source, '<p>this is a paragraph</p>')
+        self.assertEqual(value[1].id, '0001')
+
+    def test_value_from_datadict_with_malformed_lazy_value(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            paragraph = blocks.RichTextBlock()
+
+        block = ArticleBlock()
+
+        value = block.value_from_datadict({
+            'foo-count': '2',
+            'foo-0-deleted': '',
+            'foo-0-order': '0',
+            'foo-0-type': 'heading',
+            'foo-0-value': 'this is my heading',
+            'foo-1-deleted': '',
+            'foo-1-order': '1',
+            'foo-1-type': 'paragraph',
+            'foo-1-lazy': '"<p>this is a paragraph</p>',
+        }, {}, prefix='foo')
+
+        # The block with the malformed value is left out
+        self.assertEqual(len(value), 1)
+        self.assertEqual(value[0].value, 'this is my heading')
+
     def check_get_prep_value(self, stream_data, is_lazy):
         class ArticleBlock(blocks.StreamBlock):
             heading = blocks.CharBlock()
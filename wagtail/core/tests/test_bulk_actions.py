@@ -0,0 +1,170 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import management
+from django.test import TestCase, override_settings
+
+from wagtail.core.bulk_actions import (
+    DeletePagesAction, MovePagesAction, PublishPagesAction, UnpublishPagesAction)
+from wagtail.core.models import Page
+from wagtail.search import index
+
+
+class TestBulkPageActions(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.events_index = Page.objects.get(url_path='/home/events/')
+        self.christmas = Page.objects.get(url_path='/home/events/christmas/')
+        self.saint_patrick = Page.objects.get(url_path='/home/events/saint-patrick/')
+        self.about_us = Page.objects.get(url_path='/home/about-us/')
+
+    def test_unpublish(self):
+        live_events = list(self.events_index.get_children().live().values_list('id', flat=True))
+        progress = []
+
+        processed, skipped = UnpublishPagesAction(
+            self.events_index.get_children().values_list('id', flat=True),
+            batch_size=2, progress_callback=lambda done, total: progress.append((done, total))
+        ).execute()
+
+        self.assertEqual(processed, len(live_events))
+        self.assertFalse(self.events_index.get_children().live().exists())
+
+        # Progress is reported after each batch
+        total = self.events_index.get_children().count()
+        self.assertEqual(progress[-1], (total, total))
+        self.assertEqual([done for done, total in progress], list(range(2, total, 2)) + [total])
+
+    def test_publish(self):
+        self.christmas.specific.save_revision()
+        self.christmas.refresh_from_db()
+        self.assertTrue(self.christmas.has_unpublished_changes)
+
+        processed, skipped = PublishPagesAction([self.christmas.id, self.saint_patrick.id]).execute()
+
+        # Saint Patrick has no unpublished changes
+        self.assertEqual((processed, skipped), (1, 1))
+        self.christmas.refresh_from_db()
+        self.assertFalse(self.christmas.has_unpublished_changes)
+
+    def test_delete(self):
+        page_count = Page.objects.count()
+        events_count = self.events_index.get_descendant_count() + 1
+
+        # Christmas is deleted along with the events index, and counted as changed
+        processed, skipped = DeletePagesAction(
+            [self.events_index.id, self.christmas.id, self.about_us.id]
+        ).execute()
+
+        self.assertEqual((processed, skipped), (3, 0))
+        self.assertEqual(Page.objects.count(), page_count - events_count - 1)
+        self.assertEqual(Page.find_descendant_count_problems(), {})
+
+    def test_delete_subtree_counts(self):
+        home = Page.objects.get(id=2)
+        descendant_ids = list(home.get_descendants().values_list('id', flat=True))
+
+        processed, skipped = DeletePagesAction(descendant_ids + [999999]).execute()
+
+        # Only the page that doesn't exist is skipped
+        self.assertEqual((processed, skipped), (len(descendant_ids), 1))
+        self.assertFalse(home.get_descendants().exists())
+
+    def test_subtree_skipped_with_ancestor(self):
+        event_moderator = get_user_model().objects.get(username='eventmoderator')
+        home = Page.objects.get(id=2)
+
+        # Event moderators can't move the events index, so the selected events are skipped with it
+        processed, skipped = MovePagesAction(
+            [self.events_index.id, self.christmas.id], destination=self.about_us, user=event_moderator
+        ).execute()
+
+        self.assertEqual((processed, skipped), (0, 2))
+        self.assertEqual(self.events_index.get_parent().id, home.id)
+
+    def test_move(self):
+        destination = self.about_us
+        processed, skipped = MovePagesAction(
+            [self.christmas.id, self.saint_patrick.id], destination=destination
+        ).execute()
+
+        self.assertEqual((processed, skipped), (2, 0))
+        destination.refresh_from_db()
+        self.assertEqual(
+            list(destination.get_children().values_list('url_path', flat=True)),
+            ['/home/about-us/christmas/', '/home/about-us/saint-patrick/']
+        )
+        self.assertEqual(Page.find_descendant_count_problems(), {})
+
+    def test_move_skips_clashing_slugs(self):
+        destination = self.about_us
+        destination.add_child(instance=Page(title="Christmas", slug='christmas'))
+
+        processed, skipped = MovePagesAction(
+            [self.christmas.id, self.saint_patrick.id], destination=destination
+        ).execute()
+
+        self.assertEqual((processed, skipped), (1, 1))
+        self.assertEqual(Page.objects.get(id=self.christmas.id).url_path, '/home/events/christmas/')
+
+    def test_user_permissions(self):
+        event_moderator = get_user_model().objects.get(username='eventmoderator')
+
+        processed, skipped = UnpublishPagesAction(
+            [self.christmas.id, self.about_us.id], user=event_moderator
+        ).execute()
+
+        # Event moderators can't unpublish pages outside the events section
+        self.assertEqual((processed, skipped), (1, 1))
+        self.assertFalse(Page.objects.get(id=self.christmas.id).live)
+        self.assertTrue(Page.objects.get(id=self.about_us.id).live)
+
+    @override_settings(WAGTAILFRONTENDCACHE={
+        'varnish': {
+            'BACKEND': 'wagtail.contrib.frontend_cache.tests.MockBackend',
+        },
+    })
+    def test_side_effects_are_batched(self):
+        with mock.patch('wagtail.contrib.frontend_cache.tests.MockBackend.purge_batch') as purge_batch, \
+                mock.patch.object(index, '_apply_deferred_updates') as apply_deferred_updates:
+            UnpublishPagesAction([self.christmas.id, self.saint_patrick.id]).execute()
+
+        # One purge and one set of index updates for the batch
+        purge_batch.assert_called_once()
+        self.assertIn('http://localhost/events/christmas/', purge_batch.call_args[0][0])
+        self.assertIn('http://localhost/events/saint-patrick/pointless-suffix/', purge_batch.call_args[0][0])
+        apply_deferred_updates.assert_called_once()
+        self.assertEqual(
+            sorted(pk for model, pk in apply_deferred_updates.call_args[0][0]),
+            sorted([self.christmas.id, self.saint_patrick.id])
+        )
+
+
+class TestBulkPageActionCommand(TestCase):
+    fixtures = ['test.json']
+
+    def run_command(self, *args, **options):
+        output = StringIO()
+        management.call_command('bulk_page_action', *args, stdout=output, **options)
+        output.seek(0)
+        return output.read()
+
+    def test_move_children(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        about_us = Page.objects.get(url_path='/home/about-us/')
+        child_count = events_index.get_children().count()
+
+        output = self.run_command(
+            'move', children_of=events_index.id, destination=about_us.id, batch_size=2
+        )
+
+        self.assertIn("Done: %d pages changed, 0 skipped" % child_count, output)
+        self.assertIn("%d of %d pages processed" % (child_count, child_count), output)
+        self.assertFalse(Page.objects.child_of(events_index).exists())
+        self.assertEqual(Page.objects.child_of(about_us).count(), child_count)
+
+    def test_move_requires_destination(self):
+        with self.assertRaises(management.CommandError):
+            self.run_command('move', '4')
@@ -47,6 +47,18 @@ class TestFixTreeCommand(TestCase):
         # Check if its fixed
         self.assertEqual(Page.objects.get(url_path='/home/').numchild, old_numchild)
 
+    def test_fixes_descendant_count(self):
+        # Break it
+        Page.objects.filter(url_path='/home/').update(descendant_count=12345)
+
+        # Call command
+        output = self.run_command()
+
+        # Check if its fixed
+        self.assertIn("Incorrect descendant_count value found", output.read())
+        homepage = Page.objects.get(url_path='/home/')
+        self.assertEqual(homepage.descendant_count, homepage.get_descendants().count())
+
     def test_fixes_depth(self):
         # Get homepage and save old value
         homepage = Page.objects.get(url_path='/home/')
@@ -131,6 +143,40 @@ class TestMovePagesCommand(TestCase):
             self.assertEqual(Page.objects.get(id=page_id).get_parent(), about_us)
 
 
+class TestCopyPageTreeCommand(TestCase):
+    fixtures = ['test.json']
+
+    def run_command(self, *args, **options):
+        output = StringIO()
+        management.call_command('copy_page_tree', *[str(arg) for arg in args], stdout=output, **options)
+        output.seek(0)
+        return output.read()
+
+    def test_copy_page_tree(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        about_us = Page.objects.get(url_path='/home/about-us/')
+        descendant_count = events_index.get_descendants().count()
+
+        output = self.run_command(events_index.id, about_us.id, draft=False)
+
+        page_copy = Page.objects.get(url_path='/home/about-us/events/')
+        self.assertIn("Copied %d pages. The copy of \"Events\" has ID %d" % (descendant_count + 1, page_copy.id), output)
+        self.assertEqual(page_copy.get_descendants().count(), descendant_count)
+        self.assertFalse(page_copy.get_descendants().filter(live=True).exists())
+
+        # The original is left in place
+        self.assertEqual(events_index.get_descendants().count(), descendant_count)
+
+    def test_slug_in_use(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+
+        with self.assertRaises(management.CommandError):
+            self.run_command(events_index.id, events_index.get_parent().id)
+
+        self.run_command(events_index.id, events_index.get_parent().id, slug='events-copy')
+        self.assertTrue(Page.objects.filter(url_path='/home/events-copy/christmas/').exists())
+
+
 class TestSetUrlPathsCommand(TestCase):
 
     fixtures = ['test.json']
@@ -200,7 +246,7 @@ class TestPublishScheduledPagesCommand(TestCase):
         self.assertFalse(p.live)
         self.assertTrue(PageRevision.objects.filter(page=p).exclude(approved_go_live_at__isnull=True).exists())
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertTrue(p.live)
@@ -229,7 +275,7 @@ class TestPublishScheduledPagesCommand(TestCase):
         page.title = "Goodbye world!"
         page.save_revision(submitted_for_moderation=False)
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertTrue(p.live)
@@ -252,7 +298,7 @@ class TestPublishScheduledPagesCommand(TestCase):
         self.assertFalse(p.live)
         self.assertTrue(PageRevision.objects.filter(page=p).exclude(approved_go_live_at__isnull=True).exists())
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertFalse(p.live)
@@ -282,7 +328,7 @@ class TestPublishScheduledPagesCommand(TestCase):
         p = Page.objects.get(slug='hello-world')
         self.assertTrue(p.live)
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertFalse(p.live)
@@ -307,7 +353,7 @@ class TestPublishScheduledPagesCommand(TestCase):
         p = Page.objects.get(slug='hello-world')
         self.assertTrue(p.live)
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertTrue(p.live)
@@ -329,11 +375,38 @@ class TestPublishScheduledPagesCommand(TestCase):
         self.assertFalse(p.live)
         self.assertTrue(PageRevision.objects.filter(page=p, submitted_for_moderation=True).exists())
 
-        management.call_command('publish_scheduled_pages')
+        management.call_command('publish_scheduled_pages', stdout=StringIO())
 
         p = Page.objects.get(slug='hello-world')
         self.assertFalse(PageRevision.objects.filter(page=p, submitted_for_moderation=True).exists())
 
+    def test_revision_expiry_is_stored_on_revision(self):
+        expire_at = timezone.now() - timedelta(days=1)
+        page = SimplePage(
+            title="Hello world!",
+            slug="hello-world",
+            content="hello",
+            live=False,
+            expire_at=expire_at,
+        )
+        self.root_page.add_child(instance=page)
+
+        revision = page.save_revision(submitted_for_moderation=True)
+        revision.refresh_from_db()
+        self.assertEqual(revision.expire_at, expire_at)
+
+        # Revisions without an expiry date are left in the moderation queue
+        other_page = SimplePage(title="Other page", slug="other-page", content="hello", live=False)
+        self.root_page.add_child(instance=other_page)
+        other_page.save_revision(submitted_for_moderation=True)
+
+        output = StringIO()
+        management.call_command('publish_scheduled_pages', stdout=output)
+
+        self.assertFalse(PageRevision.objects.filter(page=page, submitted_for_moderation=True).exists())
+        self.assertTrue(PageRevision.objects.filter(page=other_page, submitted_for_moderation=True).exists())
+        self.assertIn("Expired revisions dropped from moderation: 1", output.getvalue())
+
 
 class TestPurgeRevisionsCommand(TestCase):
     fixtures = ['test.json']
@@ -422,3 +495,67 @@ class TestPurgeRevisionsCommand(TestCase):
 
         # revision is now older than 30 days, so should be deleted
         self.assertNotIn(old_revision, PageRevision.objects.filter(page=self.page))
+
+    def test_purge_revisions_in_batches(self):
+        other_page = SimplePage(title="Other page", slug="other-page", content="hello", live=False)
+        self.root_page.add_child(instance=other_page)
+
+        revisions = [page.save_revision() for i in range(3) for page in (self.page, other_page)]
+
+        output = StringIO()
+        management.call_command('purge_revisions', '--batch-size=2', verbosity=2, stdout=output)
+
+        # only the latest revision of each page should remain
+        self.assertEqual(
+            set(PageRevision.objects.filter(page__in=[self.page, other_page])),
+            set(revisions[-2:])
+        )
+        self.assertIn("Successfully deleted 4 revisions", output.getvalue())
+        self.assertIn("Processed revisions up to id", output.getvalue())
+
+    def test_purge_revisions_dry_run(self):
+        revision_1 = self.page.save_revision()
+        revision_2 = self.page.save_revision()
+
+        output = StringIO()
+        management.call_command('purge_revisions', '--dry-run', stdout=output)
+
+        self.assertIn("Would delete 1 revisions", output.getvalue())
+        self.assertIn(revision_1, PageRevision.objects.filter(page=self.page))
+        self.assertIn(revision_2, PageRevision.objects.filter(page=self.page))
+
+
+class TestCompressRevisionsCommand(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.page = SimplePage(title="Hello world!", slug="hello-world", content="hello", live=False)
+        Page.objects.get(id=2).add_child(instance=self.page)
+
+    def run_command(self, *args):
+        output = StringIO()
+        management.call_command('compress_revisions', *args, stdout=output)
+        return output.getvalue()
+
+    def test_compress_and_decompress(self):
+        revision = self.page.save_revision()
+        content_json = revision.content_json
+        self.assertFalse(revision.is_compressed)
+
+        output = self.run_command('--batch-size=1')
+        self.assertIn("Compressed 1 revisions", output)
+
+        revision.refresh_from_db()
+        self.assertTrue(revision.is_compressed)
+        self.assertEqual(revision.get_content_json(), content_json)
+        self.assertEqual(revision.as_page_object().content, "hello")
+
+        # Already compressed revisions are left alone
+        self.assertIn("Compressed 0 revisions", self.run_command())
+
+        output = self.run_command('--decompress')
+        self.assertIn("Decompressed 1 revisions", output)
+
+        revision.refresh_from_db()
+        self.assertFalse(revision.is_compressed)
+        self.assertEqual(revision.content_json, content_json)
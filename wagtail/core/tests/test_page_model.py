@@ -14,6 +14,7 @@ from django.test.utils import override_settings
 from freezegun import freeze_time
 
 from wagtail.core.models import Page, PageManager, Site, get_page_models
+from wagtail.core.signals import page_tree_copied
 from wagtail.tests.testapp.models import (
     AbstractPage, Advert, AlwaysShowInMenusPage, BlogCategory, BlogCategoryBlogPage, BusinessChild,
     BusinessIndex, BusinessNowherePage, BusinessSubIndex, CustomManager, CustomManagerPage,
@@ -606,6 +607,92 @@ class TestMovePage(TestCase):
         self.assertEqual(christmas.url_path, '/home/about-us/events/christmas/')
 
 
+class TestDescendantCount(TestCase):
+    fixtures = ['test.json']
+
+    def assertDescendantCountsCorrect(self):
+        self.assertEqual(Page.find_descendant_count_problems(), {})
+
+    def get_descendant_count(self, url_path):
+        return Page.objects.get(url_path=url_path).descendant_count
+
+    def test_fixture_counts(self):
+        self.assertDescendantCountsCorrect()
+        self.assertEqual(self.get_descendant_count('/home/'), Page.objects.get(url_path='/home/').get_descendants().count())
+
+    def test_add_child(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        home_count = self.get_descendant_count('/home/')
+
+        events_index.add_child(instance=SimplePage(title="New event", slug='new-event', content="hello"))
+
+        self.assertEqual(self.get_descendant_count('/home/'), home_count + 1)
+        self.assertDescendantCountsCorrect()
+
+    def test_add_sibling(self):
+        christmas = Page.objects.get(url_path='/home/events/christmas/')
+        events_count = self.get_descendant_count('/home/events/')
+
+        christmas.add_sibling(pos='left', instance=SimplePage(title="New event", slug='new-event', content="hello"))
+
+        self.assertEqual(self.get_descendant_count('/home/events/'), events_count + 1)
+        self.assertDescendantCountsCorrect()
+
+    def test_move(self):
+        about_us_page = Page.objects.get(url_path='/home/about-us/')
+        events_index = Page.objects.get(url_path='/home/events/')
+        home_count = self.get_descendant_count('/home/')
+
+        events_index.move(about_us_page, pos='last-child')
+
+        self.assertEqual(self.get_descendant_count('/home/about-us/'), events_index.descendant_count + 1)
+        self.assertEqual(self.get_descendant_count('/home/'), home_count)
+        self.assertDescendantCountsCorrect()
+
+    def test_move_out_of_sibling_to_left(self):
+        # Moving a page to the left of an earlier sibling of its parent renumbers the parent
+        homepage = Page.objects.get(url_path='/home/')
+        christmas = Page.objects.get(url_path='/home/events/christmas/')
+
+        christmas.move(homepage.get_first_child(), pos='left')
+
+        self.assertDescendantCountsCorrect()
+
+    def test_delete(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        home_count = self.get_descendant_count('/home/')
+
+        events_index.delete()
+
+        self.assertEqual(self.get_descendant_count('/home/'), home_count - events_index.descendant_count - 1)
+        self.assertDescendantCountsCorrect()
+
+    def test_delete_queryset_with_nested_pages(self):
+        Page.objects.filter(url_path__startswith='/home/events/').delete()
+
+        self.assertFalse(Page.objects.filter(url_path__startswith='/home/events/').exists())
+        self.assertDescendantCountsCorrect()
+
+    def test_copy_recursive(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        homepage = Page.objects.get(url_path='/home/')
+
+        events_index.copy(recursive=True, update_attrs={'slug': 'new-events'}, to=homepage)
+
+        self.assertEqual(self.get_descendant_count('/home/new-events/'), events_index.descendant_count)
+        self.assertDescendantCountsCorrect()
+
+    def test_saving_outdated_instance_keeps_count(self):
+        homepage = Page.objects.get(url_path='/home/')
+        events_index = Page.objects.get(url_path='/home/events/')
+        events_index.add_child(instance=SimplePage(title="New event", slug='new-event', content="hello"))
+
+        homepage.title = "New homepage title"
+        homepage.save()
+
+        self.assertDescendantCountsCorrect()
+
+
 class TestPrevNextSiblings(TestCase):
     fixtures = ['test.json']
 
@@ -1267,6 +1354,143 @@ class TestCopyPage(TestCase):
             # reset excluded fields for future tests
             EventPage.exclude_fields_in_copy = []
 
+    def test_copy_page_recursively_in_bulk(self):
+        events_index = EventIndex.objects.get(url_path='/home/events/')
+        christmas_event = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_event.categories = [EventCategory.objects.create(name='Holidays')]
+        christmas_event.save()
+
+        # Leave a draft on the Christmas event
+        christmas_event.title = "Christmas draft"
+        christmas_event.save_revision()
+
+        new_events_index = events_index.copy(
+            recursive=True, update_attrs={'title': "New events index", 'slug': 'new-events-index'}
+        )
+        bulk_events_index = events_index.copy(
+            recursive=True, update_attrs={'title': "Bulk events index", 'slug': 'bulk-events-index'}, bulk=True
+        )
+
+        # The bulk copy is the same as the ordinary one
+        new_pages = [page.specific for page in new_events_index.get_descendants().order_by('path')]
+        bulk_pages = [page.specific for page in bulk_events_index.get_descendants().order_by('path')]
+        self.assertEqual(len(bulk_pages), events_index.get_descendants().count())
+
+        for new_page, bulk_page in zip(new_pages, bulk_pages):
+            self.assertIs(type(bulk_page), type(new_page))
+            for field in [
+                'title', 'draft_title', 'slug', 'live', 'has_unpublished_changes',
+                'depth', 'numchild', 'descendant_count', 'owner_id'
+            ]:
+                self.assertEqual(getattr(bulk_page, field), getattr(new_page, field))
+
+            self.assertEqual(
+                bulk_page.url_path, new_page.url_path.replace('/new-events-index/', '/bulk-events-index/')
+            )
+            self.assertEqual(bulk_page.revisions.count(), new_page.revisions.count())
+            self.assertEqual(bulk_page.get_latest_revision_as_page().title, new_page.get_latest_revision_as_page().title)
+            self.assertEqual(bulk_page.live_revision.as_page_object().pk, bulk_page.pk)
+
+            if isinstance(new_page, EventPage):
+                self.assertEqual(
+                    list(bulk_page.speakers.values_list('first_name', flat=True)),
+                    list(new_page.speakers.values_list('first_name', flat=True))
+                )
+                self.assertEqual(list(bulk_page.categories.all()), list(new_page.categories.all()))
+
+        bulk_christmas_event = bulk_events_index.get_children().get(slug='christmas').specific
+        self.assertEqual(bulk_christmas_event.title, "Christmas")
+        self.assertEqual(bulk_christmas_event.get_latest_revision_as_page().title, "Christmas draft")
+        self.assertEqual(
+            [speaker.pk for speaker in bulk_christmas_event.get_latest_revision_as_page().speakers.all()],
+            list(bulk_christmas_event.speakers.values_list('pk', flat=True))
+        )
+
+        # The tree is intact
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+        self.assertEqual(Page.find_descendant_count_problems(), {})
+        self.assertEqual(
+            Page.objects.get(id=bulk_events_index.id).descendant_count, events_index.get_descendants().count()
+        )
+
+    def test_copy_page_recursively_in_bulk_with_multi_level_inheritance(self):
+        events_index = EventIndex.objects.get(url_path='/home/events/')
+        saint_patrick_event = SingleEventPage.objects.get(url_path='/home/events/saint-patrick/')
+
+        new_events_index = events_index.copy(
+            recursive=True, update_attrs={'title': "New events index", 'slug': 'new-events-index'}, bulk=True
+        )
+
+        # The rows of each of the tables of SingleEventPage (which inherits from EventPage)
+        # are inserted, and linked to each other
+        new_saint_patrick_event = new_events_index.get_children().get(slug='saint-patrick')
+        self.assertEqual(new_saint_patrick_event.content_type, saint_patrick_event.content_type)
+        self.assertEqual(new_saint_patrick_event.title, saint_patrick_event.title)
+
+        self.assertEqual(
+            EventPage.objects.filter(page_ptr_id=new_saint_patrick_event.id).values('date_from', 'audience', 'location').get(),
+            EventPage.objects.filter(page_ptr_id=saint_patrick_event.id).values('date_from', 'audience', 'location').get()
+        )
+        self.assertEqual(
+            SingleEventPage.objects.filter(eventpage_ptr_id=new_saint_patrick_event.id).values_list('excerpt', flat=True).get(),
+            "A little tiny excerpt for Saint Patrick."
+        )
+
+        new_saint_patrick_event = new_saint_patrick_event.specific
+        self.assertIsInstance(new_saint_patrick_event, SingleEventPage)
+        self.assertEqual(new_saint_patrick_event.excerpt, "A little tiny excerpt for Saint Patrick.")
+        self.assertEqual(new_saint_patrick_event.date_from, saint_patrick_event.date_from)
+
+    def test_copy_page_recursively_in_bulk_without_keeping_live(self):
+        events_index = EventIndex.objects.get(url_path='/home/events/')
+        christmas_event = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_event.save_revision()
+
+        new_events_index = events_index.copy(
+            recursive=True, update_attrs={'title': "New events index", 'slug': 'new-events-index'},
+            copy_revisions=False, keep_live=False, bulk=True
+        )
+
+        new_christmas_event = new_events_index.get_children().get(slug='christmas')
+        self.assertFalse(new_christmas_event.live)
+        self.assertTrue(new_christmas_event.has_unpublished_changes)
+        self.assertIsNone(new_christmas_event.live_revision)
+        self.assertIsNone(new_christmas_event.first_published_at)
+        self.assertEqual(new_christmas_event.revisions.count(), 1)
+
+    def test_copy_page_recursively_in_bulk_sends_one_signal(self):
+        events_index = EventIndex.objects.get(url_path='/home/events/')
+        signal_fired = Mock()
+        page_tree_copied.connect(signal_fired)
+        self.addCleanup(page_tree_copied.disconnect, signal_fired)
+
+        new_events_index = events_index.copy(
+            recursive=True, update_attrs={'title': "New events index", 'slug': 'new-events-index'}, bulk=True
+        )
+
+        signal_fired.assert_called_once()
+        kwargs = signal_fired.call_args[1]
+        self.assertEqual(kwargs['sender'], EventIndex)
+        self.assertEqual(kwargs['instance'], new_events_index)
+        self.assertEqual(kwargs['source'], events_index)
+        self.assertEqual(
+            kwargs['page_id_map'],
+            dict(zip(
+                events_index.get_descendants(inclusive=True).order_by('path').values_list('id', flat=True),
+                new_events_index.get_descendants(inclusive=True).order_by('path').values_list('id', flat=True)
+            ))
+        )
+
+    def test_copy_page_recursively_in_bulk_to_the_same_tree(self):
+        events_index = EventIndex.objects.get(url_path='/home/events/')
+
+        with self.assertRaises(Exception) as exception:
+            events_index.copy(
+                recursive=True, update_attrs={'title': "New events index", 'slug': 'new-events-index'},
+                to=events_index, bulk=True
+            )
+        self.assertEqual(str(exception.exception), "You cannot copy a tree branch recursively into itself")
+
 
 
 class TestSubpageTypeBusinessRules(TestCase, WagtailTestUtils):
@@ -1799,6 +2023,55 @@ class TestPageWithContentJSON(TestCase):
         self.assertEqual(updated_page.url_path, '/home/about-them/')
 
 
+class TestCompressedRevisions(TestCase):
+    fixtures = ['test.json']
+
+    @override_settings(WAGTAIL_COMPRESS_REVISIONS=True)
+    def test_save_revision_compresses_content(self):
+        christmas_event = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_event.title = "Last Christmas"
+        revision = christmas_event.save_revision()
+        revision.refresh_from_db()
+
+        self.assertTrue(revision.is_compressed)
+        self.assertEqual(json.loads(revision.get_content_json())['title'], "Last Christmas")
+
+        page = revision.as_page_object()
+        self.assertEqual(page.title, "Last Christmas")
+        self.assertEqual(page.speakers.count(), christmas_event.speakers.count())
+
+        revision.publish()
+        christmas_event.refresh_from_db()
+        self.assertEqual(christmas_event.title, "Last Christmas")
+
+    def test_compressed_and_uncompressed_revisions_can_be_mixed(self):
+        christmas_event = EventPage.objects.get(url_path='/home/events/christmas/')
+        uncompressed_revision = christmas_event.save_revision()
+
+        with self.settings(WAGTAIL_COMPRESS_REVISIONS=True):
+            christmas_event.title = "Last Christmas"
+            compressed_revision = christmas_event.save_revision()
+
+        self.assertFalse(uncompressed_revision.is_compressed)
+        self.assertTrue(compressed_revision.is_compressed)
+        self.assertEqual(uncompressed_revision.as_page_object().title, "Christmas")
+        self.assertEqual(compressed_revision.as_page_object().title, "Last Christmas")
+
+    @override_settings(WAGTAIL_COMPRESS_REVISIONS=True)
+    def test_copy_compressed_revisions(self):
+        christmas_event = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_event.save_revision()
+
+        new_christmas_event = christmas_event.copy(
+            update_attrs={'title': "New christmas event", 'slug': 'new-christmas-event'},
+            copy_revisions=True
+        )
+
+        new_revision = new_christmas_event.revisions.order_by('-created_at', '-id').first()
+        self.assertTrue(new_revision.is_compressed)
+        self.assertEqual(json.loads(new_revision.get_content_json())['pk'], new_christmas_event.pk)
+
+
 class TestUnpublish(TestCase):
 
     def test_unpublish_doesnt_call_full_clean_before_save(self):
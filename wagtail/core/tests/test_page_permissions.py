@@ -618,6 +618,85 @@ class TestPagePermission(TestCase):
         self.assertTrue(other_perms.page_locked())
 
 
+class TestUserPagePermissionsProxyQueries(TestCase):
+    fixtures = ['test.json']
+
+    def test_permission_testers_share_one_query(self):
+        event_moderator = get_user_model().objects.get(username='eventmoderator')
+        pages = list(Page.objects.all())
+
+        user_perms = UserPagePermissionsProxy(event_moderator)
+        with self.assertNumQueries(1):
+            for page in pages:
+                user_perms.for_page(page)
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        about_us_page = Page.objects.get(url_path='/home/about-us/')
+        self.assertEqual(
+            user_perms.for_page(christmas_page).permissions, {'add', 'edit', 'publish', 'lock', 'unlock'}
+        )
+        self.assertEqual(user_perms.for_page(about_us_page).permissions, set())
+
+    def test_permission_querysets_compile_to_single_queries(self):
+        corporate_editor = get_user_model().objects.get(username='corporateeditor')
+        user_perms = UserPagePermissionsProxy(corporate_editor)
+
+        with self.assertNumQueries(1):
+            user_perms.get_permission_types_for_path('0001')
+
+        with self.assertNumQueries(1):
+            list(user_perms.explorable_pages())
+        with self.assertNumQueries(1):
+            list(user_perms.editable_pages())
+
+        # corporateeditor has no publish permissions, so that is known without a query
+        with self.assertNumQueries(0):
+            self.assertEqual(list(user_perms.publishable_pages()), [])
+
+        event_moderator = get_user_model().objects.get(username='eventmoderator')
+        user_perms = UserPagePermissionsProxy(event_moderator)
+        with self.assertNumQueries(2):
+            self.assertTrue(user_perms.publishable_pages().exists())
+
+    def test_get_subtree_paths_skips_nested_permissions(self):
+        user = get_user_model().objects.get(username='eventeditor')
+        group = Group.objects.create(name='Nested')
+        user.groups.add(group)
+        events_page = Page.objects.get(url_path='/home/events/')
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        GroupPagePermission.objects.create(group=group, page=christmas_page, permission_type='edit')
+
+        user_perms = UserPagePermissionsProxy(user)
+        self.assertEqual(user_perms.get_subtree_paths('add', 'edit'), [events_page.path])
+        self.assertEqual(user_perms.get_subtree_paths('edit'), [christmas_page.path])
+        self.assertEqual(user_perms.get_subtree_paths('publish'), [])
+
+    def test_explorable_pages_are_limited_to_first_common_ancestor(self):
+        event_editor = get_user_model().objects.get(username='eventeditor')
+        events_page = Page.objects.get(url_path='/home/events/')
+
+        explorable_pages = UserPagePermissionsProxy(event_editor).explorable_pages()
+
+        # The homepage is the parent of the only page with permissions, so it's kept
+        # for navigation, but nothing above it is
+        self.assertTrue(explorable_pages.filter(url_path='/home/').exists())
+        self.assertFalse(explorable_pages.filter(depth=1).exists())
+        self.assertEqual(
+            set(explorable_pages.exclude(url_path='/home/').values_list('pk', flat=True)),
+            set(Page.objects.descendant_of(events_page, inclusive=True).values_list('pk', flat=True))
+        )
+
+    def test_user_without_page_permissions(self):
+        user = get_user_model().objects.create_user(username='nopermissions', password='password')
+        user_perms = UserPagePermissionsProxy(user)
+
+        self.assertFalse(user_perms.explorable_pages().exists())
+        self.assertFalse(user_perms.editable_pages().exists())
+        self.assertFalse(user_perms.publishable_pages().exists())
+        self.assertFalse(user_perms.revisions_for_moderation().exists())
+        self.assertFalse(user_perms.can_remove_locks())
+
+
 class TestPagePermissionTesterCanCopyTo(TestCase):
     """Tests PagePermissionTester.can_copy_to()"""
 
@@ -517,6 +517,38 @@ class TestPageQuerySetSearch(TestCase):
         # but already unpublished
         self.assertNotIn((EventPage, unpublished_event), unpublish_signals_fired)
 
+    def test_bulk_unpublish(self):
+        # set up a listener for the unpublish signal
+        unpublish_signals_fired = []
+
+        def page_unpublished_handler(sender, instance, **kwargs):
+            unpublish_signals_fired.append((sender, instance))
+
+        page_unpublished.connect(page_unpublished_handler)
+
+        events_index = Page.objects.get(url_path='/home/events/')
+        unpublished_pages = events_index.get_children().bulk_unpublish(set_expired=True)
+
+        christmas = EventPage.objects.get(url_path='/home/events/christmas/')
+        saint_patrick = SingleEventPage.objects.get(url_path='/home/events/saint-patrick/')
+        unpublished_event = EventPage.objects.get(url_path='/home/events/tentative-unpublished-event/')
+
+        self.assertIn(christmas, unpublished_pages)
+        self.assertNotIn(unpublished_event, unpublished_pages)
+
+        self.assertFalse(christmas.live)
+        self.assertTrue(christmas.expired)
+        self.assertTrue(christmas.has_unpublished_changes)
+        self.assertIsNone(christmas.live_revision)
+        self.assertFalse(saint_patrick.live)
+
+        # Check that a signal was fired for each unpublished page, with the specific instance
+        self.assertIn((EventPage, christmas), unpublish_signals_fired)
+        self.assertIn((SingleEventPage, saint_patrick), unpublish_signals_fired)
+        self.assertNotIn((EventPage, unpublished_event), unpublish_signals_fired)
+        for sender, instance in unpublish_signals_fired:
+            self.assertIsInstance(instance, sender)
+
 
 class TestSpecificQuery(TestCase):
     """
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*
+import hashlib
+from io import BytesIO
+
 from django.test import TestCase
 from django.utils.text import slugify
 
-from wagtail.core.utils import accepts_kwarg, cautious_slugify
+from wagtail.core.utils import HASH_READ_SIZE, accepts_kwarg, cautious_slugify, hash_filelike
 
 
 class TestCautiousSlugify(TestCase):
@@ -50,3 +53,19 @@ class TestAcceptsKwarg(TestCase):
         self.assertFalse(accepts_kwarg(func_without_banana, 'banana'))
         self.assertTrue(accepts_kwarg(func_with_banana, 'banana'))
         self.assertTrue(accepts_kwarg(func_with_kwargs, 'banana'))
+
+
+class TestHashFilelike(TestCase):
+
+    def test_hash_matches_whole_file_hash(self):
+        contents = b'wagtail' * HASH_READ_SIZE
+        self.assertEqual(hash_filelike(BytesIO(contents)), hashlib.sha1(contents).hexdigest())
+
+    def test_hash_empty_file(self):
+        self.assertEqual(hash_filelike(BytesIO()), hashlib.sha1(b'').hexdigest())
+
+    def test_file_is_rewound(self):
+        f = BytesIO(b'wagtail')
+        f.seek(3)
+        self.assertEqual(hash_filelike(f), hashlib.sha1(b'wagtail').hexdigest())
+        self.assertEqual(f.tell(), 0)
@@ -1,3 +1,4 @@
+import hashlib
 import inspect
 import re
 import unicodedata
@@ -132,3 +133,29 @@ class InvokeViaAttributeShortcut:
     def __getattr__(self, name):
         method = getattr(self.obj, self.method_name)
         return method(name)
+
+
+HASH_READ_SIZE = 65536  # 64k
+
+
+def hash_filelike(filelike):
+    """
+    Compute the SHA-1 hash of a file-like object, reading it in fixed-size chunks so that
+    memory use stays constant regardless of the size of the file. The file is read from
+    the beginning, and rewound again afterwards if possible.
+    """
+    hasher = hashlib.sha1()
+
+    if hasattr(filelike, 'seek'):
+        filelike.seek(0)
+
+    while True:
+        chunk = filelike.read(HASH_READ_SIZE)
+        if not chunk:
+            break
+        hasher.update(chunk)
+
+    if hasattr(filelike, 'seek'):
+        filelike.seek(0)
+
+    return hasher.hexdigest()
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.14 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtaildocs', '0010_document_file_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+    ]
@@ -11,6 +11,7 @@ from taggit.managers import TaggableManager
 
 from wagtail.admin.models import get_object_usage
 from wagtail.core.models import CollectionMember
+from wagtail.core.utils import hash_filelike
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
 
@@ -19,6 +20,10 @@ class DocumentQuerySet(SearchableQuerySetMixin, models.QuerySet):
     pass
 
 
+def file_deduplication_enabled():
+    return getattr(settings, 'WAGTAILDOCS_DEDUPLICATE_FILES', False)
+
+
 class AbstractDocument(CollectionMember, index.Indexed, models.Model):
     title = models.CharField(max_length=255, verbose_name=_('title'))
     file = models.FileField(upload_to='documents', verbose_name=_('file'))
@@ -36,7 +41,7 @@ class AbstractDocument(CollectionMember, index.Indexed, models.Model):
 
     file_size = models.PositiveIntegerField(null=True, editable=False)
     # A SHA-1 hash of the file contents
-    file_hash = models.CharField(max_length=40, blank=True, editable=False)
+    file_hash = models.CharField(max_length=40, blank=True, editable=False, db_index=True)
 
     objects = DocumentQuerySet.as_manager()
 
@@ -101,18 +106,71 @@ class AbstractDocument(CollectionMember, index.Indexed, models.Model):
 
         return self.file_size
 
-    def _set_file_hash(self, file_contents):
-        self.file_hash = hashlib.sha1(file_contents).hexdigest()
+    def _set_file_hash(self, file_contents=None):
+        if file_contents is None:
+            # Hash the file in chunks, rather than reading it all into memory
+            self.file_hash = hash_filelike(self.file)
+        else:
+            self.file_hash = hashlib.sha1(file_contents).hexdigest()
 
     def get_file_hash(self):
         if self.file_hash == '':
             with self.open_file() as f:
-                self._set_file_hash(f.read())
+                self.file_hash = hash_filelike(f)
 
             self.save(update_fields=['file_hash'])
 
         return self.file_hash
 
+    def get_duplicates(self):
+        """
+        Returns the other documents with the same file contents as this one, as
+        identified by the file hash
+        """
+        if not self.file_hash:
+            return self.__class__.objects.none()
+
+        return self.__class__.objects.filter(file_hash=self.file_hash).exclude(pk=self.pk)
+
+    def reuse_existing_file(self):
+        """
+        When WAGTAILDOCS_DEDUPLICATE_FILES is enabled and another document has the
+        same file contents, point this document at that document's stored file rather
+        than storing another copy of the uploaded file. Must be called after
+        _set_file_hash() and before saving.
+
+        Returns the document whose file is now being shared, or None.
+        """
+        if not file_deduplication_enabled():
+            return None
+
+        duplicate = self.get_duplicates().order_by('pk').first()
+        if duplicate is None:
+            return None
+
+        self.file = duplicate.file.name
+        self.file_size = duplicate.file_size
+
+        return duplicate
+
+    def delete_file_if_unused(self, file=None):
+        """
+        Delete a stored file (this document's own file, if not specified) from storage,
+        unless file deduplication is enabled and another document is still using it.
+        """
+        if file is None:
+            file = self.file
+
+        if not file:
+            return
+
+        if file_deduplication_enabled() and self.__class__.objects.filter(file=file.name).exists():
+            return
+
+        # NB Doing this via file.delete() clears the file field, which isn't what
+        # we want if the file is no longer this document's current one
+        file.storage.delete(file.name)
+
     def __str__(self):
         return self.title
 
@@ -5,8 +5,8 @@ from wagtail.documents import get_document_model
 
 
 def post_delete_file_cleanup(instance, **kwargs):
-    # Pass false so FileField doesn't save the model.
-    transaction.on_commit(lambda: instance.file.delete(False))
+    # The file may be shared with other instances if file deduplication is enabled
+    transaction.on_commit(lambda: instance.delete_file_if_unused())
 
 
 def register_signal_handlers():
@@ -935,6 +935,24 @@ class TestDocumentChooserUploadView(TestCase, WagtailTestUtils):
         # Document should be created
         self.assertTrue(models.Document.objects.filter(title="Test document").exists())
 
+    @override_settings(WAGTAILDOCS_DEDUPLICATE_FILES=True)
+    def test_post_duplicate_chooses_existing_document(self):
+        existing_document = models.Document(title="Existing document", file=get_test_document_file())
+        existing_document._set_file_hash()
+        existing_document.save()
+
+        response = self.client.post(reverse('wagtaildocs:chooser_upload'), {
+            'document-chooser-upload-title': "Test document",
+            'document-chooser-upload-file': get_test_document_file(),
+        })
+
+        response_json = json.loads(response.content.decode())
+        self.assertEqual(response_json['step'], 'document_chosen')
+        self.assertEqual(response_json['result']['id'], existing_document.id)
+
+        # No new document should have been created
+        self.assertFalse(models.Document.objects.filter(title="Test document").exists())
+
 
 class TestDocumentChooserUploadViewWithLimitedPermissions(TestCase, WagtailTestUtils):
     def setUp(self):
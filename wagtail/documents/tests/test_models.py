@@ -140,6 +140,28 @@ class TestFilesDeletedForDefaultModels(TransactionTestCase):
             self.assertTrue(document.file.storage.exists(filename))
         self.assertFalse(document.file.storage.exists(filename))
 
+    @override_settings(WAGTAILDOCS_DEDUPLICATE_FILES=True)
+    def test_shared_document_file_deleted_when_unused(self):
+        Document = get_document_model()
+        document = Document(title="Test document", file=get_test_image_file())
+        document._set_file_hash()
+        document.save()
+        filename = document.file.name
+
+        duplicate = Document(title="Duplicate document", file=get_test_image_file())
+        duplicate._set_file_hash()
+        self.assertEqual(duplicate.reuse_existing_file(), document)
+        duplicate.save()
+        self.assertEqual(duplicate.file.name, filename)
+
+        with transaction.atomic():
+            duplicate.delete()
+        self.assertTrue(document.file.storage.exists(filename))
+
+        with transaction.atomic():
+            document.delete()
+        self.assertFalse(document.file.storage.exists(filename))
+
 
 @override_settings(WAGTAILDOCS_DOCUMENT_MODEL='tests.CustomDocument')
 class TestFilesDeletedForCustomModels(TestFilesDeletedForDefaultModels):
@@ -1,7 +1,7 @@
 import os.path
 import unittest
 import urllib
-from io import StringIO
+from io import BytesIO, StringIO
 from unittest import mock
 
 from django.conf import settings
@@ -9,6 +9,7 @@ from django.core.files.base import ContentFile
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils.http import http_date, parse_http_date
 
 from wagtail.documents import models
 
@@ -111,6 +112,119 @@ class TestServeView(TestCase):
     def test_has_cache_control_header(self):
         self.assertIn(self.get()['Cache-Control'], ['max-age=3600, public', 'public, max-age=3600'])
 
+    def test_has_last_modified_header(self):
+        self.assertEqual(
+            parse_http_date(self.get()['Last-Modified']),
+            int(self.document.created_at.timestamp())
+        )
+
+    def test_accept_ranges_header(self):
+        self.assertEqual(self.get()['Accept-Ranges'], 'bytes')
+
+    def get_range(self, byte_range, **headers):
+        self.response = self.client.get(
+            reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)),
+            HTTP_RANGE=byte_range, **headers
+        )
+        return self.response
+
+    def test_range(self):
+        response = self.get_range('bytes=2-7')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-7/25')
+        self.assertEqual(response['Content-Length'], '6')
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+
+    def test_open_ended_range(self):
+        response = self.get_range('bytes=17-')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 17-24/25')
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_suffix_range(self):
+        response = self.get_range('bytes=-8')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_range_past_end_of_file(self):
+        response = self.get_range('bytes=17-1000')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 17-24/25')
+
+    def test_unsatisfiable_range(self):
+        response = self.get_range('bytes=25-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */25')
+        del self.response
+
+    def test_multiple_ranges_sends_whole_file(self):
+        response = self.get_range('bytes=0-1,4-5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"A boring example document")
+
+    def test_if_range_matches(self):
+        response = self.get_range('bytes=2-7', HTTP_IF_RANGE='"123456"')
+        self.assertEqual(response.status_code, 206)
+
+    def test_if_range_does_not_match(self):
+        response = self.get_range('bytes=2-7', HTTP_IF_RANGE='"654321"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"A boring example document")
+
+    def test_if_none_match(self):
+        response = self.client.get(
+            reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)),
+            HTTP_IF_NONE_MATCH='"123456"'
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], '"123456"')
+
+    def test_if_modified_since(self):
+        response = self.client.get(
+            reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)),
+            HTTP_IF_MODIFIED_SINCE=http_date(self.document.created_at.timestamp() + 60)
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_does_not_fire_document_served(self):
+        mock_handler = mock.MagicMock()
+        models.document_served.connect(mock_handler)
+
+        self.client.get(
+            reverse('wagtaildocs_serve', args=(self.document.id, self.document.filename)),
+            HTTP_IF_NONE_MATCH='"123456"'
+        )
+
+        models.document_served.disconnect(mock_handler)
+        self.assertEqual(mock_handler.call_count, 0)
+
+    @mock.patch('wagtail.documents.views.serve.hooks')
+    @mock.patch('wagtail.documents.views.serve.get_object_or_404')
+    def test_non_local_filesystem_range(self, mock_get_object_or_404, mock_hooks):
+        mock_doc = mock.Mock()
+        mock_doc.filename = self.document.filename
+        mock_doc.file = BytesIO(b"A boring example document")
+        mock_doc.file.path = None
+        mock_doc.file.url = None
+        mock_doc.get_file_size.return_value = 25
+        mock_get_object_or_404.return_value = mock_doc
+        mock_hooks.get_hooks.return_value = []
+
+        response = self.get_range('bytes=2-7')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-7/25')
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+        del self.response
+
+    @override_settings(WAGTAILDOCS_SERVE_CHUNK_SIZE=10)
+    def test_chunk_size(self):
+        self.assertEqual(
+            list(self.get().streaming_content),
+            [b"A boring e", b"xample doc", b"ument"]
+        )
+
     def clear_sendfile_cache(self):
         from wagtail.utils.sendfile import _get_sendfile
         _get_sendfile.clear()
@@ -11,6 +11,7 @@ from wagtail.core import hooks
 from wagtail.core.models import Collection
 from wagtail.documents import get_document_model
 from wagtail.documents.forms import get_document_form
+from wagtail.documents.models import file_deduplication_enabled
 from wagtail.documents.permissions import permission_policy
 from wagtail.search import index as search_index
 
@@ -27,6 +28,23 @@ def get_chooser_context():
     }
 
 
+def get_existing_document(request, document):
+    """
+    When WAGTAILDOCS_DEDUPLICATE_FILES is enabled, return a document the user can
+    choose that has the same file contents as the (unsaved) uploaded document, if any
+    """
+    if not file_deduplication_enabled():
+        return None
+
+    documents = document.get_duplicates()
+
+    # allow hooks to modify the queryset
+    for hook in hooks.get_hooks('construct_document_chooser_queryset'):
+        documents = hook(documents, request)
+
+    return documents.order_by('pk').first()
+
+
 def get_document_result_data(document):
     """
     helper function: given a document, return the json data to pass back to the
@@ -135,14 +153,17 @@ def chooser_upload(request):
             document.file_size = document.file.size
 
             # Set new document file hash
-            document.file.seek(0)
-            document._set_file_hash(document.file.read())
-            document.file.seek(0)
+            document._set_file_hash()
 
-            form.save()
+            # If file deduplication is enabled, offer an identical existing document instead
+            existing_document = get_existing_document(request, document)
+            if existing_document is not None:
+                document = existing_document
+            else:
+                form.save()
 
-            # Reindex the document to make sure all tags are indexed
-            search_index.insert_or_update_object(document)
+                # Reindex the document to make sure all tags are indexed
+                search_index.insert_or_update_object(document)
 
             return render_modal_workflow(
                 request, None, None,
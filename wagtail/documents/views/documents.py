@@ -104,9 +104,10 @@ def add(request):
             doc.file_size = doc.file.size
 
             # Set new document file hash
-            doc.file.seek(0)
-            doc._set_file_hash(doc.file.read())
-            doc.file.seek(0)
+            doc._set_file_hash()
+
+            # Share the stored file of an identical document, if file deduplication is enabled
+            doc.reuse_existing_file()
 
             form.save()
 
@@ -146,16 +147,17 @@ def edit(request, document_id):
                 doc.file_size = doc.file.size
 
                 # Set new document file hash
-                doc.file.seek(0)
-                doc._set_file_hash(doc.file.read())
-                doc.file.seek(0)
+                doc._set_file_hash()
+
+                # Share the stored file of an identical document, if file deduplication is enabled
+                doc.reuse_existing_file()
+
                 doc.save()
                 form.save_m2m()
 
-                # If providing a new document file, delete the old one.
-                # NB Doing this via original_file.delete() clears the file field,
-                # which definitely isn't what we want...
-                original_file.storage.delete(original_file.name)
+                # If providing a new document file, delete the old one
+                # (unless another document is sharing it)
+                doc.delete_file_if_unused(original_file)
             else:
                 doc = form.save()
 
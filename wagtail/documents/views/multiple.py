@@ -54,9 +54,9 @@ def add(request):
             doc.file_size = doc.file.size
 
             # Set new document file hash
-            doc.file.seek(0)
-            doc._set_file_hash(doc.file.read())
-            doc.file.seek(0)
+            doc._set_file_hash()
+
+            duplicate = doc.reuse_existing_file()
 
             doc.save()
 
@@ -66,6 +66,7 @@ def add(request):
                 'doc_id': int(doc.id),
                 'form': render_to_string('wagtaildocs/multiple/edit_form.html', {
                     'doc': doc,
+                    'duplicate': duplicate,
                     'form': DocumentMultiForm(
                         instance=doc, prefix='doc-%d' % doc.id, user=request.user
                     ),
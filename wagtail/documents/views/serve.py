@@ -1,13 +1,14 @@
+import functools
 import urllib
-from wsgiref.util import FileWrapper
 
 from django.conf import settings
-from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.cache import cache_control
-from django.views.decorators.http import etag
 
 from wagtail.core import hooks
 from wagtail.core.forms import PasswordViewRestrictionForm
@@ -18,13 +19,22 @@ from wagtail.utils import sendfile_streaming_backend
 from wagtail.utils.sendfile import sendfile
 
 
-def document_etag(request, document_id, document_filename):
-    Document = get_document_model()
-    if hasattr(Document, 'file_hash'):
-        return Document.objects.filter(id=document_id).values_list('file_hash', flat=True).first()
+def get_chunk_size():
+    return getattr(settings, 'WAGTAILDOCS_SERVE_CHUNK_SIZE', 64 * 1024)
+
+
+def document_etag(doc):
+    if hasattr(type(doc), 'file_hash') and doc.file_hash:
+        return quote_etag(doc.file_hash)
+
+
+def document_last_modified(doc):
+    # Replacing a document's file gives it a new filename, and so a new URL, so the
+    # time the document was created is also when the file at this URL last changed
+    if hasattr(type(doc), 'created_at') and doc.created_at:
+        return int(doc.created_at.timestamp())
 
 
-@etag(document_etag)
 @cache_control(max_age=3600, public=True)
 def serve(request, document_id, document_filename):
     Document = get_document_model()
@@ -41,8 +51,26 @@ def serve(request, document_id, document_filename):
         if isinstance(result, HttpResponse):
             return result
 
-    # Send document_served signal
-    document_served.send(sender=Document, instance=doc, request=request)
+    etag = document_etag(doc)
+    last_modified = document_last_modified(doc)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        # Send document_served signal
+        document_served.send(sender=Document, instance=doc, request=request)
+
+        response = serve_document_file(request, doc, etag, last_modified)
+
+    if request.method in ('GET', 'HEAD'):
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        if etag:
+            response.setdefault('ETag', etag)
+
+    return response
+
+
+def serve_document_file(request, doc, etag=None, last_modified=None):
 
     try:
         local_path = doc.file.path
@@ -88,7 +116,9 @@ def serve(request, document_id, document_filename):
                 local_path,
                 attachment=True,
                 attachment_filename=doc.filename,
-                backend=sendfile_streaming_backend.sendfile
+                backend=functools.partial(
+                    sendfile_streaming_backend.sendfile, chunk_size=get_chunk_size(), etag=etag
+                )
             )
 
     else:
@@ -97,18 +127,18 @@ def serve(request, document_id, document_filename):
         # (e.g. storages.backends.s3boto.S3BotoStorage) AND the developer has not allowed
         # redirecting to the file url directly.
         # Fall back on pre-sendfile behaviour of reading the file content and serving it
-        # as a StreamingHttpResponse
+        # as a StreamingHttpResponse (or just the part of it requested by the Range header)
 
-        wrapper = FileWrapper(doc.file)
-        response = StreamingHttpResponse(wrapper, content_type='application/octet-stream')
+        response = sendfile_streaming_backend.ranged_file_response(
+            request, doc.file, doc.get_file_size(), chunk_size=get_chunk_size(),
+            etag=etag, last_modified=last_modified
+        )
+        response['Content-Type'] = 'application/octet-stream'
 
         # set filename and filename* to handle non-ascii characters in filename
         # see https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Content-Disposition
         response['Content-Disposition'] = "attachment; filename={0}; filename*=UTF-8''{0}".format(urllib.parse.quote(doc.filename))
 
-        # FIXME: storage backends are not guaranteed to implement 'size'
-        response['Content-Length'] = doc.file.size
-
         return response
 
 
@@ -12,3 +12,6 @@ class WagtailEmbedsAppConfig(AppConfig):
     def ready(self):
         # Check configuration on startup
         get_finders()
+
+        from wagtail.embeds.signal_handlers import register_signal_handlers
+        register_signal_handlers()
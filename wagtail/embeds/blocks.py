@@ -3,6 +3,7 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from wagtail.core import blocks
+from wagtail.embeds.embeds import prefetch_embeds
 from wagtail.embeds.format import embed_to_frontend_html
 
 
@@ -14,11 +15,20 @@ class EmbedValue:
     we want to be able to do {% embed value.url 500 %} without
     doing a redundant fetch of the embed at the default width.
     """
-    def __init__(self, url):
+    def __init__(self, url, prefetch_urls=None):
         self.url = url
 
+        # A list of URLs (shared with other EmbedValues) to be looked up together
+        # the first time any of them is rendered
+        self.prefetch_urls = prefetch_urls
+
     @cached_property
     def html(self):
+        if self.prefetch_urls:
+            prefetch_embeds(self.prefetch_urls)
+            # Empty the shared list, so that the other values don't look them up again
+            self.prefetch_urls.clear()
+
         return embed_to_frontend_html(self.url)
 
     def __str__(self):
@@ -44,6 +54,10 @@ class EmbedBlock(blocks.URLBlock):
         else:
             return EmbedValue(value)
 
+    def bulk_to_python(self, values):
+        urls = [value for value in values if value]
+        return [EmbedValue(value, prefetch_urls=urls) if value else None for value in values]
+
     def get_prep_value(self, value):
         # serialisable value should be a URL string
         if value is None:
@@ -1,17 +1,130 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.db import IntegrityError, transaction
+
 from .exceptions import EmbedUnsupportedProviderException
 from .finders import get_finders
 from .models import Embed
 
+logger = logging.getLogger('wagtail.embeds')
 
-def get_embed(url, max_width=None, finder=None):
-    # Check database
+# Embeds looked up during the current request, keyed by (url, max_width).
+# This is only populated while a request is being handled; see signal_handlers.py
+_request_cache = threading.local()
+
+
+def get_shared_cache():
+    """
+    Returns the Django cache to keep embeds in, if a cache named 'embeds' is configured
+    """
     try:
-        return Embed.objects.get(url=url, max_width=max_width)
-    except Embed.DoesNotExist:
-        pass
+        return caches['embeds']
+    except InvalidCacheBackendError:
+        return None
+
+
+def get_cache_key(url, max_width=None):
+    return "wagtail-embed-{}-{}".format(hashlib.sha1(url.encode('utf-8')).hexdigest(), max_width)
+
+
+def start_request_cache():
+    _request_cache.embeds = {}
+
+
+def end_request_cache():
+    _request_cache.embeds = None
+
+
+def get_request_cache():
+    return getattr(_request_cache, 'embeds', None)
+
+
+def clear_cached_embed(url, max_width=None):
+    """
+    Removes an embed from the request and shared caches, so that the next lookup
+    reads it from the database
+    """
+    request_cache = get_request_cache()
+    if request_cache is not None:
+        request_cache.pop((url, max_width), None)
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(get_cache_key(url, max_width))
+
+
+def cache_embeds(embeds):
+    request_cache = get_request_cache()
+    if request_cache is not None:
+        for embed in embeds:
+            request_cache[(embed.url, embed.max_width)] = embed
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None and embeds:
+        shared_cache.set_many({
+            get_cache_key(embed.url, embed.max_width): embed
+            for embed in embeds
+        })
+
+
+def get_cached_embeds(urls, max_width=None):
+    """
+    Looks up the embeds for the given URLs in the request and shared caches, then in
+    the database, with one query for all of them. Returns a dict mapping each URL to
+    its Embed; URLs that have not been fetched yet are left out.
+    """
+    found = {}
+    urls = set(urls)
+
+    request_cache = get_request_cache()
+    if request_cache is not None:
+        for url in urls:
+            embed = request_cache.get((url, max_width))
+            if embed is not None:
+                found[url] = embed
+
+    missing_urls = urls - set(found)
+    if missing_urls:
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            cache_keys = {get_cache_key(url, max_width): url for url in missing_urls}
+            for cache_key, embed in shared_cache.get_many(cache_keys.keys()).items():
+                found[cache_keys[cache_key]] = embed
+
+            if request_cache is not None:
+                for url in missing_urls & set(found):
+                    request_cache[(url, max_width)] = found[url]
+
+            missing_urls -= set(found)
 
+        if missing_urls:
+            embeds = list(Embed.objects.filter(url__in=missing_urls, max_width=max_width))
+            cache_embeds(embeds)
+            found.update((embed.url, embed) for embed in embeds)
+
+    return found
+
+
+def prefetch_embeds(urls, max_width=None):
+    """
+    Loads the embeds for the given URLs into the request cache, so that rendering
+    each of them doesn't need its own database query
+    """
+    if get_request_cache() is not None:
+        get_cached_embeds(urls, max_width=max_width)
+
+
+def find_embed(url, max_width=None, finder=None):
+    """
+    Fetches the embed data for the given URL from the finders (or the given finder
+    function), and returns it as a dict of valid Embed field values
+    """
     # Get/Call finder
     if not finder:
         def finder(url, max_width=None):
@@ -38,6 +151,17 @@ def get_embed(url, max_width=None, finder=None):
     if 'html' not in embed_dict or not embed_dict['html']:
         embed_dict['html'] = ''
 
+    return embed_dict
+
+
+def get_embed(url, max_width=None, finder=None):
+    # Check caches and database
+    embed = get_cached_embeds([url], max_width=max_width).get(url)
+    if embed is not None:
+        return embed
+
+    embed_dict = find_embed(url, max_width, finder=finder)
+
     # Create database record
     embed, created = Embed.objects.get_or_create(
         url=url,
@@ -49,4 +173,58 @@ def get_embed(url, max_width=None, finder=None):
     embed.last_updated = datetime.now()
     embed.save()
 
+    cache_embeds([embed])
+
     return embed
+
+
+def _find_embed_or_none(url, max_width=None):
+    try:
+        return find_embed(url, max_width)
+    except Exception:
+        # Leave this embed to be fetched (and any error reported) when it is rendered
+        logger.warning("Could not fetch embed for %s", url, exc_info=True)
+        return None
+
+
+def fetch_embeds(urls, max_width=None, workers=None):
+    """
+    Fetches the embeds for those of the given URLs that aren't in the database yet,
+    requesting them from their providers in parallel (with up to `workers` threads,
+    WAGTAILEMBEDS_FETCH_WORKERS by default), and stores them with one bulk insert.
+    URLs that can't be fetched are skipped. Returns the list of new embeds.
+    """
+    urls = set(urls)
+    if not urls:
+        return []
+
+    urls -= set(Embed.objects.filter(url__in=urls, max_width=max_width).values_list('url', flat=True))
+    if not urls:
+        return []
+
+    if workers is None:
+        workers = getattr(settings, 'WAGTAILEMBEDS_FETCH_WORKERS', 8)
+
+    urls = list(urls)
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+        embed_dicts = list(executor.map(lambda url: _find_embed_or_none(url, max_width), urls))
+
+    new_embeds = [
+        Embed(url=url, max_width=max_width, **embed_dict)
+        for url, embed_dict in zip(urls, embed_dicts)
+        if embed_dict is not None
+    ]
+
+    try:
+        with transaction.atomic():
+            Embed.objects.bulk_create(new_embeds)
+    except IntegrityError:
+        # Some of these embeds have been created elsewhere in the meantime
+        for embed in new_embeds:
+            Embed.objects.get_or_create(url=embed.url, max_width=max_width, defaults={
+                field.attname: getattr(embed, field.attname)
+                for field in Embed._meta.concrete_fields
+                if not field.primary_key
+            })
+
+    return new_embeds
@@ -1,7 +1,12 @@
 from importlib import import_module
 
-from django.utils.module_loading import import_string
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# The configured finders, built on first use and reused for the lifetime of the process
+_finders = None
 
 
 def import_finder_class(dotted_path):
@@ -35,12 +40,25 @@ def _get_config_from_settings():
 
 
 def get_finders():
-    finders = []
+    global _finders
+
+    if _finders is None:
+        finders = []
+
+        for finder_config in _get_config_from_settings():
+            finder_config = finder_config.copy()
+            cls = import_finder_class(finder_config.pop('class'))
+
+            finders.append(cls(**finder_config))
+
+        _finders = finders
+
+    return _finders
 
-    for finder_config in _get_config_from_settings():
-        finder_config = finder_config.copy()
-        cls = import_finder_class(finder_config.pop('class'))
 
-        finders.append(cls(**finder_config))
+@receiver(setting_changed)
+def reset_finders(setting, **kwargs):
+    global _finders
 
-    return finders
+    if setting == 'WAGTAILEMBEDS_FINDERS':
+        _finders = None
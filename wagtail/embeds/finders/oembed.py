@@ -1,5 +1,7 @@
 import json
 import re
+import socket
+from collections import defaultdict
 from urllib import request as urllib_request
 from urllib.error import URLError
 from urllib.parse import urlencode
@@ -10,12 +12,92 @@ from wagtail.embeds.oembed_providers import all_providers
 
 from .base import EmbedFinder
 
+# Matches the scheme at the start of a provider URL pattern, such as '^http(?:s)?://'
+PATTERN_SCHEME_RE = re.compile(r'\^http(?:s\??|\(\?:s\)\??|\[s\]\??)?://')
+
+# Splits a regular expression into escape sequences, character classes and single characters
+PATTERN_TOKEN_RE = re.compile(r'\\.|\[\^?\]?[^\]]*\]|.', re.DOTALL)
+
+# Characters that may appear in a literal hostname, other than '.'
+HOSTNAME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-')
+
+# Matches the scheme and host (everything up to the first '/') of a URL
+URL_HOST_RE = re.compile(r'https?://([^/]*)')
+
+
+def get_pattern_hostname(pattern):
+    """
+    Works out the hostname, or a suffix of the hostname starting at a label
+    boundary, that every URL matched by the given provider URL pattern must
+    have. Returns a (hostname, exact) tuple, or None if the pattern is too
+    complex to tell.
+    """
+    match = PATTERN_SCHEME_RE.match(pattern)
+    if match is None:
+        return None
+
+    tokens = PATTERN_TOKEN_RE.findall(pattern[match.end():])
+
+    depth = 0
+    for token in tokens:
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif token == '|' and depth == 0:
+            # A top-level alternation applies to the scheme too
+            return None
+
+    try:
+        host_tokens = tokens[:tokens.index('/')]
+    except ValueError:
+        return None
+
+    for token in host_tokens:
+        if token == '.' or (token.startswith('[') and token.startswith('[^') != ('/' in token)):
+            # A wildcard, or a character class that includes '/', could match past the hostname
+            return None
+
+    # Collect the literal text at the end of the hostname
+    hostname = ''
+    while host_tokens:
+        token = host_tokens[-1]
+        if token == '\\.':
+            char = '.'
+        elif token == '\\-' or token in HOSTNAME_CHARS:
+            char = token[-1]
+        else:
+            break
+
+        hostname = char + hostname
+        host_tokens.pop()
+
+    if not host_tokens:
+        # The whole hostname is literal
+        return hostname, True
+
+    # Drop any optional prefix group, such as '(?:www\.)?', to see what comes before it
+    if host_tokens[-1] in ('?', '*', '+') and len(host_tokens) > 2 and host_tokens[-2] == ')':
+        host_tokens = host_tokens[:-2]
+
+    if hostname.startswith('.'):
+        hostname = hostname[1:]
+    elif host_tokens[-1] != '\\.':
+        # The literal text may only be the end of a label; skip past it
+        hostname = hostname.partition('.')[2]
+
+    if not hostname:
+        return None
+
+    return hostname, False
+
 
 class OEmbedFinder(EmbedFinder):
     options = {}
+    timeout = None
     _endpoints = None
 
-    def __init__(self, providers=None, options=None):
+    def __init__(self, providers=None, options=None, timeout=None):
         self._endpoints = {}
 
         for provider in providers or all_providers:
@@ -28,15 +110,59 @@ class OEmbedFinder(EmbedFinder):
 
             self._endpoints[endpoint] = patterns
 
+        self._build_hostname_index()
+
+        if timeout is not None:
+            self.timeout = timeout
+
         if options:
             self.options = self.options.copy()
             self.options.update(options)
 
-    def _get_endpoint(self, url):
+    def _build_hostname_index(self):
+        """
+        Index the URL patterns by the hostname they match, so that only the handful
+        of patterns for a URL's host need to be tried. Patterns that can't be indexed
+        are tried for every URL.
+        """
+        self._exact_hostnames = defaultdict(list)
+        self._hostname_suffixes = defaultdict(list)
+        self._unindexed_patterns = []
+
+        order = 0
         for endpoint, patterns in self._endpoints.items():
             for pattern in patterns:
-                if re.match(pattern, url):
-                    return endpoint
+                entry = (order, pattern, endpoint)
+                order += 1
+
+                hostname = get_pattern_hostname(pattern.pattern)
+                if hostname is None:
+                    self._unindexed_patterns.append(entry)
+                elif hostname[1]:
+                    self._exact_hostnames[hostname[0]].append(entry)
+                else:
+                    self._hostname_suffixes[hostname[0]].append(entry)
+
+    def _get_candidate_patterns(self, url):
+        candidates = list(self._unindexed_patterns)
+
+        match = URL_HOST_RE.match(url)
+        if match:
+            host = match.group(1)
+            candidates.extend(self._exact_hostnames.get(host, []))
+
+            labels = host.split('.')
+            for i in range(len(labels)):
+                candidates.extend(self._hostname_suffixes.get('.'.join(labels[i:]), []))
+
+        # Try patterns in the order the providers were given, so that the first match wins
+        candidates.sort(key=lambda entry: entry[0])
+        return candidates
+
+    def _get_endpoint(self, url):
+        for order, pattern, endpoint in self._get_candidate_patterns(url):
+            if pattern.match(url):
+                return endpoint
 
     def accept(self, url):
         return self._get_endpoint(url) is not None
@@ -58,10 +184,14 @@ class OEmbedFinder(EmbedFinder):
         request = Request(endpoint + '?' + urlencode(params))
         request.add_header('User-agent', 'Mozilla/5.0')
         try:
-            r = urllib_request.urlopen(request)
-        except URLError:
+            if self.timeout is not None:
+                r = urllib_request.urlopen(request, timeout=self.timeout)
+            else:
+                r = urllib_request.urlopen(request)
+            response_body = r.read()
+        except (URLError, socket.timeout):
             raise EmbedNotFoundException
-        oembed = json.loads(r.read().decode('utf-8'))
+        oembed = json.loads(response_body.decode('utf-8'))
 
         # Convert photos into HTML
         if oembed['type'] == 'photo':
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from wagtail.embeds.embeds import find_embed
+from wagtail.embeds.models import Embed
+
+
+class Command(BaseCommand):
+    help = 'Fetch embeds again from their providers once they are older than WAGTAILEMBEDS_MAX_AGE'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age', type=int, dest='max_age',
+            help="Refresh embeds last fetched more than this many seconds ago (defaults to WAGTAILEMBEDS_MAX_AGE)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Maximum number of embeds to fetch from providers at the same time"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="Number of embeds to load from the database at once"
+        )
+
+    def handle(self, *args, **options):
+        max_age = options['max_age']
+        if max_age is None:
+            max_age = getattr(settings, 'WAGTAILEMBEDS_MAX_AGE', None)
+        if max_age is None:
+            raise CommandError("Pass --max-age or set WAGTAILEMBEDS_MAX_AGE to choose which embeds to refresh")
+
+        self.verbosity = options['verbosity']
+
+        refreshed, failed = refresh_embeds(
+            get_stale_embeds(max_age), workers=options['workers'], batch_size=options['batch_size'],
+            on_error=self.write_error
+        )
+
+        self.stdout.write("Refreshed %d embeds, %d failed" % (refreshed, failed))
+
+    def write_error(self, embed, error):
+        if self.verbosity >= 1:
+            self.stderr.write("Could not refresh embed for %s: %s" % (embed.url, error))
+
+
+def get_stale_embeds(max_age):
+    """
+    Returns the embeds that were last fetched more than max_age seconds ago
+    """
+    return Embed.objects.filter(last_updated__lt=timezone.now() - timedelta(seconds=max_age))
+
+
+def fetch_embed(embed):
+    try:
+        return embed, find_embed(embed.url, embed.max_width), None
+    except Exception as e:
+        # Any failure (provider errors, timeouts, invalid responses) only affects this embed
+        return embed, None, e
+
+
+def refresh_embeds(embeds, workers=4, batch_size=100, on_error=None):
+    """
+    Fetches the given embeds from their providers again, using up to `workers` threads
+    at once, and updates them with the new data. Embeds that can't be fetched are left
+    unchanged, so they'll be tried again next time.
+
+    Returns a tuple of the number of embeds refreshed and the number that failed.
+    """
+    refreshed = failed = 0
+    embed_ids = list(embeds.order_by('pk').values_list('pk', flat=True))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(embed_ids), batch_size):
+            batch = Embed.objects.filter(pk__in=embed_ids[start:start + batch_size]).order_by('pk')
+
+            # Only the requests to the providers are made from the worker threads;
+            # the database is updated from this one
+            for embed, embed_dict, error in executor.map(fetch_embed, batch):
+                if error is not None:
+                    failed += 1
+                    if on_error:
+                        on_error(embed, error)
+                    continue
+
+                for field, value in embed_dict.items():
+                    setattr(embed, field, value)
+                embed.save()
+                refreshed += 1
+
+    return refreshed, failed
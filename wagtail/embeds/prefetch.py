@@ -0,0 +1,58 @@
+from django.conf import settings
+
+from wagtail.core.blocks import ListBlock, RichTextBlock, StreamBlock, StructBlock
+from wagtail.core.fields import RichTextField, StreamField
+from wagtail.core.rich_text.rewriters import FIND_EMBED_TAG, extract_attrs
+from wagtail.embeds.blocks import EmbedBlock
+
+
+def prefetch_on_save_enabled():
+    return getattr(settings, 'WAGTAILEMBEDS_PREFETCH_ON_SAVE', False)
+
+
+def get_embed_urls_from_rich_text(html):
+    """
+    Returns the URLs of the media embeds within a piece of rich text, in its database format
+    """
+    for match in FIND_EMBED_TAG.finditer(html or ''):
+        attrs = extract_attrs(match.group(1))
+        if attrs.get('embedtype') == 'media' and attrs.get('url'):
+            yield attrs['url']
+
+
+def get_embed_urls_from_block(block, value):
+    """
+    Returns the URLs of the embeds within the value of the given block, including
+    EmbedBlocks and rich text nested within it
+    """
+    if value is None:
+        return
+
+    if isinstance(block, EmbedBlock):
+        yield value.url
+    elif isinstance(block, RichTextBlock):
+        yield from get_embed_urls_from_rich_text(value.source)
+    elif isinstance(block, StreamBlock):
+        for child in value:
+            yield from get_embed_urls_from_block(child.block, child.value)
+    elif isinstance(block, StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from get_embed_urls_from_block(child_block, value.get(name))
+    elif isinstance(block, ListBlock):
+        for child_value in value:
+            yield from get_embed_urls_from_block(block.child_block, child_value)
+
+
+def get_embed_urls_for_page(page):
+    """
+    Returns the URLs of the embeds within the StreamFields and rich text fields of a page
+    """
+    urls = set()
+
+    for field in page._meta.get_fields():
+        if isinstance(field, StreamField):
+            urls.update(get_embed_urls_from_block(field.stream_block, getattr(page, field.name)))
+        elif isinstance(field, RichTextField):
+            urls.update(get_embed_urls_from_rich_text(getattr(page, field.name)))
+
+    return urls
@@ -1,6 +1,6 @@
 from wagtail.core.rich_text import EmbedHandler
 from wagtail.embeds import format
-from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.embeds import get_embed, prefetch_embeds
 from wagtail.embeds.models import Embed
 
 
@@ -24,3 +24,11 @@ class MediaEmbedHandler(EmbedHandler):
         representation for use on the front-end.
         """
         return format.embed_to_frontend_html(attrs['url'])
+
+    @staticmethod
+    def prefetch_db_attributes(attrs_list):
+        """
+        Given the attributes of all the media <embed> tags in a piece of rich text,
+        look up their embeds together ahead of rendering them.
+        """
+        prefetch_embeds([attrs['url'] for attrs in attrs_list if 'url' in attrs])
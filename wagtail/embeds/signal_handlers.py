@@ -0,0 +1,34 @@
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.core.signals import page_published
+from wagtail.embeds.embeds import clear_cached_embed, end_request_cache, fetch_embeds, start_request_cache
+from wagtail.embeds.models import Embed
+from wagtail.embeds.prefetch import get_embed_urls_for_page, prefetch_on_save_enabled
+
+
+def post_save_embed_clear_cache(instance, **kwargs):
+    clear_cached_embed(instance.url, instance.max_width)
+
+
+def request_started_enable_embed_cache(**kwargs):
+    start_request_cache()
+
+
+def request_finished_disable_embed_cache(**kwargs):
+    end_request_cache()
+
+
+def page_published_prefetch_embeds(instance, **kwargs):
+    # Pages published without going through the editor (such as scheduled pages)
+    # have their new embeds fetched now, rather than the first time they're rendered
+    if prefetch_on_save_enabled():
+        fetch_embeds(get_embed_urls_for_page(instance))
+
+
+def register_signal_handlers():
+    post_save.connect(post_save_embed_clear_cache, sender=Embed)
+    post_delete.connect(post_save_embed_clear_cache, sender=Embed)
+    request_started.connect(request_started_enable_embed_cache)
+    request_finished.connect(request_finished_disable_embed_cache)
+    page_published.connect(page_published_prefetch_embeds)
@@ -1,25 +1,38 @@
 import json
+import socket
 import unittest
 import urllib.request
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 from urllib.error import URLError
 
 from django import template
+from django.core import management
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from wagtail.core import blocks
+from wagtail.core.models import Page
+from wagtail.core.rich_text import expand_db_html
 from wagtail.embeds import oembed_providers
 from wagtail.embeds.blocks import EmbedBlock, EmbedValue
-from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.embeds import (
+    end_request_cache, fetch_embeds, get_cached_embeds, get_embed, prefetch_embeds, start_request_cache)
 from wagtail.embeds.exceptions import EmbedNotFoundException, EmbedUnsupportedProviderException
 from wagtail.embeds.finders import get_finders
 from wagtail.embeds.finders.embedly import EmbedlyFinder as EmbedlyFinder
 from wagtail.embeds.finders.embedly import AccessDeniedEmbedlyException, EmbedlyException
 from wagtail.embeds.finders.oembed import OEmbedFinder as OEmbedFinder
+from wagtail.embeds.finders.oembed import get_pattern_hostname
 from wagtail.embeds.models import Embed
+from wagtail.embeds.prefetch import get_embed_urls_from_block
 from wagtail.embeds.templatetags.wagtailembeds_tags import embed_tag
+from wagtail.tests.testapp.models import DefaultStreamPage
 from wagtail.tests.utils import WagtailTestUtils
 
 try:
@@ -75,11 +88,24 @@ class TestGetFinders(TestCase):
         self.assertIsInstance(finders[0], OEmbedFinder)
         self.assertEqual(finders[0].options, {'foo': 'bar'})
 
+    def test_finders_are_reused(self):
+        self.assertIs(get_finders(), get_finders())
+
+        with override_settings(WAGTAILEMBEDS_FINDERS=[{'class': 'wagtail.embeds.finders.oembed'}]):
+            finders = get_finders()
+            self.assertIs(get_finders(), finders)
+
+        self.assertIsNot(get_finders(), finders)
+
 
 class TestEmbeds(TestCase):
     def setUp(self):
         self.hit_count = 0
 
+        # Earlier tests that leave a streaming response unread never finish their request,
+        # which would leave that request's embed cache in place for these lookups
+        end_request_cache()
+
     def dummy_finder(self, url, max_width=None):
         # Up hit count
         self.hit_count += 1
@@ -168,6 +194,256 @@ class TestEmbeds(TestCase):
             get_embed('www.test.com/1234', max_width=400)
 
 
+class TestEmbedCaching(TestCase):
+    def setUp(self):
+        for i in range(3):
+            Embed.objects.create(url='http://www.example.com/%d' % i, type='video', html='<p>%d</p>' % i)
+
+        start_request_cache()
+        self.addCleanup(end_request_cache)
+
+    def failing_finder(self, url, max_width=None):
+        raise AssertionError("Embed should not have been fetched")
+
+    def test_request_cache(self):
+        with self.assertNumQueries(1):
+            embed = get_embed('http://www.example.com/0', finder=self.failing_finder)
+            self.assertEqual(embed.html, '<p>0</p>')
+            self.assertIs(get_embed('http://www.example.com/0', finder=self.failing_finder), embed)
+
+    def test_no_request_cache_outside_requests(self):
+        end_request_cache()
+
+        with self.assertNumQueries(2):
+            get_embed('http://www.example.com/0', finder=self.failing_finder)
+            get_embed('http://www.example.com/0', finder=self.failing_finder)
+
+    def test_prefetch_embeds(self):
+        with self.assertNumQueries(1):
+            prefetch_embeds(['http://www.example.com/0', 'http://www.example.com/1', 'http://www.example.com/2'])
+
+        with self.assertNumQueries(0):
+            for i in range(3):
+                self.assertEqual(
+                    get_embed('http://www.example.com/%d' % i, finder=self.failing_finder).html, '<p>%d</p>' % i
+                )
+
+    def test_saving_embed_clears_cache(self):
+        embed = get_embed('http://www.example.com/0', finder=self.failing_finder)
+        embed.html = '<p>Updated</p>'
+        embed.save()
+
+        self.assertEqual(get_embed('http://www.example.com/0', finder=self.failing_finder).html, '<p>Updated</p>')
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'embeds': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    })
+    def test_shared_cache(self):
+        end_request_cache()
+
+        with self.assertNumQueries(1):
+            get_embed('http://www.example.com/0', finder=self.failing_finder)
+            embed = get_embed('http://www.example.com/0', finder=self.failing_finder)
+        self.assertEqual(embed.html, '<p>0</p>')
+
+        # Updating the embed replaces it in the cache
+        embed.html = '<p>Updated</p>'
+        embed.save()
+        self.assertEqual(get_embed('http://www.example.com/0', finder=self.failing_finder).html, '<p>Updated</p>')
+
+        # Deleting it removes it from the cache
+        embed.delete()
+        self.assertEqual(get_cached_embeds(['http://www.example.com/0']), {})
+
+    @patch('wagtail.embeds.embeds.get_finders')
+    def test_render_stream_embeds_together(self, get_finders):
+        get_finders.return_value = []
+        block = blocks.StreamBlock([('embed', EmbedBlock())])
+        value = block.to_python([
+            {'type': 'embed', 'value': 'http://www.example.com/%d' % i} for i in range(3)
+        ])
+
+        with self.assertNumQueries(1):
+            html = block.render(value)
+
+        for i in range(3):
+            self.assertIn('<p>%d</p>' % i, html)
+
+    def test_render_rich_text_embeds_together(self):
+        html = ''.join('<embed embedtype="media" url="http://www.example.com/%d" />' % i for i in range(3))
+
+        with self.assertNumQueries(1):
+            result = expand_db_html(html)
+
+        for i in range(3):
+            self.assertIn('<p>%d</p>' % i, result)
+
+
+class TestRefreshEmbedsCommand(TestCase):
+    def setUp(self):
+        self.stale_embed = Embed.objects.create(url='http://www.example.com/stale', type='video', html='<p>Old</p>')
+        self.fresh_embed = Embed.objects.create(url='http://www.example.com/fresh', type='video', html='<p>Old</p>')
+        self.broken_embed = Embed.objects.create(url='http://www.example.com/broken', type='video', html='<p>Old</p>')
+        Embed.objects.exclude(id=self.fresh_embed.id).update(last_updated=timezone.now() - timedelta(days=2))
+
+    def find_embed(self, url, max_width=None):
+        if url == 'http://www.example.com/broken':
+            raise EmbedNotFoundException
+        return {'type': 'video', 'html': '<p>New</p>', 'width': None, 'height': None}
+
+    def call_command(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        with patch('wagtail.embeds.management.commands.refresh_embeds.find_embed', side_effect=self.find_embed):
+            management.call_command('refresh_embeds', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_refresh_embeds(self):
+        stdout, stderr = self.call_command('--max-age=86400', '--workers=2', '--batch-size=1')
+        self.assertIn("Refreshed 1 embeds, 1 failed", stdout)
+        self.assertIn("Could not refresh embed for http://www.example.com/broken", stderr)
+
+        self.stale_embed.refresh_from_db()
+        self.assertEqual(self.stale_embed.html, '<p>New</p>')
+        self.assertGreater(self.stale_embed.last_updated, timezone.now() - timedelta(days=1))
+
+        # Fresh embeds aren't fetched, and failed embeds are left as they were
+        self.fresh_embed.refresh_from_db()
+        self.assertEqual(self.fresh_embed.html, '<p>Old</p>')
+        self.broken_embed.refresh_from_db()
+        self.assertEqual(self.broken_embed.html, '<p>Old</p>')
+
+    @override_settings(WAGTAILEMBEDS_MAX_AGE=86400)
+    def test_max_age_from_settings(self):
+        stdout, stderr = self.call_command()
+        self.assertIn("Refreshed 1 embeds, 1 failed", stdout)
+
+    def test_max_age_required(self):
+        with self.assertRaises(management.CommandError):
+            self.call_command()
+
+
+class TestFetchEmbeds(TestCase):
+    def find_embed(self, url, max_width=None):
+        if url.endswith('broken'):
+            raise EmbedNotFoundException
+        return {'type': 'video', 'html': '<p>%s</p>' % url, 'width': None, 'height': None}
+
+    @patch('wagtail.embeds.embeds.find_embed')
+    def test_fetch_embeds(self, find_embed):
+        find_embed.side_effect = self.find_embed
+        Embed.objects.create(url='http://www.example.com/existing', type='video', html='<p>Existing</p>')
+        urls = ['http://www.example.com/%d' % i for i in range(5)] + [
+            'http://www.example.com/existing', 'http://www.example.com/broken'
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            new_embeds = fetch_embeds(urls, workers=3)
+
+        self.assertEqual(len(new_embeds), 5)
+        self.assertEqual(find_embed.call_count, 6)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('INSERT')]), 1)
+
+        self.assertEqual(Embed.objects.get(url='http://www.example.com/0').html, '<p>http://www.example.com/0</p>')
+        self.assertEqual(Embed.objects.get(url='http://www.example.com/existing').html, '<p>Existing</p>')
+        self.assertFalse(Embed.objects.filter(url='http://www.example.com/broken').exists())
+
+    def test_get_embed_urls_from_block(self):
+        block = blocks.StreamBlock([
+            ('embed', EmbedBlock()),
+            ('rich_text', blocks.RichTextBlock()),
+            ('embeds', blocks.ListBlock(EmbedBlock())),
+            ('struct', blocks.StructBlock([('embed', EmbedBlock()), ('text', blocks.CharBlock())])),
+        ])
+        value = block.to_python([
+            {'type': 'embed', 'value': 'http://www.example.com/1'},
+            {'type': 'rich_text', 'value': '<p>Hello</p><embed embedtype="media" url="http://www.example.com/2" />'},
+            {'type': 'embeds', 'value': ['http://www.example.com/3', '']},
+            {'type': 'struct', 'value': {'embed': 'http://www.example.com/4', 'text': 'world'}},
+        ])
+
+        self.assertEqual(
+            list(get_embed_urls_from_block(block, value)),
+            ['http://www.example.com/%d' % i for i in range(1, 5)]
+        )
+
+
+class TestPrefetchEmbedsOnSave(TestCase, WagtailTestUtils):
+    content = json.dumps({
+        'blocks': [
+            {'key': 'a', 'type': 'atomic', 'text': ' ', 'depth': 0, 'inlineStyleRanges': [],
+             'entityRanges': [{'offset': 0, 'length': 1, 'key': 0}]},
+        ],
+        'entityMap': {
+            '0': {'type': 'EMBED', 'mutability': 'IMMUTABLE', 'data': {'url': 'http://www.example.com/embed'}},
+        },
+    })
+
+    def setUp(self):
+        self.root_page = Page.objects.get(id=2)
+        self.login()
+
+    def post_page(self):
+        return self.client.post(reverse('wagtailadmin_pages:add', args=('tests', 'defaultstreampage', self.root_page.id)), {
+            'title': "Embeds",
+            'slug': 'embeds',
+            'body-count': '1',
+            'body-0-deleted': '',
+            'body-0-order': '0',
+            'body-0-type': 'rich_text',
+            'body-0-value': self.content,
+            'action-publish': "Publish",
+        })
+
+    @override_settings(WAGTAILEMBEDS_PREFETCH_ON_SAVE=True)
+    @patch('wagtail.embeds.wagtail_hooks.fetch_embeds')
+    def test_embeds_fetched_after_save(self, fetch_embeds):
+        self.post_page()
+        fetch_embeds.assert_called_once_with({'http://www.example.com/embed'})
+
+    @override_settings(WAGTAILEMBEDS_PREFETCH_ON_SAVE=True)
+    @patch('wagtail.embeds.wagtail_hooks.fetch_embeds')
+    def test_rich_text_field_embeds_fetched_after_save(self, fetch_embeds):
+        self.client.post(
+            reverse('wagtailadmin_pages:add', args=('tests', 'defaultrichtextfieldpage', self.root_page.id)),
+            {'title': "Embeds", 'slug': 'embeds', 'body': self.content}
+        )
+
+        fetch_embeds.assert_called_once_with({'http://www.example.com/embed'})
+
+    @override_settings(WAGTAILEMBEDS_PREFETCH_ON_SAVE=True)
+    @patch('wagtail.embeds.wagtail_hooks.fetch_embeds')
+    def test_embeds_not_fetched_for_invalid_submission(self, fetch_embeds):
+        response = self.client.post(
+            reverse('wagtailadmin_pages:add', args=('tests', 'defaultrichtextfieldpage', self.root_page.id)),
+            {'title': "", 'slug': 'embeds', 'body': self.content}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        fetch_embeds.assert_not_called()
+
+    @patch('wagtail.embeds.wagtail_hooks.fetch_embeds')
+    def test_disabled_by_default(self, fetch_embeds):
+        self.post_page()
+        fetch_embeds.assert_not_called()
+
+    @override_settings(WAGTAILEMBEDS_PREFETCH_ON_SAVE=True)
+    @patch('wagtail.embeds.embeds.find_embed')
+    def test_embeds_fetched_on_publish(self, find_embed):
+        find_embed.return_value = {'type': 'video', 'html': '<p>Embed</p>', 'width': None, 'height': None}
+        page = DefaultStreamPage(
+            title="Embeds", slug='embeds',
+            body=json.dumps([{
+                'type': 'rich_text',
+                'value': '<embed embedtype="media" url="http://www.example.com/embed" />',
+            }])
+        )
+        self.root_page.add_child(instance=page)
+        page.save_revision().publish()
+
+        self.assertEqual(Embed.objects.get(url='http://www.example.com/embed').html, '<p>Embed</p>')
+
+
 class TestChooser(TestCase, WagtailTestUtils):
     def setUp(self):
         # login
@@ -327,6 +603,13 @@ class TestOembed(TestCase):
             self.assertRaises(EmbedNotFoundException, OEmbedFinder().find_embed,
                               "http://www.youtube.com/watch/")
 
+    @patch('urllib.request.urlopen')
+    def test_oembed_timeout(self, urlopen):
+        urlopen.side_effect = socket.timeout
+        finder = OEmbedFinder(timeout=5)
+        self.assertRaises(EmbedNotFoundException, finder.find_embed, "http://www.youtube.com/watch/")
+        self.assertEqual(urlopen.call_args[1]['timeout'], 5)
+
     @patch('urllib.request.urlopen')
     @patch('json.loads')
     def test_oembed_photo_request(self, loads, urlopen):
@@ -373,6 +656,42 @@ class TestOembed(TestCase):
         finder = OEmbedFinder(providers=[oembed_providers.twitter])
         self.assertFalse(finder.accept("http://www.youtube.com/watch/"))
 
+    def test_oembed_accepts_optional_subdomain(self):
+        finder = OEmbedFinder(providers=[oembed_providers.youtube])
+        self.assertTrue(finder.accept("http://youtube.com/watch/"))
+        self.assertTrue(finder.accept("https://m.youtube.com/watch/"))
+        self.assertFalse(finder.accept("https://www.notyoutube.com/watch/"))
+        self.assertFalse(finder.accept("https://www.youtube.com.example.com/watch/"))
+
+    def test_oembed_accepts_unindexed_pattern(self):
+        finder = OEmbedFinder(providers=[oembed_providers.tumblr])
+        self.assertTrue(finder.accept("https://wagtail.tumblr.com/post/1234"))
+
+    def test_oembed_first_matching_provider_wins(self):
+        first = {'endpoint': 'https://first.example.com/oembed', 'urls': [r'^https://.+$']}
+        second = {'endpoint': 'https://second.example.com/oembed', 'urls': [r'^https://example\.com/.+$']}
+
+        self.assertEqual(
+            OEmbedFinder(providers=[first, second])._get_endpoint("https://example.com/foo"),
+            'https://first.example.com/oembed'
+        )
+        self.assertEqual(
+            OEmbedFinder(providers=[second, first])._get_endpoint("https://example.com/foo"),
+            'https://second.example.com/oembed'
+        )
+
+    def test_get_pattern_hostname(self):
+        self.assertEqual(get_pattern_hostname(r'^http(?:s)?://speakerdeck\.com/.+$'), ('speakerdeck.com', True))
+        self.assertEqual(get_pattern_hostname(r'^https?://(?:www\.)?reddit\.com/r/.+$'), ('reddit.com', False))
+        self.assertEqual(get_pattern_hostname(r'^http://[-\w]+\.kickstarter\.com/.+$'), ('kickstarter.com', False))
+        self.assertEqual(get_pattern_hostname(r'^http://[-\w]+kinomap\.com/.+$'), ('com', False))
+
+        # Patterns that could match other hostnames can't be indexed
+        self.assertIsNone(get_pattern_hostname(r'^http(?:s)?://.+?\.tumblr\.com/post/.+$'))
+        self.assertIsNone(get_pattern_hostname(r'^http://[^#]+\.example\.com/.+$'))
+        self.assertIsNone(get_pattern_hostname(r'^http://example\.com/a|^http://example\.org/b'))
+        self.assertIsNone(get_pattern_hostname(r'^//example\.com/.+$'))
+
     @patch('urllib.request.urlopen')
     @patch('json.loads')
     def test_endpoint_with_format_param(self, loads, urlopen):
@@ -7,6 +7,8 @@ import wagtail.admin.rich_text.editors.draftail.features as draftail_features
 from wagtail.admin.rich_text import HalloPlugin
 from wagtail.core import hooks
 from wagtail.embeds import urls
+from wagtail.embeds.embeds import fetch_embeds
+from wagtail.embeds.prefetch import get_embed_urls_for_page, prefetch_on_save_enabled
 from wagtail.embeds.rich_text import MediaEmbedHandler
 from wagtail.embeds.rich_text.contentstate import ContentstateMediaConversionRule
 from wagtail.embeds.rich_text.editor_html import EditorHTMLEmbedConversionRule
@@ -67,3 +69,13 @@ def register_embed_feature(features):
 
     # add 'embed' to the set of on-by-default rich text features
     features.default_features.append('embed')
+
+
+def prefetch_embeds_after_save_page(request, page):
+    # Fetch the saved page's new embeds in parallel now, rather than one at a time when it's first rendered
+    if prefetch_on_save_enabled():
+        fetch_embeds(get_embed_urls_for_page(page))
+
+
+hooks.register('after_create_page', prefetch_embeds_after_save_page)
+hooks.register('after_edit_page', prefetch_embeds_after_save_page)
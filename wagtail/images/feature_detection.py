@@ -0,0 +1,130 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from wagtail.images import get_image_model
+
+logger = logging.getLogger('wagtail.images')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def feature_detection_enabled():
+    return getattr(settings, 'WAGTAILIMAGES_FEATURE_DETECTION_ENABLED', False)
+
+
+def background_feature_detection_enabled():
+    return getattr(settings, 'WAGTAILIMAGES_FEATURE_DETECTION_IN_BACKGROUND', False)
+
+
+def detect_focal_point(image):
+    """
+    Returns the image along with its suggested focal point (or None if nothing was
+    found), and the exception raised if detection failed
+    """
+    try:
+        return image, image.get_suggested_focal_point(), None
+    except Exception as e:
+        return image, None, e
+
+
+def save_focal_point(image, focal_point):
+    """
+    Stores the focal point on the image, unless one has been set since the image was
+    loaded (for example by an editor while detection was running). Returns whether
+    the image was updated.
+    """
+    image.set_focal_point(focal_point)
+
+    # Update the fields directly, so that the image isn't saved over any other changes
+    return bool(type(image).objects.filter(
+        pk=image.pk,
+        focal_point_x__isnull=True,
+        focal_point_y__isnull=True,
+        focal_point_width__isnull=True,
+        focal_point_height__isnull=True,
+    ).update(
+        focal_point_x=image.focal_point_x,
+        focal_point_y=image.focal_point_y,
+        focal_point_width=image.focal_point_width,
+        focal_point_height=image.focal_point_height,
+    ))
+
+
+def update_focal_point(image_id):
+    """
+    Detects and stores the focal point of the image with the given id, if it doesn't
+    have one yet
+    """
+    try:
+        image = get_image_model().objects.get(pk=image_id)
+    except get_image_model().DoesNotExist:
+        return
+
+    if image.has_focal_point():
+        return
+
+    image, focal_point, error = detect_focal_point(image)
+    if error is not None:
+        logger.warning("Feature detection failed for image %d", image_id, exc_info=error)
+    elif focal_point is not None:
+        save_focal_point(image, focal_point)
+
+
+def get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'WAGTAILIMAGES_FEATURE_DETECTION_WORKERS', 1)
+            )
+
+    return _executor
+
+
+def update_focal_point_in_background(image_id):
+    """
+    Queues feature detection for the image with the given id, to run in a worker thread
+    of this process
+    """
+    return get_executor().submit(_update_focal_point_in_worker, image_id)
+
+
+def _update_focal_point_in_worker(image_id):
+    try:
+        update_focal_point(image_id)
+    finally:
+        # The worker thread has its own database connections, which Django won't close for it
+        connections.close_all()
+
+
+def update_focal_points(images, workers=4, batch_size=100, on_error=None):
+    """
+    Detects the focal points of the given images, using up to `workers` threads at once,
+    and stores them on the images that still have no focal point.
+
+    Returns a tuple of the number of images updated and the number where detection failed.
+    """
+    updated = failed = 0
+    image_ids = list(images.order_by('pk').values_list('pk', flat=True))
+    Image = images.model
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(image_ids), batch_size):
+            batch = Image.objects.filter(pk__in=image_ids[start:start + batch_size]).order_by('pk')
+
+            # Only the detection runs in the worker threads; the database is updated from this one
+            for image, focal_point, error in executor.map(detect_focal_point, batch):
+                if error is not None:
+                    failed += 1
+                    if on_error:
+                        on_error(image, error)
+                elif focal_point is not None and save_focal_point(image, focal_point):
+                    updated += 1
+
+    return updated, failed
@@ -1,6 +1,6 @@
 import os
+from io import BytesIO
 
-import willow
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.forms.fields import ImageField
@@ -94,10 +94,9 @@ class WagtailImageField(ImageField):
         if self.max_image_pixels is None:
             return
 
-        # Check the pixel size
-        image = willow.Image.open(f)
-        width, height = image.get_size()
-        frames = image.get_frame_count()
+        # Check the pixel size, as read from the image header in open_image
+        width, height = f.image.size
+        frames = getattr(f, 'frame_count', 1)
         num_pixels = width * height * frames
 
         if num_pixels > self.max_image_pixels:
@@ -105,11 +104,53 @@ class WagtailImageField(ImageField):
                 num_pixels
             ), code='file_too_many_pixels')
 
+    def open_image(self, data, f):
+        """
+        Open the uploaded file with Pillow in a single pass, annotating ``f`` with the
+        image (as Django's ImageField does) and its frame count.
+
+        Unlike ImageField, this doesn't copy in-memory uploads into a new buffer, and only
+        the image header is parsed to find the dimensions and number of frames, so memory
+        use doesn't grow with the size of the file.
+        """
+        from PIL import Image
+
+        if hasattr(data, 'temporary_file_path'):
+            file = data.temporary_file_path()
+        elif hasattr(data, 'read'):
+            file = data
+            file.seek(0)
+        else:
+            file = BytesIO(data['content'])
+
+        try:
+            image = Image.open(file)
+            # n_frames must be read before verify(), which leaves the image unusable for seeking
+            frame_count = getattr(image, 'n_frames', 1)
+            image.verify()
+        except Exception as exc:
+            # Pillow doesn't recognize it as an image.
+            raise ValidationError(
+                self.error_messages['invalid_image'],
+                code='invalid_image',
+            ) from exc
+
+        f.image = image
+        f.frame_count = frame_count
+        # Pillow doesn't detect the MIME type of all formats. In those
+        # cases, content_type will be None.
+        f.content_type = Image.MIME.get(image.format)
+
+        if hasattr(f, 'seek') and callable(f.seek):
+            f.seek(0)
+
     def to_python(self, data):
-        f = super().to_python(data)
+        # Skip ImageField.to_python, which would open the image separately
+        f = super(ImageField, self).to_python(data)
 
         if f is not None:
             self.check_image_file_size(f)
+            self.open_image(data, f)
             self.check_image_file_format(f)
             self.check_image_pixel_size(f)
 
@@ -4,7 +4,8 @@ from django import template
 from jinja2.ext import Extension
 
 from .shortcuts import get_rendition_or_not_found
-from .templatetags.wagtailimages_tags import image_url
+from .templatetags.wagtailimages_tags import (
+    allowed_srcset_filter_pattern, expand_filter_specs, image_url, srcset_img_tag)
 
 
 allowed_filter_pattern = re.compile(r"^[A-Za-z0-9_\-\.\|]+$")
@@ -28,6 +29,21 @@ def image(image, filterspec, **attrs):
         return rendition
 
 
+def srcset_image(image, filterspec, **attrs):
+    if not image:
+        return ''
+
+    filter_specs = filterspec.split('|')
+    for filter_spec in filter_specs:
+        if not allowed_srcset_filter_pattern.match(filter_spec):
+            raise template.TemplateSyntaxError(
+                "filter specs in 'srcset_image' tag may only contain A-Z, a-z, 0-9, dots, hyphens, pipes, "
+                "underscores, braces and commas. (given filter: {})".format(filterspec)
+            )
+
+    return srcset_img_tag(image, expand_filter_specs(filter_specs), attrs)
+
+
 class WagtailImagesExtension(Extension):
     def __init__(self, environment):
         super().__init__(environment)
@@ -35,6 +51,7 @@ class WagtailImagesExtension(Extension):
         self.environment.globals.update({
             'image': image,
             'image_url': image_url,
+            'srcset_image': srcset_image,
         })
 
 
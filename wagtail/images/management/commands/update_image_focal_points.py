@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from wagtail.images import get_image_model
+from wagtail.images.feature_detection import update_focal_points
+
+
+class Command(BaseCommand):
+    help = 'Detect the focal points of images that do not have one, using feature detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Maximum number of images to run feature detection on at the same time"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="Number of images to load from the database at once"
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+
+        images = get_image_model().objects.filter(
+            focal_point_x__isnull=True,
+            focal_point_y__isnull=True,
+            focal_point_width__isnull=True,
+            focal_point_height__isnull=True,
+        )
+
+        updated, failed = update_focal_points(
+            images, workers=options['workers'], batch_size=options['batch_size'],
+            on_error=self.write_error
+        )
+
+        self.stdout.write("Updated the focal points of %d images, %d failed" % (updated, failed))
+
+    def write_error(self, image, error):
+        if self.verbosity >= 1:
+            self.stderr.write("Could not detect the focal point of image %d: %s" % (image.pk, error))
@@ -1,7 +1,7 @@
 import hashlib
 import os.path
 from collections import OrderedDict
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from io import BytesIO
 
 from django.conf import settings
@@ -21,6 +21,7 @@ from willow.image import Image as WillowImage
 from wagtail.admin.models import get_object_usage
 from wagtail.core import hooks
 from wagtail.core.models import CollectionMember
+from wagtail.core.utils import hash_filelike
 from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.rect import Rect
 from wagtail.search import index
@@ -60,6 +61,14 @@ def get_rendition_upload_to(instance, filename):
     return instance.get_upload_to(filename)
 
 
+def file_deduplication_enabled():
+    return getattr(settings, 'WAGTAILIMAGES_DEDUPLICATE_FILES', False)
+
+
+def auto_webp_enabled():
+    return getattr(settings, 'WAGTAILIMAGES_AUTO_WEBP', False)
+
+
 class AbstractImage(CollectionMember, index.Indexed, models.Model):
     title = models.CharField(max_length=255, verbose_name=_('title'))
     file = models.ImageField(
@@ -82,7 +91,7 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
     file_size = models.PositiveIntegerField(null=True, editable=False)
     # A SHA-1 hash of the file contents
-    file_hash = models.CharField(max_length=40, blank=True, editable=False)
+    file_hash = models.CharField(max_length=40, blank=True, editable=False, db_index=True)
 
     objects = ImageQuerySet.as_manager()
 
@@ -113,18 +122,76 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
         return self.file_size
 
-    def _set_file_hash(self, file_contents):
-        self.file_hash = hashlib.sha1(file_contents).hexdigest()
+    def _set_file_hash(self, file_contents=None):
+        if file_contents is None:
+            # Hash the file in chunks, rather than reading it all into memory
+            self.file_hash = hash_filelike(self.file)
+        else:
+            self.file_hash = hashlib.sha1(file_contents).hexdigest()
 
     def get_file_hash(self):
         if self.file_hash == '':
             with self.open_file() as f:
-                self._set_file_hash(f.read())
+                self.file_hash = hash_filelike(f)
 
             self.save(update_fields=['file_hash'])
 
         return self.file_hash
 
+    def get_duplicates(self):
+        """
+        Returns the other images with the same file contents as this one, as
+        identified by the file hash
+        """
+        if not self.file_hash:
+            return self.__class__.objects.none()
+
+        return self.__class__.objects.filter(file_hash=self.file_hash).exclude(pk=self.pk)
+
+    def reuse_existing_file(self):
+        """
+        When WAGTAILIMAGES_DEDUPLICATE_FILES is enabled and another image has the
+        same file contents, point this image at that image's stored original rather
+        than storing another copy of the uploaded file. Must be called after
+        _set_file_hash() and before saving.
+
+        Returns the image whose file is now being shared, or None.
+        """
+        if not file_deduplication_enabled():
+            return None
+
+        duplicate = self.get_duplicates().order_by('pk').first()
+        if duplicate is None:
+            return None
+
+        # Clear the field first, and fill in the dimensions before assigning the new name;
+        # otherwise Django would re-read the dimensions of the file from storage
+        self.file = None
+        self.width = duplicate.width
+        self.height = duplicate.height
+        self.file = duplicate.file.name
+        self.file_size = duplicate.file_size
+
+        return duplicate
+
+    def delete_file_if_unused(self, file=None):
+        """
+        Delete a stored original (this image's own file, if not specified) from storage,
+        unless file deduplication is enabled and another image is still using it.
+        """
+        if file is None:
+            file = self.file
+
+        if not file:
+            return
+
+        if file_deduplication_enabled() and self.__class__.objects.filter(file=file.name).exists():
+            return
+
+        # NB Doing this via file.delete() clears the file field, which isn't what
+        # we want if the file is no longer this image's current one
+        file.storage.delete(file.name)
+
     def get_upload_to(self, filename):
         folder_name = 'original_images'
         filename = self.file.field.storage.get_valid_name(filename)
@@ -235,6 +302,15 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
     def get_suggested_focal_point(self):
         with self.get_willow_image() as willow:
+            # Detection time grows with the size of the image, but a smaller copy
+            # is just as good for finding the faces or features in it
+            max_size = getattr(settings, 'WAGTAILIMAGES_FEATURE_DETECTION_MAX_SIZE', 1000)
+            width, height = willow.get_size()
+            scale = 1
+            if max_size and max(width, height) > max_size:
+                scale = max_size / max(width, height)
+                willow = willow.resize((max(int(width * scale), 1), max(int(height * scale), 1)))
+
             faces = willow.detect_faces()
 
             if faces:
@@ -256,6 +332,15 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
                 else:
                     return None
 
+        # Map the focal point back to the full size image
+        if scale != 1:
+            focal_point = Rect(
+                focal_point.left / scale,
+                focal_point.top / scale,
+                focal_point.right / scale,
+                focal_point.bottom / scale,
+            )
+
         # Add 20% to width and height and give it a minimum size
         x, y = focal_point.centroid
         width, height = focal_point.size
@@ -279,15 +364,10 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
         cache_key = filter.get_cache_key(self)
 
-
         try:
             rendition_caching = True
             cache = caches['renditions']
-            rendition_cache_key = "image-{}-{}-{}".format(
-                self.id,
-                cache_key,
-                filter.spec
-            )
+            rendition_cache_key = self.get_rendition_cache_key(filter, cache_key)
             cached_rendition = cache.get(rendition_cache_key)
             if cached_rendition:
                 return cached_rendition
@@ -302,38 +382,169 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
                 focal_point_key=cache_key,
             )
         except Rendition.DoesNotExist:
-            # Generate the rendition image
-            generated_image = filter.run(self, BytesIO())
-
-            # Generate filename
-            input_filename = os.path.basename(self.file.name)
-            input_filename_without_extension, input_extension = os.path.splitext(input_filename)
-
-            # A mapping of image formats to extensions
-            FORMAT_EXTENSIONS = {
-                'jpeg': '.jpg',
-                'png': '.png',
-                'gif': '.gif',
-                'webp': '.webp',
+            rendition = self.get_shared_rendition(filter, cache_key)
+
+        if rendition is None:
+            rendition = self.create_rendition(filter, cache_key)
+
+        if rendition_caching:
+            cache.set(rendition_cache_key, rendition)
+
+        return rendition
+
+    def get_renditions(self, *filters):
+        """
+        Returns a dict mapping the spec of each of the given filters (Filter objects or
+        filter spec strings) to its rendition. The existing renditions are fetched with
+        one query, and any missing ones are generated from a single decode of the
+        original image.
+        """
+        filters = [Filter(spec=filter) if isinstance(filter, str) else filter for filter in filters]
+        cache_keys = {filter.spec: filter.get_cache_key(self) for filter in filters}
+        renditions = {}
+
+        try:
+            cache = caches['renditions']
+        except InvalidCacheBackendError:
+            cache = None
+
+        if cache is not None:
+            rendition_cache_keys = {
+                self.get_rendition_cache_key(filter, cache_keys[filter.spec]): filter.spec
+                for filter in filters
             }
+            for rendition_cache_key, rendition in cache.get_many(rendition_cache_keys.keys()).items():
+                renditions[rendition_cache_keys[rendition_cache_key]] = rendition
 
-            output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
-            if cache_key:
-                output_extension = cache_key + '.' + output_extension
+        missing_filters = [filter for filter in filters if filter.spec not in renditions]
+        if missing_filters:
+            for rendition in self.renditions.filter(filter_spec__in=[filter.spec for filter in missing_filters]):
+                if rendition.focal_point_key == cache_keys[rendition.filter_spec]:
+                    renditions[rendition.filter_spec] = rendition
 
-            # Truncate filename to prevent it going over 60 chars
-            output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
-            output_filename = output_filename_without_extension + '.' + output_extension
+            with ExitStack() as stack:
+                source = None
+                for filter in missing_filters:
+                    if filter.spec in renditions:
+                        continue
 
-            rendition, created = self.renditions.get_or_create(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-                defaults={'file': File(generated_image.f, name=output_filename)}
-            )
+                    rendition = self.get_shared_rendition(filter, cache_keys[filter.spec])
+                    if rendition is None:
+                        if source is None:
+                            # Only open the original once, and only if something needs generating
+                            source = stack.enter_context(self.open_rendition_source())
+                        rendition = self.create_rendition(filter, cache_keys[filter.spec], source=source)
 
-        if rendition_caching:
-            cache.set(rendition_cache_key, rendition)
+                    renditions[filter.spec] = rendition
+
+            if cache is not None:
+                cache.set_many({
+                    self.get_rendition_cache_key(filter, cache_keys[filter.spec]): renditions[filter.spec]
+                    for filter in missing_filters
+                })
+
+        return renditions
 
+    def get_rendition_cache_key(self, filter, focal_point_key):
+        return "image-{}-{}-{}".format(self.id, focal_point_key, filter.spec)
+
+    @contextmanager
+    def open_rendition_source(self):
+        """
+        Opens and decodes the original image once, for generating several renditions
+        with Filter.run
+        """
+        with self.get_willow_image() as willow:
+            yield (willow.format_name, willow.auto_orient())
+
+    def create_rendition(self, filter, focal_point_key, source=None):
+        """
+        Generates the rendition of this image for the given filter and stores it
+        """
+        generated_image = filter.run(self, BytesIO(), source=source)
+
+        # Generate filename
+        input_filename = os.path.basename(self.file.name)
+        input_filename_without_extension, input_extension = os.path.splitext(input_filename)
+
+        # A mapping of image formats to extensions
+        FORMAT_EXTENSIONS = {
+            'jpeg': '.jpg',
+            'png': '.png',
+            'gif': '.gif',
+            'webp': '.webp',
+        }
+
+        output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
+        if focal_point_key:
+            output_extension = focal_point_key + '.' + output_extension
+
+        # Truncate filename to prevent it going over 60 chars
+        output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
+        output_filename = output_filename_without_extension + '.' + output_extension
+
+        rendition, created = self.renditions.get_or_create(
+            filter_spec=filter.spec,
+            focal_point_key=focal_point_key,
+            defaults={'file': File(generated_image.f, name=output_filename)}
+        )
+        return rendition
+
+    def get_webp_filter(self, filter):
+        """
+        Returns the filter for a WebP version of the rendition for the given filter, or
+        None if the filter already specifies an output format, or if the original is a
+        GIF (which may be animated).
+        """
+        if isinstance(filter, str):
+            filter = Filter(spec=filter)
+
+        if os.path.splitext(self.file.name)[1].lower() == '.gif':
+            return None
+
+        return filter.get_webp_filter()
+
+    def get_webp_rendition(self, filter):
+        """
+        Returns a WebP version of the rendition for the given filter, to offer to browsers
+        that support it. This is a rendition in its own right, generated on first use.
+        Returns None if there can't be a WebP version (see get_webp_filter).
+        """
+        webp_filter = self.get_webp_filter(filter)
+        if webp_filter is None:
+            return None
+
+        return self.get_rendition(webp_filter)
+
+    def get_shared_rendition(self, filter, focal_point_key):
+        """
+        When WAGTAILIMAGES_DEDUPLICATE_FILES is enabled, look for a rendition with this
+        filter and focal point that was generated for another image with the same file
+        contents. If there is one, create a rendition of this image that shares its
+        stored file, rather than generating the image again.
+        """
+        if not (file_deduplication_enabled() and self.file_hash):
+            return None
+
+        Rendition = self.get_rendition_model()
+        shared_rendition = Rendition.objects.filter(
+            image__file_hash=self.file_hash,
+            filter_spec=filter.spec,
+            focal_point_key=focal_point_key,
+        ).exclude(image_id=self.pk).first()
+
+        if shared_rendition is None:
+            return None
+
+        rendition, created = self.renditions.get_or_create(
+            filter_spec=filter.spec,
+            focal_point_key=focal_point_key,
+            defaults={
+                'file': shared_rendition.file.name,
+                'width': shared_rendition.width,
+                'height': shared_rendition.height,
+            }
+        )
         return rendition
 
     def is_portrait(self):
@@ -406,69 +617,86 @@ class Filter:
             operations.append(op_class(*op_spec_parts))
         return operations
 
-    def run(self, image, output):
-        with image.get_willow_image() as willow:
-            original_format = willow.format_name
+    def run(self, image, output, source=None):
+        """
+        Applies this filter's operations to the image and saves the result to `output`.
+        `source` is an optional (original format, Willow image) pair from
+        AbstractImage.open_rendition_source, to avoid decoding the image again when
+        generating several renditions at once.
+        """
+        if source is None:
+            with image.open_rendition_source() as source:
+                return self.run(image, output, source=source)
+
+        original_format, willow = source
 
-            # Fix orientation of image
-            willow = willow.auto_orient()
+        env = {
+            'original-format': original_format,
+        }
+        for operation in self.operations:
+            willow = operation.run(willow, image, env) or willow
 
-            env = {
-                'original-format': original_format,
+        # Find the output format to use
+        if 'output-format' in env:
+            # Developer specified an output format
+            output_format = env['output-format']
+        else:
+            # Convert bmp and webp to png by default
+            default_conversions = {
+                'bmp': 'png',
+                'webp': 'png',
             }
-            for operation in self.operations:
-                willow = operation.run(willow, image, env) or willow
 
-            # Find the output format to use
-            if 'output-format' in env:
-                # Developer specified an output format
-                output_format = env['output-format']
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions['gif'] = 'png'
+
+            # Allow the user to override the conversions
+            conversion = getattr(settings, 'WAGTAILIMAGES_FORMAT_CONVERSIONS', {})
+            default_conversions.update(conversion)
+
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(
+                original_format, original_format)
+
+        if output_format == 'jpeg':
+            # Allow changing of JPEG compression quality
+            if 'jpeg-quality' in env:
+                quality = env['jpeg-quality']
             else:
-                # Convert bmp and webp to png by default
-                default_conversions = {
-                    'bmp': 'png',
-                    'webp': 'png',
-                }
-
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions['gif'] = 'png'
-
-                # Allow the user to override the conversions
-                conversion = getattr(settings, 'WAGTAILIMAGES_FORMAT_CONVERSIONS', {})
-                default_conversions.update(conversion)
-
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format)
-
-            if output_format == 'jpeg':
-                # Allow changing of JPEG compression quality
-                if 'jpeg-quality' in env:
-                    quality = env['jpeg-quality']
-                else:
-                    quality = getattr(settings, 'WAGTAILIMAGES_JPEG_QUALITY', 85)
-
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
-
-                return willow.save_as_jpeg(output, quality=quality, progressive=True, optimize=True)
-            elif output_format == 'png':
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == 'gif':
-                return willow.save_as_gif(output)
-            elif output_format == 'webp':
-                # Allow changing of WebP compression quality
-                if ('output-format-options' in env
-                        and 'lossless' in env['output-format-options']):
-                    return willow.save_as_webp(output, lossless=True)
-                elif 'webp-quality' in env:
-                    quality = env['webp-quality']
-                else:
-                    quality = getattr(settings, 'WAGTAILIMAGES_WEBP_QUALITY', 85)
+                quality = getattr(settings, 'WAGTAILIMAGES_JPEG_QUALITY', 85)
+
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
+
+            return willow.save_as_jpeg(output, quality=quality, progressive=True, optimize=True)
+        elif output_format == 'png':
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == 'gif':
+            return willow.save_as_gif(output)
+        elif output_format == 'webp':
+            # Allow changing of WebP compression quality
+            if ('output-format-options' in env
+                    and 'lossless' in env['output-format-options']):
+                return willow.save_as_webp(output, lossless=True)
+            elif 'webp-quality' in env:
+                quality = env['webp-quality']
+            else:
+                quality = getattr(settings, 'WAGTAILIMAGES_WEBP_QUALITY', 85)
+
+            return willow.save_as_webp(output, quality=quality)
+
+    def get_webp_filter(self):
+        """
+        Returns a Filter that performs the same operations as this one but outputs WebP,
+        or None if this filter chooses its own output format. The quality is taken from
+        any webpquality operation in this filter, or WAGTAILIMAGES_WEBP_QUALITY.
+        """
+        if any(op_spec.split('-')[0] == 'format' for op_spec in self.spec.split('|')):
+            return None
 
-                return willow.save_as_webp(output, quality=quality)
+        return Filter(spec=self.spec + '|format-webp')
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -548,6 +776,21 @@ class AbstractRendition(models.Model):
         filename = self.file.field.storage.get_valid_name(filename)
         return os.path.join(folder_name, filename)
 
+    def delete_file_if_unused(self):
+        """
+        Delete this rendition's file from storage, unless file deduplication is enabled
+        and a rendition of another image is sharing it.
+        """
+        if not self.file:
+            return
+
+        if file_deduplication_enabled() and self.__class__.objects.filter(
+            filter_spec=self.filter_spec, file=self.file.name
+        ).exists():
+            return
+
+        self.file.storage.delete(self.file.name)
+
     @classmethod
     def check(cls, **kwargs):
         errors = super(AbstractRendition, cls).check(**kwargs)
@@ -1,4 +1,4 @@
-from wagtail.images.models import SourceImageIOError
+from wagtail.images.models import SourceImageIOError, auto_webp_enabled
 
 
 def get_rendition_or_not_found(image, specs):
@@ -15,7 +15,44 @@ def get_rendition_or_not_found(image, specs):
         # Image file is (probably) missing from /media/original_images - generate a dummy
         # rendition so that we just output a broken image, rather than crashing out completely
         # during rendering.
-        Rendition = image.renditions.model  # pick up any custom Image / Rendition classes that may be in use
-        rendition = Rendition(image=image, width=0, height=0)
-        rendition.file.name = 'not-found'
-        return rendition
+        return get_not_found_rendition(image)
+
+
+def get_renditions_or_not_found(image, specs):
+    """
+    Like get_rendition_or_not_found, but for several filters at once; see AbstractImage.get_renditions.
+
+    :param image: AbstractImage
+    :param specs: list of str or Filter
+    :return: dict of filter spec to Rendition
+    """
+    try:
+        return image.get_renditions(*specs)
+    except SourceImageIOError:
+        rendition = get_not_found_rendition(image)
+        return {getattr(spec, 'spec', spec): rendition for spec in specs}
+
+
+def get_not_found_rendition(image):
+    Rendition = image.renditions.model  # pick up any custom Image / Rendition classes that may be in use
+    rendition = Rendition(image=image, width=0, height=0)
+    rendition.file.name = 'not-found'
+    return rendition
+
+
+def get_webp_rendition_or_none(image, specs):
+    """
+    Returns the WebP version of the rendition if WAGTAILIMAGES_AUTO_WEBP is enabled
+    and the image can have one, or None otherwise.
+
+    :param image: AbstractImage
+    :param specs: str or Filter
+    :return: Rendition or None
+    """
+    if not auto_webp_enabled():
+        return None
+
+    try:
+        return image.get_webp_rendition(specs)
+    except SourceImageIOError:
+        return None
@@ -1,27 +1,39 @@
-from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 
 from wagtail.images import get_image_model
+from wagtail.images.feature_detection import (
+    background_feature_detection_enabled, feature_detection_enabled,
+    update_focal_point_in_background)
 
 
 def post_delete_file_cleanup(instance, **kwargs):
-    # Pass false so FileField doesn't save the model.
-    transaction.on_commit(lambda: instance.file.delete(False))
+    # The file may be shared with other instances if file deduplication is enabled
+    transaction.on_commit(lambda: instance.delete_file_if_unused())
 
 
 def pre_save_image_feature_detection(instance, **kwargs):
-    if getattr(settings, 'WAGTAILIMAGES_FEATURE_DETECTION_ENABLED', False):
+    if feature_detection_enabled() and not background_feature_detection_enabled():
         # Make sure the image doesn't already have a focal point
         if not instance.has_focal_point():
             # Set the focal point
             instance.set_focal_point(instance.get_suggested_focal_point())
 
 
+def post_save_image_feature_detection(instance, **kwargs):
+    if feature_detection_enabled() and background_feature_detection_enabled():
+        if not instance.has_focal_point():
+            # Detect the focal point once the image (and its file) has been committed,
+            # without holding up the response
+            image_id = instance.pk
+            transaction.on_commit(lambda: update_focal_point_in_background(image_id))
+
+
 def register_signal_handlers():
     Image = get_image_model()
     Rendition = Image.get_rendition_model()
 
     pre_save.connect(pre_save_image_feature_detection, sender=Image)
+    post_save.connect(post_save_image_feature_detection, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Rendition)
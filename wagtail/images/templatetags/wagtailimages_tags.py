@@ -1,17 +1,23 @@
+import itertools
 import re
 
 from django import template
 from django.core.exceptions import ImproperlyConfigured
+from django.forms.utils import flatatt
 from django.urls import NoReverseMatch
 from django.utils.functional import cached_property
+from django.utils.html import format_html
 
-from wagtail.images.models import Filter
-from wagtail.images.shortcuts import get_rendition_or_not_found
+from wagtail.images.models import Filter, auto_webp_enabled
+from wagtail.images.shortcuts import (
+    get_rendition_or_not_found, get_renditions_or_not_found, get_webp_rendition_or_none)
 from wagtail.images.views.serve import generate_image_url
 
 
 register = template.Library()
 allowed_filter_pattern = re.compile(r"^[A-Za-z0-9_\-\.]+$")
+allowed_srcset_filter_pattern = re.compile(r"^[A-Za-z0-9_\-\.]*(\{[A-Za-z0-9_\-\.,]+\})?[A-Za-z0-9_\-\.]*$")
+srcset_alternatives_pattern = re.compile(r"\{([^{}]*)\}")
 
 
 @register.tag(name="image")
@@ -115,7 +121,130 @@ class ImageNode(template.Node):
             resolved_attrs = {}
             for key in self.attrs:
                 resolved_attrs[key] = self.attrs[key].resolve(context)
-            return rendition.img_tag(resolved_attrs)
+            img_tag = rendition.img_tag(resolved_attrs)
+
+            webp_rendition = get_webp_rendition_or_none(image, self.filter)
+            if webp_rendition is None:
+                return img_tag
+
+            # let browsers that support WebP download that version instead
+            return format_html(
+                '<picture><source srcset="{}" type="image/webp">{}</picture>',
+                webp_rendition.url, img_tag
+            )
+
+
+def expand_filter_specs(filter_specs):
+    """
+    Expands a list of filter operations, any of which may give a set of alternatives in
+    braces (such as 'width-{400,800}'), into the filter spec for each combination
+    """
+    alternatives = []
+    for filter_spec in filter_specs:
+        match = srcset_alternatives_pattern.search(filter_spec)
+        if match:
+            alternatives.append([
+                filter_spec[:match.start()] + alternative + filter_spec[match.end():]
+                for alternative in match.group(1).split(',')
+            ])
+        else:
+            alternatives.append([filter_spec])
+
+    return ['|'.join(combination) for combination in itertools.product(*alternatives)]
+
+
+def srcset_img_tag(image, filter_specs, attrs={}):
+    """
+    Returns an <img> tag for the rendition of the first filter spec, with a srcset
+    listing the renditions for all of them. The renditions are looked up (and any
+    missing ones generated) together; see AbstractImage.get_renditions.
+    """
+    filters = [Filter(spec=filter_spec) for filter_spec in filter_specs]
+
+    webp_filters = []
+    if auto_webp_enabled():
+        webp_filters = [image.get_webp_filter(filter) for filter in filters]
+        if None in webp_filters:
+            webp_filters = []
+
+    renditions = get_renditions_or_not_found(image, filters + webp_filters)
+
+    def get_srcset(filters):
+        return ', '.join(
+            '{} {}w'.format(renditions[filter.spec].url, renditions[filter.spec].width)
+            for filter in filters
+        )
+
+    img_attrs = {'srcset': get_srcset(filters)}
+    img_attrs.update(attrs)
+    img_tag = renditions[filters[0].spec].img_tag(img_attrs)
+
+    if not webp_filters:
+        return img_tag
+
+    # let browsers that support WebP download that version instead
+    source_attrs = {'srcset': get_srcset(webp_filters), 'type': 'image/webp'}
+    if 'sizes' in attrs:
+        source_attrs['sizes'] = attrs['sizes']
+
+    return format_html('<picture><source{}>{}</picture>', flatatt(source_attrs), img_tag)
+
+
+@register.tag(name="srcset_image")
+def srcset_image(parser, token):
+    bits = token.split_contents()[1:]
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            "'srcset_image' tag should be of the form "
+            "{% srcset_image self.photo width-{400,800} [ sizes=\"...\" custom-attr=\"value\" ... ] %}"
+        )
+
+    image_expr = parser.compile_filter(bits[0])
+    filter_specs = []
+    attrs = {}
+
+    for bit in bits[1:]:
+        try:
+            name, value = bit.split('=')
+            attrs[name] = parser.compile_filter(value)
+        except ValueError:
+            if allowed_srcset_filter_pattern.match(bit):
+                filter_specs.append(bit)
+            else:
+                raise template.TemplateSyntaxError(
+                    "filter specs in 'srcset_image' tag may only contain A-Z, a-z, 0-9, dots, hyphens, "
+                    "underscores, braces and commas. (given filter: {})".format(bit)
+                )
+
+    if not filter_specs:
+        raise template.TemplateSyntaxError("no resize rule provided to 'srcset_image' tag")
+
+    return SrcsetImageNode(image_expr, expand_filter_specs(filter_specs), attrs=attrs)
+
+
+class SrcsetImageNode(template.Node):
+    def __init__(self, image_expr, filter_specs, attrs={}):
+        self.image_expr = image_expr
+        self.filter_specs = filter_specs
+        self.attrs = attrs
+
+    def render(self, context):
+        try:
+            image = self.image_expr.resolve(context)
+        except template.VariableDoesNotExist:
+            return ''
+
+        if not image:
+            return ''
+
+        if not hasattr(image, 'get_renditions'):
+            raise ValueError("srcset_image tag expected an Image object, got %r" % image)
+
+        resolved_attrs = {}
+        for key in self.attrs:
+            resolved_attrs[key] = self.attrs[key].resolve(context)
+
+        return srcset_img_tag(image, self.filter_specs, resolved_attrs)
 
 
 @register.simple_tag()
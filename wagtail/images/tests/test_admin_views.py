@@ -1,5 +1,7 @@
 import json
+from io import BytesIO
 
+import PIL.Image
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -310,6 +312,24 @@ class TestImageAddView(TestCase, WagtailTestUtils):
             'This file has too many pixels (307200). Maximum pixels 1.'
         )
 
+    @override_settings(WAGTAILIMAGES_MAX_IMAGE_PIXELS=1000)
+    def test_add_too_many_pixels_counts_animation_frames(self):
+        # A 3-frame 20x20 animation has 1200 pixels
+        frames = [PIL.Image.new('RGB', (20, 20), colour) for colour in ('red', 'green', 'blue')]
+        f = BytesIO()
+        frames[0].save(f, 'GIF', save_all=True, append_images=frames[1:])
+
+        response = self.post({
+            'title': "Test image",
+            'file': SimpleUploadedFile('test.gif', f.getvalue()),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response, 'form', 'file',
+            'This file has too many pixels (1200). Maximum pixels 1000.'
+        )
+
     def test_add_with_collections(self):
         root_collection = Collection.get_first_root_node()
         evil_plans_collection = root_collection.add_child(name="Evil plans")
@@ -894,6 +914,25 @@ class TestImageChooserUploadView(TestCase, WagtailTestUtils):
         self.assertTrue(image.file_size)
         self.assertTrue(image.file_hash)
 
+    @override_settings(WAGTAILIMAGES_DEDUPLICATE_FILES=True)
+    def test_upload_duplicate_chooses_existing_image(self):
+        existing_image = Image(title="Existing image", file=get_test_image_file())
+        existing_image._set_file_hash()
+        existing_image.save()
+
+        response = self.client.post(reverse('wagtailimages:chooser_upload'), {
+            'image-chooser-upload-title': "Test image",
+            'image-chooser-upload-file': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        response_json = json.loads(response.content.decode())
+        self.assertEqual(response_json['step'], 'image_chosen')
+        self.assertEqual(response_json['result']['id'], existing_image.id)
+
+        # No new image should have been created
+        self.assertFalse(Image.objects.filter(title="Test image").exists())
+
     def test_upload_no_file_selected(self):
         response = self.client.post(reverse('wagtailimages:chooser_upload'), {
             'image-chooser-upload-title': "Test image",
@@ -1111,6 +1150,26 @@ class TestMultipleImageUploader(TestCase, WagtailTestUtils):
         self.assertIn('success', response_json)
         self.assertTrue(response_json['success'])
 
+    @override_settings(WAGTAILIMAGES_DEDUPLICATE_FILES=True)
+    def test_add_post_duplicate(self):
+        """
+        This tests that uploading a duplicate of an existing image shares its stored file
+        """
+        response = self.client.post(reverse('wagtailimages:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        existing_image = response.context['image']
+
+        response = self.client.post(reverse('wagtailimages:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['duplicate'], existing_image)
+        self.assertNotEqual(response.context['image'].id, existing_image.id)
+        self.assertEqual(response.context['image'].file.name, existing_image.file.name)
+        self.assertContains(response, "will share its stored file")
+
     def test_add_post_noajax(self):
         """
         This tests that only AJAX requests are allowed to POST to the add view
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.test import TestCase, override_settings
+
+from wagtail.images.feature_detection import save_focal_point, update_focal_point
+from wagtail.images.rect import Rect
+from wagtail.images.tests.utils import Image, get_test_image_file
+
+
+class FakeWillowImage:
+    """
+    Stands in for a Willow image with feature detection available, finding a single
+    face at the given position relative to the size of the image
+    """
+    def __init__(self, size, face=(0.1, 0.1, 0.2, 0.2)):
+        self.size = size
+        self.face = face
+
+    def get_size(self):
+        return self.size
+
+    def resize(self, size):
+        return FakeWillowImage(size, self.face)
+
+    def detect_faces(self):
+        width, height = self.size
+        left, top, right, bottom = self.face
+        return [(left * width, top * height, right * width, bottom * height)]
+
+
+class TestSuggestedFocalPoint(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(title="Test image", file=get_test_image_file())
+
+    def get_suggested_focal_point(self, willow):
+        @contextmanager
+        def get_willow_image():
+            yield willow
+
+        with mock.patch.object(self.image, 'get_willow_image', get_willow_image):
+            return self.image.get_suggested_focal_point()
+
+    def test_detects_on_downscaled_copy(self):
+        willow = FakeWillowImage((4000, 3000))
+
+        with mock.patch.object(FakeWillowImage, 'detect_faces', autospec=True, side_effect=FakeWillowImage.detect_faces) as detect_faces:
+            focal_point = self.get_suggested_focal_point(willow)
+
+        self.assertEqual(detect_faces.call_args[0][0].size, (1000, 750))
+
+        # The face is mapped back to the full size image, and padded by 20%
+        self.assertEqual(focal_point, Rect.from_point(600, 450, 480, 360))
+
+    @override_settings(WAGTAILIMAGES_FEATURE_DETECTION_MAX_SIZE=None)
+    def test_detects_on_full_size_image_when_disabled(self):
+        willow = FakeWillowImage((4000, 3000))
+
+        with mock.patch.object(FakeWillowImage, 'resize') as resize:
+            focal_point = self.get_suggested_focal_point(willow)
+
+        resize.assert_not_called()
+        self.assertEqual(focal_point, Rect.from_point(600, 450, 480, 360))
+
+    def test_small_image_not_resized(self):
+        willow = FakeWillowImage((800, 600))
+
+        with mock.patch.object(FakeWillowImage, 'resize') as resize:
+            self.get_suggested_focal_point(willow)
+
+        resize.assert_not_called()
+
+
+@mock.patch.object(Image, 'get_suggested_focal_point', return_value=Rect(100, 100, 300, 300))
+class TestUpdateFocalPoints(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(title="Test image", file=get_test_image_file())
+
+    def test_update_focal_point(self, get_suggested_focal_point):
+        update_focal_point(self.image.pk)
+
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.get_focal_point(), Rect(100, 100, 300, 300))
+
+    def test_focal_point_set_during_detection_is_kept(self, get_suggested_focal_point):
+        # An editor sets the focal point after the image was loaded for detection
+        Image.objects.filter(pk=self.image.pk).update(
+            focal_point_x=50, focal_point_y=50, focal_point_width=20, focal_point_height=20
+        )
+
+        self.assertFalse(save_focal_point(self.image, Rect(100, 100, 300, 300)))
+
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.get_focal_point(), Rect.from_point(50, 50, 20, 20))
+
+    def test_command(self, get_suggested_focal_point):
+        other_image = Image.objects.create(title="Test image", file=get_test_image_file())
+        Image.objects.create(
+            title="Test image", file=get_test_image_file(),
+            focal_point_x=50, focal_point_y=50, focal_point_width=20, focal_point_height=20
+        )
+
+        stdout = StringIO()
+        management.call_command('update_image_focal_points', '--workers=2', '--batch-size=1', stdout=stdout)
+
+        self.assertEqual(stdout.getvalue().strip(), "Updated the focal points of 2 images, 0 failed")
+        self.assertEqual(get_suggested_focal_point.call_count, 2)
+        other_image.refresh_from_db()
+        self.assertEqual(other_image.get_focal_point(), Rect(100, 100, 300, 300))
+
+    def test_command_reports_errors(self, get_suggested_focal_point):
+        get_suggested_focal_point.side_effect = IOError("Image file not found")
+
+        stdout = StringIO()
+        stderr = StringIO()
+        management.call_command('update_image_focal_points', stdout=stdout, stderr=stderr)
+
+        self.assertEqual(stdout.getvalue().strip(), "Updated the focal points of 0 images, 1 failed")
+        self.assertIn("Image file not found", stderr.getvalue())
@@ -89,6 +89,17 @@ class TestImagesJinja(TestCase):
             '<img alt="Test image" src="{}" width="200" height="150">'.format(
                 self.get_image_filename(self.image, "width-200.jpegquality-40")))
 
+    def test_srcset_image(self):
+        self.assertHTMLEqual(
+            self.render('{{ srcset_image(myimage, "width-{200,400}", sizes="50vw") }}', {'myimage': self.image}),
+            '<img alt="Test image" src="{0}" width="200" height="150" srcset="{0} 200w, {1} 400w" sizes="50vw">'.format(
+                self.get_image_filename(self.image, "width-200"),
+                self.get_image_filename(self.image, "width-400")))
+
+    def test_srcset_image_invalid_character(self):
+        with self.assertRaises(template.TemplateSyntaxError):
+            self.render('{{ srcset_image(myimage, "width-{200;400}") }}', {'myimage': self.image})
+
     def test_image_url(self):
         self.assertRegex(
             self.render('{{ image_url(myimage, "width-200") }}', {'myimage': self.image}),
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
@@ -278,6 +279,138 @@ class TestRenditions(TestCase):
         # Check if get_rendition returns the rendition from cache
         self.assertEqual(self.image.get_rendition('width-500')._from_cache, True)
 
+    def test_get_renditions(self):
+        existing_rendition = self.image.get_rendition('width-400')
+
+        renditions = self.image.get_renditions('width-400', 'width-100')
+
+        self.assertEqual(renditions['width-400'], existing_rendition)
+        self.assertEqual(renditions['width-100'].width, 100)
+        self.assertEqual(renditions['width-100'].filter_spec, 'width-100')
+
+    def test_get_renditions_existing_in_one_query(self):
+        self.image.get_rendition('width-400')
+        self.image.get_rendition('width-100')
+
+        with self.assertNumQueries(1):
+            renditions = self.image.get_renditions('width-400', 'width-100')
+
+        self.assertEqual(renditions['width-100'].width, 100)
+
+    def test_get_renditions_decodes_once(self):
+        with mock.patch.object(Image, 'get_willow_image', wraps=self.image.get_willow_image) as get_willow_image:
+            renditions = self.image.get_renditions('width-400', 'width-200', 'fill-100x100')
+
+        self.assertEqual(get_willow_image.call_count, 1)
+        self.assertEqual((renditions['fill-100x100'].width, renditions['fill-100x100'].height), (100, 100))
+        self.assertEqual(renditions['width-200'].width, 200)
+
+    def test_get_renditions_matches_get_rendition(self):
+        self.image.set_focal_point(Rect(100, 100, 200, 200))
+        self.image.save()
+
+        renditions = self.image.get_renditions('fill-100x100-c100')
+
+        self.assertEqual(renditions['fill-100x100-c100'], self.image.get_rendition('fill-100x100-c100'))
+
+    def test_webp_rendition(self):
+        rendition = self.image.get_webp_rendition('width-400|webpquality-60')
+
+        self.assertEqual(rendition.filter_spec, 'width-400|webpquality-60|format-webp')
+        self.assertTrue(rendition.file.name.endswith('.webp'))
+        self.assertEqual(rendition.width, 400)
+
+        # The WebP version is stored as a rendition of its own
+        self.assertEqual(self.image.get_webp_rendition('width-400|webpquality-60'), rendition)
+
+    def test_no_webp_rendition_with_output_format(self):
+        self.assertIsNone(self.image.get_webp_rendition('width-400|format-jpeg'))
+
+    def test_no_webp_rendition_for_gif(self):
+        image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(filename='test.gif'),
+        )
+        self.assertIsNone(image.get_webp_rendition('width-400'))
+
+
+class TestFileDeduplication(TestCase):
+    def setUp(self):
+        self.image = Image(title="Test image", file=get_test_image_file())
+        self.image._set_file_hash()
+        self.image.save()
+
+    def make_duplicate(self):
+        duplicate = Image(title="Duplicate image", file=get_test_image_file())
+        duplicate._set_file_hash()
+        return duplicate
+
+    def test_get_duplicates(self):
+        duplicate = self.make_duplicate()
+        self.assertEqual(list(duplicate.get_duplicates()), [self.image])
+        self.assertEqual(list(self.image.get_duplicates()), [])
+
+    def test_reuse_existing_file_disabled_by_default(self):
+        duplicate = self.make_duplicate()
+        self.assertIsNone(duplicate.reuse_existing_file())
+
+        duplicate.save()
+        self.assertNotEqual(duplicate.file.name, self.image.file.name)
+
+    @override_settings(WAGTAILIMAGES_DEDUPLICATE_FILES=True)
+    def test_reuse_existing_file(self):
+        duplicate = self.make_duplicate()
+        self.assertEqual(duplicate.reuse_existing_file(), self.image)
+
+        duplicate.save()
+        duplicate.refresh_from_db()
+        self.assertEqual(duplicate.file.name, self.image.file.name)
+        self.assertEqual((duplicate.width, duplicate.height), (640, 480))
+        self.assertEqual(duplicate.file_size, self.image.file_size)
+
+    @override_settings(WAGTAILIMAGES_DEDUPLICATE_FILES=True)
+    def test_shared_file_is_kept_until_unused(self):
+        duplicate = self.make_duplicate()
+        duplicate.reuse_existing_file()
+        duplicate.save()
+        storage = self.image.file.storage
+        file_name = self.image.file.name
+
+        duplicate.delete()
+        duplicate.delete_file_if_unused()
+        self.assertTrue(storage.exists(file_name))
+
+        self.image.delete()
+        self.image.delete_file_if_unused()
+        self.assertFalse(storage.exists(file_name))
+
+    @override_settings(WAGTAILIMAGES_DEDUPLICATE_FILES=True)
+    def test_renditions_are_shared(self):
+        duplicate = self.make_duplicate()
+        duplicate.reuse_existing_file()
+        duplicate.save()
+
+        rendition = self.image.get_rendition('width-400')
+        with mock.patch('wagtail.images.models.Filter.run') as run:
+            shared_rendition = duplicate.get_rendition('width-400')
+
+        run.assert_not_called()
+        self.assertEqual(shared_rendition.image, duplicate)
+        self.assertEqual(shared_rendition.file.name, rendition.file.name)
+        self.assertEqual((shared_rendition.width, shared_rendition.height), (400, 300))
+
+        # The rendition file is only removed once no rendition uses it
+        rendition.delete()
+        rendition.delete_file_if_unused()
+        self.assertTrue(rendition.file.storage.exists(rendition.file.name))
+
+    def test_renditions_are_not_shared_by_default(self):
+        duplicate = self.make_duplicate()
+        duplicate.save()
+
+        rendition = self.image.get_rendition('width-400')
+        self.assertNotEqual(duplicate.get_rendition('width-400').file.name, rendition.file.name)
+
 
 class TestUsageCount(TestCase):
     fixtures = ['test.json']
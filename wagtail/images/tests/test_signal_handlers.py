@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.db import transaction
 from django.test import TransactionTestCase, override_settings
 
@@ -74,3 +76,28 @@ class TestFilesDeletedForCustomModels(TestFilesDeletedForDefaultModels):
     def test_image_model(self):
         cls = get_image_model()
         self.assertEqual('%s.%s' % (cls._meta.app_label, cls.__name__), 'tests.CustomImage')
+
+
+class TestFeatureDetectionInBackground(TransactionTestCase):
+    def setUp(self):
+        Collection.objects.get_or_create(
+            name="Root",
+            path='0001',
+            depth=1,
+            numchild=0,
+        )
+
+    @override_settings(
+        WAGTAILIMAGES_FEATURE_DETECTION_ENABLED=True,
+        WAGTAILIMAGES_FEATURE_DETECTION_IN_BACKGROUND=True,
+    )
+    def test_detection_queued_on_commit(self):
+        with mock.patch('wagtail.images.signal_handlers.update_focal_point_in_background') as update_focal_point:
+            with mock.patch.object(get_image_model(), 'get_suggested_focal_point') as get_suggested_focal_point:
+                with transaction.atomic():
+                    image = get_image_model().objects.create(title="Test Image", file=get_test_image_file())
+                    update_focal_point.assert_not_called()
+
+        # Detection doesn't hold up saving the image
+        get_suggested_focal_point.assert_not_called()
+        update_focal_point.assert_called_once_with(image.pk)
@@ -4,7 +4,7 @@ import unittest
 from django import forms, template
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.test import TestCase, override_settings
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from taggit.forms import TagField, TagWidget
 
@@ -102,6 +102,68 @@ class TestImageTag(TestCase):
         self.assertTrue('width="400"' in result)
         self.assertTrue('height="300"' in result)
 
+    @override_settings(WAGTAILIMAGES_AUTO_WEBP=True)
+    def test_image_tag_with_auto_webp(self):
+        result = self.render_image_tag(self.image, 'width-400')
+        webp_rendition = self.image.get_rendition('width-400|format-webp')
+        rendition = self.image.get_rendition('width-400')
+
+        self.assertHTMLEqual(
+            result,
+            '<picture><source srcset="{}" type="image/webp"><img alt="Test image" height="300" src="{}" width="400"></picture>'.format(
+                webp_rendition.url, rendition.url
+            )
+        )
+
+    @override_settings(WAGTAILIMAGES_AUTO_WEBP=True)
+    def test_image_tag_with_auto_webp_and_output_format(self):
+        result = self.render_image_tag(self.image, 'width-400 format-jpeg')
+        self.assertNotIn('<picture>', result)
+
+    def render_srcset_image_tag(self, image, bits):
+        temp = template.Template('{% load wagtailimages_tags %}{% srcset_image image_obj ' + bits + ' %}')
+        context = template.Context({'image_obj': image})
+        return temp.render(context)
+
+    def test_srcset_image_tag(self):
+        result = self.render_srcset_image_tag(self.image, 'width-{200,400} sizes="(max-width: 600px) 100vw, 50vw" class="photo"')
+        renditions = self.image.get_renditions('width-200', 'width-400')
+
+        self.assertHTMLEqual(
+            result,
+            '<img alt="Test image" class="photo" height="150" sizes="(max-width: 600px) 100vw, 50vw" '
+            'src="{0}" srcset="{0} 200w, {1} 400w" width="200">'.format(
+                renditions['width-200'].url, renditions['width-400'].url
+            )
+        )
+
+    def test_srcset_image_tag_with_chained_filters(self):
+        result = self.render_srcset_image_tag(self.image, 'fill-{100x100,200x200} format-jpeg')
+        renditions = self.image.get_renditions('fill-100x100|format-jpeg', 'fill-200x200|format-jpeg')
+
+        self.assertIn('srcset="{} 100w, {} 200w"'.format(
+            renditions['fill-100x100|format-jpeg'].url, renditions['fill-200x200|format-jpeg'].url
+        ), result)
+
+    def test_srcset_image_tag_none(self):
+        self.assertEqual(self.render_srcset_image_tag(None, 'width-{200,400}'), '')
+
+    @override_settings(WAGTAILIMAGES_AUTO_WEBP=True)
+    def test_srcset_image_tag_with_auto_webp(self):
+        result = self.render_srcset_image_tag(self.image, 'width-{200,400} sizes="50vw"')
+        renditions = self.image.get_renditions('width-200|format-webp', 'width-400|format-webp')
+
+        self.assertIn(
+            '<source sizes="50vw" srcset="{} 200w, {} 400w" type="image/webp">'.format(
+                renditions['width-200|format-webp'].url, renditions['width-400|format-webp'].url
+            ),
+            result
+        )
+
+    def test_srcset_image_tag_invalid_filter(self):
+        with self.assertRaises(template.TemplateSyntaxError):
+            template.Template('{% load wagtailimages_tags %}{% srcset_image image_obj width-{200;400} %}')
+
     def test_image_tag_with_chained_filters(self):
         result = self.render_image_tag(self.image, 'fill-200x200 height-150')
         self.assertTrue('width="150"' in result)
@@ -441,6 +503,99 @@ class TestFrontendServeView(TestCase):
         # Check response
         self.assertEqual(response.status_code, 410)
 
+    def test_caching_headers(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        response = self.client.get(reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600')))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertEqual(
+            sorted(response['Cache-Control'].split(', ')),
+            ['max-age=3600', 'public']
+        )
+
+    @override_settings(WAGTAILIMAGES_SERVE_CACHE_MAX_AGE=60)
+    def test_cache_max_age_setting(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        response = self.client.get(reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600')))
+
+        self.assertEqual(sorted(response['Cache-Control'].split(', ')), ['max-age=60', 'public'])
+
+    def test_new_image_file_changes_etag(self):
+        # Replacing the file keeps the URL, so clients must be able to revalidate
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        url = reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600'))
+        etag = self.client.get(url)['ETag']
+
+        self.image.renditions.all().delete()
+        self.image.file = get_test_image_file(filename='replacement.png')
+        self.image.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_changes_with_rendition(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        url = reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600'))
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+
+        self.image.renditions.all().delete()
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_if_none_match(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        url = reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600'))
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('max-age=3600', response['Cache-Control'])
+
+    def test_redirect_action_has_no_caching_headers(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        response = self.client.get(reverse('wagtailimages_serve_action_redirect', args=(signature, self.image.id, 'fill-800x600')))
+
+        self.assertEqual(response.status_code, 301)
+        self.assertFalse(response.has_header('ETag'))
+
+    @override_settings(WAGTAILIMAGES_AUTO_WEBP=True)
+    def test_webp_negotiation(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        url = reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600'))
+
+        response = self.client.get(url, HTTP_ACCEPT='image/webp,image/*,*/*;q=0.8')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('Accept', response['Vary'].split(', '))
+
+        response = self.client.get(url, HTTP_ACCEPT='image/*,*/*;q=0.8')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('Accept', response['Vary'].split(', '))
+
+    def test_webp_negotiation_disabled_by_default(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        response = self.client.get(
+            reverse('wagtailimages_serve', args=(signature, self.image.id, 'fill-800x600')),
+            HTTP_ACCEPT='image/webp,image/*,*/*;q=0.8'
+        )
+
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertNotIn('Accept', response['Vary'].split(', '))
+
+    def test_private_cache(self):
+        signature = generate_signature(self.image.id, 'fill-800x600')
+        view = ServeView.as_view(cache_public=False)
+        request = RequestFactory().get('/')
+
+        response = view(request, signature, str(self.image.id), 'fill-800x600')
+
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
 
 class TestFrontendSendfileView(TestCase):
 
@@ -471,6 +626,23 @@ class TestFrontendSendfileView(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.content, 'Dummy backend response')
 
+    @override_settings(DEFAULT_FILE_STORAGE='wagtail.tests.dummy_external_storage.DummyExternalStorage')
+    def test_sendfile_without_local_path(self):
+        image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        image.get_rendition('fill-800x600')
+
+        signature = generate_signature(image.id, 'fill-800x600')
+        response = self.client.get(reverse('wagtailimages_sendfile_dummy',
+                                           args=(signature, image.id,
+                                                 'fill-800x600')))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'image/png')
+
 
 class TestRect(TestCase):
     def test_init(self):
@@ -14,6 +14,7 @@ from wagtail.core.models import Collection
 from wagtail.images import get_image_model
 from wagtail.images.formats import get_image_format
 from wagtail.images.forms import ImageInsertionForm, get_image_form
+from wagtail.images.models import file_deduplication_enabled
 from wagtail.images.permissions import permission_policy
 from wagtail.search import index as search_index
 
@@ -51,6 +52,23 @@ def get_image_result_data(image):
     }
 
 
+def get_existing_image(request, image):
+    """
+    When WAGTAILIMAGES_DEDUPLICATE_FILES is enabled, return an image the user can
+    choose that has the same file contents as the (unsaved) uploaded image, if any
+    """
+    if not file_deduplication_enabled():
+        return None
+
+    images = image.get_duplicates()
+
+    # allow hooks to modify the queryset
+    for hook in hooks.get_hooks('construct_image_chooser_queryset'):
+        images = hook(images, request)
+
+    return images.order_by('pk').first()
+
+
 def get_chooser_context(request):
     """Helper function to return common template context variables for the main chooser view"""
 
@@ -159,14 +177,17 @@ def chooser_upload(request):
             image.file_size = image.file.size
 
             # Set image file hash
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
-            image.file.seek(0)
+            image._set_file_hash()
 
-            form.save()
+            # If file deduplication is enabled, offer an identical existing image instead
+            existing_image = get_existing_image(request, image)
+            if existing_image is not None:
+                image = existing_image
+            else:
+                form.save()
 
-            # Reindex the image to make sure all tags are indexed
-            search_index.insert_or_update_object(image)
+                # Reindex the image to make sure all tags are indexed
+                search_index.insert_or_update_object(image)
 
             if request.GET.get('select_format'):
                 form = ImageInsertionForm(
@@ -120,17 +120,17 @@ def edit(request, image_id):
                 image.file_size = image.file.size
 
                 # Set new image file hash
-                image.file.seek(0)
-                image._set_file_hash(image.file.read())
-                image.file.seek(0)
+                image._set_file_hash()
+
+                # Share the stored file of an identical image, if file deduplication is enabled
+                image.reuse_existing_file()
 
             form.save()
 
             if 'file' in form.changed_data:
-                # if providing a new image file, delete the old one and all renditions.
-                # NB Doing this via original_file.delete() clears the file field,
-                # which definitely isn't what we want...
-                original_file.storage.delete(original_file.name)
+                # if providing a new image file, delete the old one (unless another image
+                # is sharing it) and all renditions.
+                image.delete_file_if_unused(original_file)
                 image.renditions.all().delete()
 
             # Reindex the image to make sure all tags are indexed
@@ -277,9 +277,10 @@ def add(request):
             image.file_size = image.file.size
 
             # Set image file hash
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
-            image.file.seek(0)
+            image._set_file_hash()
+
+            # Share the stored file of an identical image, if file deduplication is enabled
+            image.reuse_existing_file()
 
             form.save()
 
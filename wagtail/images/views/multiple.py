@@ -72,9 +72,8 @@ def add(request):
             image = form.save(commit=False)
             image.uploaded_by_user = request.user
             image.file_size = image.file.size
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
-            image.file.seek(0)
+            image._set_file_hash()
+            duplicate = image.reuse_existing_file()
             image.save()
 
             # Success! Send back an edit form for this image to the user
@@ -83,6 +82,7 @@ def add(request):
                 'image_id': int(image.id),
                 'form': render_to_string('wagtailimages/multiple/edit_form.html', {
                     'image': image,
+                    'duplicate': duplicate,
                     'edit_action': reverse('wagtailimages:edit_multiple', args=(image.id,)),
                     'delete_action': reverse('wagtailimages:delete_multiple', args=(image.id,)),
                     'form': get_image_edit_form(Image)(
@@ -218,9 +218,7 @@ def create_from_uploaded_image(request, uploaded_image_id):
         image.uploaded_by_user = request.user
         image.file_size = image.file.size
         image.file.open()
-        image.file.seek(0)
-        image._set_file_hash(image.file.read())
-        image.file.seek(0)
+        image._set_file_hash()
         form.save()
 
         uploaded_image.file.delete()
@@ -9,13 +9,15 @@ from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import HttpResponse, HttpResponsePermanentRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.utils.decorators import classonlymethod
 from django.utils.encoding import force_str
+from django.utils.http import quote_etag
 from django.views.generic import View
 
 from wagtail.images import get_image_model
 from wagtail.images.exceptions import InvalidFilterSpecError
-from wagtail.images.models import SourceImageIOError
+from wagtail.images.models import SourceImageIOError, auto_webp_enabled
 from wagtail.utils.sendfile import sendfile
 
 
@@ -49,6 +51,14 @@ class ServeView(View):
     action = 'serve'
     key = None
 
+    # How long browsers and proxies may use their copy of an image before checking back
+    # (defaults to the WAGTAILIMAGES_SERVE_CACHE_MAX_AGE setting). The URL stays the same
+    # when the image's file or focal point changes, so they revalidate with the ETag.
+    # Set cache_public = False on views that restrict who can see the images, so that
+    # shared caches don't store them
+    cache_max_age = None
+    cache_public = True
+
     @classonlymethod
     def as_view(cls, **initkwargs):
         if 'action' in initkwargs:
@@ -63,15 +73,50 @@ class ServeView(View):
 
         image = get_object_or_404(self.model, id=image_id)
 
-        # Get/generate the rendition
+        # Get/generate the rendition, in WebP if the browser supports it
+        negotiate_format = auto_webp_enabled()
         try:
-            rendition = image.get_rendition(filter_spec)
+            rendition = None
+            if negotiate_format and 'image/webp' in request.META.get('HTTP_ACCEPT', ''):
+                rendition = image.get_webp_rendition(filter_spec)
+            if rendition is None:
+                rendition = image.get_rendition(filter_spec)
         except SourceImageIOError:
             return HttpResponse("Source image file not found", content_type='text/plain', status=410)
         except InvalidFilterSpecError:
             return HttpResponse("Invalid filter spec: " + filter_spec, content_type='text/plain', status=400)
 
-        return getattr(self, self.action)(rendition)
+        if self.action == 'serve':
+            etag = self.get_etag(rendition)
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = self.serve(rendition)
+
+            response.setdefault('ETag', etag)
+            patch_cache_control(
+                response, max_age=self.get_cache_max_age(),
+                **{'public' if self.cache_public else 'private': True}
+            )
+        else:
+            response = getattr(self, self.action)(rendition)
+
+        if negotiate_format:
+            patch_vary_headers(response, ['Accept'])
+
+        return response
+
+    def get_cache_max_age(self):
+        if self.cache_max_age is not None:
+            return self.cache_max_age
+        return getattr(settings, 'WAGTAILIMAGES_SERVE_CACHE_MAX_AGE', 60 * 60)
+
+    def get_etag(self, rendition):
+        # A rendition's file is never changed once it has been generated; if the image or
+        # its focal point changes, a new rendition (with a new file name) replaces it
+        return quote_etag(hashlib.sha1(
+            '{}:{}'.format(rendition.pk, rendition.file.name).encode('utf-8')
+        ).hexdigest())
 
     def serve(self, rendition):
         # Open and serve the file
@@ -92,4 +137,11 @@ class SendFileView(ServeView):
     backend = None
 
     def serve(self, rendition):
-        return sendfile(self.request, rendition.file.path, backend=self.backend)
+        try:
+            path = rendition.file.path
+        except NotImplementedError:
+            # The storage backend doesn't keep renditions on the local filesystem,
+            # so there is no file for the web server to send
+            return super().serve(rendition)
+
+        return sendfile(self.request, path, backend=self.backend)
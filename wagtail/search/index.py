@@ -1,5 +1,8 @@
 import inspect
 import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from django.apps import apps
 from django.core import checks
@@ -13,6 +16,9 @@ from wagtail.search.backends import get_search_backends_with_name
 
 logger = logging.getLogger('wagtail.search.index')
 
+# The index updates collected by defer_index_updates in the current thread, if any
+_deferred_updates = threading.local()
+
 
 class Indexed:
     @classmethod
@@ -146,7 +152,74 @@ def get_indexed_instance(instance, check_exists=True):
     return indexed_instance
 
 
+def _get_deferred_updates():
+    return getattr(_deferred_updates, 'updates', None)
+
+
+@contextmanager
+def defer_index_updates():
+    """
+    Collects the objects passed to insert_or_update_object and remove_object (such as
+    by the search signal handlers) within this block, and updates the search backends
+    once it ends: objects changed several times are only indexed once, and objects of
+    each model are added with one call to the backend's add_bulk.
+
+    Nothing is updated if the block raises an exception.
+    """
+    if _get_deferred_updates() is not None:
+        # Updates are already being collected by an outer block
+        yield
+        return
+
+    _deferred_updates.updates = OrderedDict()
+    try:
+        yield
+        updates = _deferred_updates.updates
+    finally:
+        _deferred_updates.updates = None
+
+    _apply_deferred_updates(updates)
+
+
+def _apply_deferred_updates(updates):
+    # Reload the objects to add, one query per model
+    pks_by_model = OrderedDict()
+    for (model, pk), instance in updates.items():
+        if instance is None:
+            pks_by_model.setdefault(model, []).append(pk)
+
+    objs_by_model = OrderedDict()
+    for model, pks in pks_by_model.items():
+        for obj in model.get_indexed_objects().filter(pk__in=pks):
+            indexed_instance = obj.get_indexed_instance()
+            if indexed_instance:
+                objs_by_model.setdefault(type(indexed_instance), []).append(indexed_instance)
+
+    for backend_name, backend in get_search_backends_with_name(with_auto_update=True):
+        for model, obj_list in objs_by_model.items():
+            try:
+                backend.add_bulk(model, obj_list)
+            except Exception:
+                # Catch and log all errors
+                logger.exception("Exception raised while adding %r into the '%s' search backend", model, backend_name)
+
+        for (model, pk), instance in updates.items():
+            if instance is None:
+                continue
+            try:
+                backend.delete(instance)
+            except Exception:
+                # Catch and log all errors
+                logger.exception("Exception raised while deleting %r from the '%s' search backend", instance, backend_name)
+
+
 def insert_or_update_object(instance):
+    deferred_updates = _get_deferred_updates()
+    if deferred_updates is not None:
+        # Look the object up again when the updates are applied, in case it's changed by then
+        deferred_updates[(type(instance), instance.pk)] = None
+        return
+
     indexed_instance = get_indexed_instance(instance)
 
     if indexed_instance:
@@ -161,6 +234,12 @@ def insert_or_update_object(instance):
 def remove_object(instance):
     indexed_instance = get_indexed_instance(instance, check_exists=False)
 
+    deferred_updates = _get_deferred_updates()
+    if deferred_updates is not None:
+        if indexed_instance:
+            deferred_updates[(type(instance), instance.pk)] = indexed_instance
+        return
+
     if indexed_instance:
         for backend_name, backend in get_search_backends_with_name(with_auto_update=True):
             try:
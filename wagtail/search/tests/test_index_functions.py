@@ -131,6 +131,61 @@ class TestRemoveObject(TestCase, WagtailTestUtils):
         self.assertIn("ValueError: Test", cm.output[0])
 
 
+@mock.patch('wagtail.search.tests.DummySearchBackend', create=True)
+@override_settings(WAGTAILSEARCH_BACKENDS={
+    'default': {
+        'BACKEND': 'wagtail.search.tests.DummySearchBackend'
+    }
+})
+class TestDeferIndexUpdates(TestCase, WagtailTestUtils):
+    def test_updates_are_deferred(self, backend):
+        backend().reset_mock()
+
+        with index.defer_index_updates():
+            book = models.Book.objects.create(title="Test", publication_date=date(2017, 10, 18), number_of_pages=100)
+            book.title = "Updated test"
+            book.save()
+            other_book = models.Book.objects.create(
+                title="Other test", publication_date=date(2017, 10, 18), number_of_pages=100
+            )
+
+            self.assertFalse(backend().add.mock_calls)
+            self.assertFalse(backend().add_bulk.mock_calls)
+
+        # Each book is only indexed once, in a single call, with its latest data
+        self.assertFalse(backend().add.mock_calls)
+        backend().add_bulk.assert_called_once_with(models.Book, [book, other_book])
+        self.assertEqual(backend().add_bulk.call_args[0][1][0].title, "Updated test")
+
+    def test_removes_deleted_objects(self, backend):
+        book = models.Book.objects.create(title="Test", publication_date=date(2017, 10, 18), number_of_pages=100)
+        backend().reset_mock()
+
+        with index.defer_index_updates():
+            book.title = "Updated test"
+            book.save()
+            book.delete()
+
+            self.assertFalse(backend().delete.mock_calls)
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        backend().delete.assert_called_once_with(book)
+
+    def test_nothing_updated_on_error(self, backend):
+        backend().reset_mock()
+
+        with self.assertRaises(ValueError):
+            with index.defer_index_updates():
+                models.Book.objects.create(title="Test", publication_date=date(2017, 10, 18), number_of_pages=100)
+                raise ValueError
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+
+        # Updates are no longer deferred
+        book = models.Book.objects.create(title="Test", publication_date=date(2017, 10, 18), number_of_pages=100)
+        backend().add.assert_called_with(book)
+
+
 @mock.patch('wagtail.search.tests.DummySearchBackend', create=True)
 @override_settings(WAGTAILSEARCH_BACKENDS={
     'default': {
@@ -0,0 +1,33 @@
+# Generated by Django 3.0.14 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0051_tag_verbose_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customdocument',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='customimage',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='customimagefilepath',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='customimagewithauthor',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+    ]
@@ -82,7 +82,9 @@ def sendfile(request, filename, attachment=False, attachment_filename=None, mime
                 parts.append('filename*=UTF-8\'\'%s' % quoted_filename)
         response['Content-Disposition'] = '; '.join(parts)
 
-    response['Content-length'] = os.path.getsize(filename)
+    if not response.has_header('Content-Length'):
+        # The backend may have set this already if it is only sending part of the file
+        response['Content-length'] = os.path.getsize(filename)
     response['Content-Type'] = mimetype
     response['Content-Encoding'] = encoding or guessed_encoding
 
@@ -5,13 +5,14 @@ import os
 import re
 import stat
 from email.utils import mktime_tz, parsedate_tz
-from wsgiref.util import FileWrapper
 
-from django.http import HttpResponseNotModified, StreamingHttpResponse
-from django.utils.http import http_date
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
 
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
 
-def sendfile(request, filename, **kwargs):
+
+def sendfile(request, filename, chunk_size=8192, etag=None, **kwargs):
     # Respect the If-Modified-Since header.
     statobj = os.stat(filename)
 
@@ -19,12 +20,132 @@ def sendfile(request, filename, **kwargs):
                               statobj[stat.ST_MTIME], statobj[stat.ST_SIZE]):
         return HttpResponseNotModified()
 
-    response = StreamingHttpResponse(FileWrapper(open(filename, 'rb')))
+    response = ranged_file_response(
+        request, open(filename, 'rb'), statobj[stat.ST_SIZE], chunk_size=chunk_size,
+        etag=etag, last_modified=statobj[stat.ST_MTIME]
+    )
 
     response["Last-Modified"] = http_date(statobj[stat.ST_MTIME])
     return response
 
 
+class RangedFileWrapper:
+    """
+    Iterates over the bytes of a file-like object from `start` to `end` (inclusive,
+    or to the end of the file if not given) in blocks of `chunk_size`
+    """
+    def __init__(self, filelike, start=0, end=None, chunk_size=8192):
+        self.filelike = filelike
+        self.start = start
+        self.end = end
+        self.chunk_size = chunk_size
+
+        # StreamingHttpResponse closes the file once the response has been sent
+        if hasattr(filelike, 'close'):
+            self.close = filelike.close
+
+    def __iter__(self):
+        if self.start:
+            self.filelike.seek(self.start)
+
+        remaining = None if self.end is None else self.end - self.start + 1
+        while remaining is None or remaining > 0:
+            data = self.filelike.read(self.chunk_size if remaining is None else min(self.chunk_size, remaining))
+            if not data:
+                break
+
+            if remaining is not None:
+                remaining -= len(data)
+
+            yield data
+
+
+def if_range_matches(header, etag=None, last_modified=None):
+    """
+    Does the If-Range header match the current version of the file? If not, the
+    whole file should be sent rather than the requested range.
+    """
+    if header is None:
+        return True
+
+    if header.startswith(('"', 'W/')):
+        # Only strong validators can be used for ranges
+        return etag is not None and header == etag
+
+    header_date = parse_http_date_safe(header)
+    return header_date is not None and last_modified is not None and header_date == int(last_modified)
+
+
+def parse_range_header(header, size):
+    """
+    Returns the (start, end) byte positions (inclusive) of the range requested by the
+    Range header, or None if the whole file should be sent. Raises ValueError if the
+    range can't be satisfied.
+
+    Only single ranges are supported; requests for multiple ranges are sent the whole file.
+    """
+    matches = RANGE_RE.match(header.strip()) if header else None
+    if matches is None:
+        return None
+
+    first, last = matches.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    elif last:
+        # A suffix range: the last N bytes of the file
+        start = max(size - int(last), 0)
+        end = size - 1
+        if not int(last):
+            raise ValueError
+    else:
+        return None
+
+    if start >= size:
+        raise ValueError
+
+    return start, end
+
+
+def ranged_file_response(request, filelike, size, chunk_size=8192, etag=None, last_modified=None):
+    """
+    Returns a StreamingHttpResponse for the contents of a file-like object that is
+    `size` bytes long, sending only the part of the file requested by the Range header
+    if there is one (with a 206 status), or a 416 response if the range is invalid.
+
+    `etag` (quoted) and `last_modified` (a timestamp) describe the current version of
+    the file, and are checked against the If-Range header.
+    """
+    byte_range = None
+    if request.method in ('GET', 'HEAD') and if_range_matches(request.META.get('HTTP_IF_RANGE'), etag, last_modified):
+        try:
+            byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+        except ValueError:
+            if hasattr(filelike, 'close'):
+                filelike.close()
+
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */%d' % size
+            response['Content-Length'] = 0
+            return response
+
+    if byte_range is None:
+        response = StreamingHttpResponse(RangedFileWrapper(filelike, chunk_size=chunk_size))
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            RangedFileWrapper(filelike, start, end, chunk_size=chunk_size), status=206
+        )
+        response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+        response['Content-Length'] = end - start + 1
+
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
 def was_modified_since(header=None, mtime=0, size=0):
     """
     Was something modified since the user last downloaded it?